@@ -3,9 +3,25 @@ const { UserChoice } = require('../models/User');
 const { createModel, databases } = require('../utils/modelCreator');
 const { getModel } = require('../models');
 
+const path = require('path');
+const fs = require('fs');
+
 const WellnessPlace = getModel('WellnessPlace');
 const BeautyPlace = getModel('BeautyPlace') || WellnessPlace;
 
+// Stockage des images produit par wellness.py (GridFS, ou disque local en secours)
+const IMAGE_BUCKET = 'wellness_images';
+const IMAGE_SIZES = ['thumb', 'medium'];
+const IMAGE_DIR = process.env.WELLNESS_IMAGE_DIR || path.join(__dirname, '..', 'venue_images');
+// Extensions des fichiers locaux (même table que IMAGE_EXTENSIONS dans wellness.py)
+const IMAGE_EXTENSIONS = {
+  '.jpg': 'image/jpeg',
+  '.png': 'image/png',
+  '.webp': 'image/webp',
+  '.gif': 'image/gif',
+  '.bin': 'application/octet-stream'
+};
+
 function checkWellnessModels() {
   if (!WellnessPlace || !BeautyPlace) {
     console.error("❌ Erreur critique: Modèles WellnessPlace ou BeautyPlace non initialisés.");
@@ -612,6 +628,60 @@ const wellnessController = {
     }
   },
 
+  /**
+   * Servir une image du stockage adressé par contenu (hash SHA-256)
+   */
+  getWellnessImage: async (req, res) => {
+    try {
+      const { hash } = req.params;
+      const { size } = req.query;
+
+      if (!/^[a-f0-9]{64}$/.test(hash)) {
+        return res.status(400).json({ message: 'Identifiant d\'image invalide' });
+      }
+      if (size && !IMAGE_SIZES.includes(size)) {
+        return res.status(400).json({ message: `Taille inconnue: ${size}` });
+      }
+
+      const filename = size ? `${hash}_${size}` : hash;
+      // Le contenu ne change jamais pour un hash donné
+      res.set('Cache-Control', 'public, max-age=31536000, immutable');
+
+      const beautyWellnessDb = mongoose.connection.useDb(databases.BEAUTY_WELLNESS);
+      const file = await beautyWellnessDb.collection(`${IMAGE_BUCKET}.files`).findOne({ filename });
+
+      if (file) {
+        const bucket = new mongoose.mongo.GridFSBucket(beautyWellnessDb.db, { bucketName: IMAGE_BUCKET });
+        res.type((file.metadata && file.metadata.content_type) || 'image/jpeg');
+        return bucket.openDownloadStreamByName(filename)
+          .on('error', (error) => {
+            console.error('❌ Erreur de lecture GridFS dans getWellnessImage:', error);
+            if (res.headersSent) {
+              return res.destroy(error);
+            }
+            res.type('json');
+            if (error.code === 'ENOENT') {
+              return res.status(404).json({ message: 'Image non trouvée' });
+            }
+            res.status(500).json({ message: 'Erreur lors de la lecture de l\'image', error: error.message });
+          })
+          .pipe(res);
+      }
+
+      for (const [extension, contentType] of Object.entries(IMAGE_EXTENSIONS)) {
+        const localPath = path.join(IMAGE_DIR, filename.slice(0, 2), `${filename}${extension}`);
+        if (fs.existsSync(localPath)) {
+          return res.type(contentType).sendFile(localPath);
+        }
+      }
+
+      res.status(404).json({ message: 'Image non trouvée' });
+    } catch (error) {
+      console.error('❌ Erreur dans getWellnessImage:', error);
+      res.status(500).json({ message: 'Erreur lors de la récupération de l\'image', error: error.message });
+    }
+  },
+
   /**
    * Supprimer un producteur de bien-être
    */
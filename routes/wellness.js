@@ -21,6 +21,9 @@ router.get('/categories', wellnessController.getWellnessCategories);
 // GET /api/wellness/user/:userId/favorites - Obtenir les producteurs favoris d'un utilisateur
 router.get('/user/:userId/favorites', wellnessController.getUserFavoriteWellnessProducers);
 
+// GET /api/wellness/images/:hash - Servir une image du stockage adressé par contenu (?size=thumb|medium)
+router.get('/images/:hash', wellnessController.getWellnessImage);
+
 // GET /api/wellness/:id - Obtenir un producteur de bien-être par ID
 router.get('/:id', wellnessController.getWellnessProducerById);
 
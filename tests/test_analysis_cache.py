@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+import wellness
+
+CATEGORY = "Soins esthétiques et bien-être"
+
+
+def test_key_ignores_order_duplicates_and_spacing():
+    reviews = [{"text": "Très bon accueil"}, {"text": "Salon propre"}]
+    shuffled = [{"text": "Salon   propre "}, "Très bon accueil", {"text": "Très bon accueil"}, {"text": ""}]
+
+    assert wellness.analysis_cache_key(reviews, CATEGORY) == wellness.analysis_cache_key(shuffled, CATEGORY)
+
+
+def test_key_changes_with_content_category_and_prompt_version(monkeypatch):
+    reviews = [{"text": "Très bon accueil"}]
+    key = wellness.analysis_cache_key(reviews, CATEGORY)
+
+    assert wellness.analysis_cache_key([{"text": "Accueil froid"}], CATEGORY) != key
+    assert wellness.analysis_cache_key(reviews, "Coiffure et soins capillaires") != key
+    monkeypatch.setattr(wellness, "ANALYSIS_PROMPT_VERSION", wellness.ANALYSIS_PROMPT_VERSION + "-next")
+    assert wellness.analysis_cache_key(reviews, CATEGORY) != key
+
+
+class Result:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class Cursor(list):
+    def sort(self, field, direction):
+        return Cursor(sorted(self, key=lambda document: document[field]))
+
+    def limit(self, count):
+        return Cursor(self[:count])
+
+
+class FakeCollection:
+    """Sous-ensemble des opérations pymongo utilisées par AnalysisCache."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def find_one_and_update(self, query, update, projection=None):
+        document = self.documents.get(query["key"])
+        if document is None or document["prompt_version"] != query["prompt_version"]:
+            return None
+        document.update(update["$set"])
+        return {"analysis": document["analysis"]}
+
+    def update_one(self, query, update, upsert=False):
+        document = self.documents.setdefault(query["key"], {"_id": query["key"], "key": query["key"]})
+        document.update(update["$set"])
+
+    def estimated_document_count(self):
+        return len(self.documents)
+
+    def find(self, query, projection=None):
+        return Cursor(self.documents.values())
+
+    def delete_many(self, query):
+        if "_id" in query:
+            doomed = [key for key in self.documents if key in query["_id"]["$in"]]
+        elif "prompt_version" in query:
+            doomed = [key for key, document in self.documents.items()
+                      if document["prompt_version"] != query["prompt_version"]["$ne"]]
+        else:
+            doomed = list(self.documents)
+        for key in doomed:
+            del self.documents[key]
+        return Result(len(doomed))
+
+
+def test_cache_round_trip_counts_hits_and_misses():
+    cache = wellness.AnalysisCache(FakeCollection())
+
+    assert cache.get("k") is None
+    cache.put("k", {"analyse": {"Accueil": {"note": 4.0}}})
+
+    assert cache.get("k") == {"analyse": {"Accueil": {"note": 4.0}}}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_of_another_prompt_version_are_invalidated(monkeypatch):
+    collection = FakeCollection()
+    cache = wellness.AnalysisCache(collection)
+    cache.put("old", {"analyse": {}})
+
+    monkeypatch.setattr(wellness, "ANALYSIS_PROMPT_VERSION", wellness.ANALYSIS_PROMPT_VERSION + "-next")
+    assert cache.get("old") is None
+    cache.put("new", {"analyse": {}})
+
+    assert cache.invalidate_stale_versions() == 1
+    assert list(collection.documents) == ["new"]
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    class Clock:
+        ticks = 0
+
+        @classmethod
+        def now(cls):
+            cls.ticks += 1
+            return datetime(2025, 1, 1) + timedelta(seconds=cls.ticks)
+
+    monkeypatch.setattr(wellness, "datetime", Clock)
+    collection = FakeCollection()
+    cache = wellness.AnalysisCache(collection, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"analyse": {}})
+    cache.get("a")
+
+    assert cache.evict() == 1
+    assert sorted(collection.documents) == ["a", "c"]
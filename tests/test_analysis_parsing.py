@@ -0,0 +1,55 @@
+import wellness
+
+CATEGORY = "Soins esthétiques et bien-être"
+CRITERIA = wellness.CATEGORIES[CATEGORY]["criteres_evaluation"]
+
+
+def test_match_criterion_exact_and_decorated():
+    assert wellness.match_criterion("Qualité des soins", CRITERIA) == "Qualité des soins"
+    assert wellness.match_criterion("- **qualite des soins**", CRITERIA) == "Qualité des soins"
+    assert wellness.match_criterion("Propreté générale", CRITERIA) == "Propreté"
+    assert wellness.match_criterion("Rapport qualité-prix", CRITERIA) == "Rapport qualité/prix"
+
+
+def test_match_criterion_unambiguous_abbreviation():
+    assert wellness.match_criterion("Qualité", CRITERIA) == "Qualité des soins"
+    assert wellness.match_criterion("Expertise", CRITERIA) == "Expertise du personnel"
+
+
+def test_match_criterion_rejects_partial_words():
+    assert wellness.match_criterion("Q", CRITERIA) is None
+    assert wellness.match_criterion("Prop", CRITERIA) is None
+    assert wellness.match_criterion("", CRITERIA) is None
+    assert wellness.match_criterion("Note globale", CRITERIA) is None
+
+
+def test_parse_analysis_notes_keeps_first_score():
+    notes = wellness.parse_analysis_notes("Qualité des soins: 4\nQ: 3\nQualité: 1\nPropreté : 4,5/5", CATEGORY)
+    assert notes == {"Qualité des soins": 4.0, "Propreté": 4.5}
+
+
+def test_parse_analysis_notes_ignores_out_of_range():
+    assert wellness.parse_analysis_notes("Accueil: 7\nAmbiance: pas d'avis", CATEGORY) == {}
+
+
+def test_parse_batch_analysis_response_header_variants():
+    response = (
+        "### Lieu 1\nAccueil: 4\n\n"
+        "**Lieu 2**\nAccueil: 3\n\n"
+        "Lieu 3 :\nAccueil: 2\n\n"
+        "### **Lieu 4 :**\nAccueil: 5\n\n"
+        "- Lieu n°5\nAccueil: 1\n"
+    )
+    sections = wellness.parse_batch_analysis_response(response, 5)
+    assert sorted(sections) == [0, 1, 2, 3, 4]
+    assert [wellness.parse_analysis_notes(sections[i], CATEGORY)["Accueil"] for i in range(5)] == [4, 3, 2, 5, 1]
+
+
+def test_parse_batch_analysis_response_ignores_unknown_and_duplicate_places():
+    sections = wellness.parse_batch_analysis_response("Lieu 1\nAccueil: 4\nLieu 1\nAccueil: 1\nLieu 9\nAccueil: 2", 2)
+    assert list(sections) == [0]
+    assert wellness.parse_analysis_notes(sections[0], CATEGORY) == {"Accueil": 4.0}
+
+
+def test_parse_batch_analysis_response_does_not_split_on_prose():
+    assert wellness.parse_batch_analysis_response("Le Lieu 2 est propre.\nAccueil: 4", 2) == {}
@@ -0,0 +1,71 @@
+import pytest
+
+import wellness
+
+CATEGORY = "Soins esthétiques et bien-être"
+TEXT = "Accueil très chaleureux, soins excellents et salon très propre. Personnel expert, ambiance calme."
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def fake_llm(reviews, category):
+        calls.append(len(reviews))
+        return {"analyse": {"Accueil": {"note": 3.0}}, "sentiment_general": "mitigé"}
+
+    monkeypatch.setattr(wellness, "analyze_reviews_with_mistral", fake_llm)
+    return calls
+
+
+def reviews_with(ratings):
+    return [{"text": TEXT, "rating": rating} for rating in ratings]
+
+
+def test_consistent_text_without_ratings_stays_on_keywords(llm_calls):
+    result = wellness.route_analysis(reviews_with([0] * 6), CATEGORY)
+    assert result["tier"] == "keywords"
+    assert llm_calls == []
+
+
+def test_stars_agreeing_with_text_stay_on_keywords(llm_calls):
+    result = wellness.route_analysis(reviews_with([5] * 6), CATEGORY)
+    assert result["tier"] == "keywords"
+    assert llm_calls == []
+
+
+def test_stars_contradicting_text_go_to_llm(llm_calls):
+    result = wellness.route_analysis(reviews_with([1] * 6), CATEGORY)
+    assert result["tier"] == "llm"
+    assert llm_calls == [6]
+
+
+def test_scattered_stars_go_to_llm(llm_calls):
+    result = wellness.route_analysis(reviews_with([1, 5, 1, 5, 1, 5]), CATEGORY)
+    assert result["tier"] == "llm"
+
+
+def test_lexical_score_ignores_stars():
+    analysis = wellness.score_keywords(reviews_with([1] * 3), CATEGORY)
+    assert analysis["sentiment_score"] < 0 < analysis["lexical_score"]
+
+
+def test_google_maps_comments_stay_text_and_ratings_go_to_google_reviews(monkeypatch):
+    details = {
+        "formatted_address": "1 rue de Rivoli, Paris",
+        "reviews": [
+            {"author_name": "A", "text": "Soins excellents ", "rating": 5},
+            {"author_name": "B", "text": "   ", "rating": 1},
+            {"author_name": "C", "text": "Accueil froid", "rating": 2},
+        ],
+    }
+    monkeypatch.setattr(wellness, "extract_place_details", lambda place_id: details)
+    monkeypatch.setattr(wellness, "resolve_tripadvisor_url", lambda *args: None)
+    monkeypatch.setattr(wellness, "extract_place_screenshot", lambda *args: None)
+    monkeypatch.setattr(wellness.sentiment_engine, "score_batch", lambda texts, *args: [0.0] * len(texts))
+
+    record = wellness.build_place_record("pid", "Spa Rivoli")
+
+    assert record["comments"] == ["Soins excellents", "Accueil froid"]
+    assert [review["rating"] for review in record["google_reviews"]] == [5, 2]
+    assert record["comments_source"] == "Google Maps"
@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import wellness
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.alive = True
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeBrowserPool(wellness.BrowserPool):
+    def __init__(self, size, max_uses=wellness.BROWSER_MAX_USES):
+        super().__init__(size, max_uses)
+        self.started = []
+
+    def _create_driver(self):
+        driver = FakeDriver()
+        self.started.append(driver)
+        self._uses[id(driver)] = 0
+        return driver
+
+
+def test_browsers_are_reused_between_captures():
+    pool = FakeBrowserPool(size=2)
+
+    for _ in range(5):
+        with pool.lease():
+            pass
+
+    assert len(pool.started) == 1
+
+
+def test_browser_is_recycled_after_max_uses():
+    pool = FakeBrowserPool(size=1, max_uses=3)
+
+    for _ in range(4):
+        with pool.lease():
+            pass
+
+    assert len(pool.started) == 2
+    assert pool.started[0].quit_called
+
+
+def test_browser_failing_with_webdriver_exception_is_retired():
+    pool = FakeBrowserPool(size=1)
+
+    with pytest.raises(WebDriverException):
+        with pool.lease():
+            raise WebDriverException("tab crashed")
+    with pool.lease() as driver:
+        pass
+
+    assert pool.started[0].quit_called
+    assert driver is pool.started[1]
+
+
+def test_dead_browser_is_not_returned_to_the_pool():
+    pool = FakeBrowserPool(size=1)
+
+    with pool.lease() as driver:
+        driver.alive = False
+    with pool.lease() as driver:
+        pass
+
+    assert driver is pool.started[1]
+
+
+def test_pool_never_starts_more_browsers_than_its_size():
+    pool = FakeBrowserPool(size=2)
+    barrier = threading.Barrier(2)
+    leased = []
+
+    def capture():
+        with pool.lease() as driver:
+            leased.append(driver)
+            try:
+                barrier.wait(timeout=1)
+            except threading.BrokenBarrierError:
+                pass
+
+    threads = [threading.Thread(target=capture) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(leased) == 6
+    assert len(pool.started) == 2
+
+
+def test_warm_up_starts_every_browser_in_advance():
+    pool = FakeBrowserPool(size=3)
+
+    pool.warm_up()
+    with pool.lease():
+        pass
+
+    assert len(pool.started) == 3
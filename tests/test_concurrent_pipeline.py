@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import time
+
+import wellness
+
+
+def places(count):
+    return [{"place_id": f"p{i}", "name": f"Lieu {i}"} for i in range(count)]
+
+
+def test_places_run_concurrently_up_to_the_limit(monkeypatch):
+    running = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def slow_process_place(place):
+        with lock:
+            running.append(place["place_id"])
+            peak[0] = max(peak[0], len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(place["place_id"])
+        return place
+
+    monkeypatch.setattr(wellness, "process_place", slow_process_place)
+
+    start = time.monotonic()
+    results = asyncio.run(wellness.process_places_async(places(8), concurrency=4))
+
+    assert peak[0] == 4
+    # Deux vagues de 4 lieux plutôt que 8 lieux à la suite
+    assert time.monotonic() - start < 8 * 0.05
+    assert [place["place_id"] for place in results] == [f"p{i}" for i in range(8)]
+
+
+def test_failed_and_skipped_places_are_dropped_without_stopping_the_batch(monkeypatch):
+    def flaky_process_place(place):
+        if place["place_id"] == "p1":
+            raise RuntimeError("quota")
+        if place["place_id"] == "p2":
+            return None
+        return place
+
+    monkeypatch.setattr(wellness, "process_place", flaky_process_place)
+
+    results = asyncio.run(wellness.process_places_async(places(4), concurrency=2))
+
+    assert [place["place_id"] for place in results] == ["p0", "p3"]
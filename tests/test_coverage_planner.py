@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import wellness
+
+
+class FakeCollection:
+    def __init__(self, document=None):
+        self.document = document
+        self.updates = []
+
+    def find_one(self, query, projection=None):
+        return self.document
+
+    def update_one(self, query, update, upsert=False):
+        self.updates.append(update)
+
+
+class FakeDb:
+    def __init__(self, plan=None):
+        self.CoveragePlans = FakeCollection(plan)
+
+
+BBOX = [48.85, 2.34, 48.86, 2.35]
+
+
+@pytest.fixture
+def nearby_calls(monkeypatch):
+    calls = []
+
+    def fake_nearby_search(lat, lng, radius, google_types):
+        calls.append(list(google_types))
+        return {t: {"results": [{"place_id": f"{t}_1"}], "saturated": False} for t in google_types}
+
+    monkeypatch.setattr(wellness, "nearby_search", fake_nearby_search)
+    return calls
+
+
+def planner_with(monkeypatch, plan):
+    monkeypatch.setattr(wellness, "db", FakeDb(plan))
+    return wellness.CoveragePlanner("test", bbox=BBOX)
+
+
+def previous_cell(last_queried, last_run=None):
+    return {"id": "r0_0", "counts": {"spa": 0}, "last_queried": {"spa": last_queried},
+            "last_run": last_run or datetime.now()}
+
+
+def test_recently_empty_type_is_skipped_and_keeps_its_query_date(monkeypatch, nearby_calls):
+    queried_at = datetime.now() - timedelta(days=10)
+    planner = planner_with(monkeypatch, {"cells": [previous_cell(queried_at)]})
+
+    zones = []
+    planner._explore("r0_0", tuple(BBOX), ["spa", "beauty_salon"], 0, zones)
+
+    assert nearby_calls == [["beauty_salon"]]
+    assert planner.cells[0]["last_queried"]["spa"] == queried_at
+    assert zones[0]["google_types"] == ["beauty_salon"]
+
+
+def test_empty_window_expires_even_if_later_runs_skipped_the_type(monkeypatch, nearby_calls):
+    queried_at = datetime.now() - timedelta(days=wellness.COVERAGE_EMPTY_SKIP_DAYS + 1)
+    planner = planner_with(monkeypatch, {"cells": [previous_cell(queried_at, last_run=datetime.now())]})
+
+    planner._explore("r0_0", tuple(BBOX), ["spa"], 0, [])
+
+    assert nearby_calls == [["spa"]]
+    assert planner.cells[0]["last_queried"]["spa"] > queried_at
+
+
+def test_fresh_persisted_plan_is_reused(monkeypatch, nearby_calls):
+    zones = [{"id": "r0_0", "lat": 48.855, "lng": 2.345, "radius": 700, "google_types": ["spa"]}]
+    planner = planner_with(monkeypatch, {
+        "bbox": BBOX, "polygons": None, "google_types": ["spa"], "zones": zones,
+        "cells": [], "updated_at": datetime.now() - timedelta(hours=1)
+    })
+
+    assert planner.build(["spa"]) == zones
+    assert nearby_calls == []
+
+
+def test_stale_or_different_plan_is_rebuilt(monkeypatch, nearby_calls):
+    planner = planner_with(monkeypatch, {
+        "bbox": BBOX, "polygons": None, "google_types": ["spa"], "zones": [{"id": "old"}],
+        "cells": [], "updated_at": datetime.now() - timedelta(days=wellness.COVERAGE_PLAN_TTL_DAYS + 1)
+    })
+
+    zones = planner.build(["spa"])
+
+    assert nearby_calls == [["spa"]]
+    assert [zone["id"] for zone in zones] == ["r0_0"]
+
+
+ZONES = [{"id": f"z{i}", "lat": 48.85, "lng": 2.34, "radius": 500, "google_types": ["spa"]} for i in range(4)]
+
+
+def test_resume_uses_persisted_zone_list():
+    checkpoint = {"zones": ZONES, "next_zone_index": 2, "last_zone_id": "z1"}
+
+    assert wellness.resume_zone_index(checkpoint) == 2
+
+
+def test_legacy_checkpoint_without_zones_restarts_the_pass():
+    # Index de l'ancienne grille 0.01°: sans rapport avec les zones du plan courant
+    assert wellness.resume_zone_index({"next_zone_index": 2, "last_zone_id": "z1"}) is None
+    assert wellness.resume_zone_index({"zone_index": 1500}) is None
+
+
+def test_legacy_checkpoint_resets_journal_and_saves_a_new_pass(monkeypatch):
+    class Checkpoints(FakeCollection):
+        def insert_one(self, document):
+            raise AssertionError("le checkpoint existe déjà")
+
+    class Journal:
+        resets = 0
+
+        def __init__(self, plan_name):
+            pass
+
+        def reset(self):
+            Journal.resets += 1
+
+        def pending_places(self):
+            raise AssertionError("un ancien passage ne doit pas être repris")
+
+    class Planner:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def build(self, google_types):
+            return []
+
+    checkpoints = Checkpoints({"name": "wellness_scraping", "status": "running", "zone_index": 1500})
+    fake_db = FakeDb()
+    fake_db.Checkpoints = checkpoints
+    monkeypatch.setattr(wellness, "db", fake_db)
+    monkeypatch.setattr(wellness, "CoveragePlanner", Planner)
+    monkeypatch.setattr(wellness, "ScrapeJournal", Journal)
+
+    wellness.scrape_all_zones()
+
+    assert Journal.resets == 1
+    new_pass = checkpoints.updates[0]["$set"]
+    assert new_pass["next_zone_index"] == 0
+    assert new_pass["zones"] == []
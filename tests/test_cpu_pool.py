@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+import wellness
+
+
+@pytest.fixture
+def stage_stats(monkeypatch):
+    monkeypatch.setattr(wellness, "CPU_STAGE_STATS", {})
+    return wellness.CPU_STAGE_STATS
+
+
+def test_without_workers_stages_run_in_the_calling_process(monkeypatch, stage_stats):
+    monkeypatch.setattr(wellness, "CPU_WORKERS", 0)
+
+    assert wellness.get_cpu_pool() is None
+    assert wellness.run_cpu_stage("pid", os.getpid) == os.getpid()
+    assert wellness.run_cpu_stage("sum", sum, [1, 2, 3]) == 6
+
+
+def test_stage_timings_are_accumulated_per_stage(monkeypatch, stage_stats):
+    monkeypatch.setattr(wellness, "CPU_WORKERS", 0)
+
+    for _ in range(3):
+        wellness.run_cpu_stage("keywords", sorted, list(range(20000, 0, -1)))
+    wellness.run_cpu_stage("sentiment", len, "abc")
+
+    assert stage_stats["keywords"]["calls"] == 3
+    assert stage_stats["sentiment"]["calls"] == 1
+    assert stage_stats["keywords"]["wall_seconds"] > 0
+    assert stage_stats["keywords"]["cpu_seconds"] >= 0
+
+
+def test_stages_run_in_spawned_worker_processes(monkeypatch, stage_stats):
+    monkeypatch.setattr(wellness, "CPU_WORKERS", 1)
+    monkeypatch.setattr(wellness, "_cpu_pool", None)
+    try:
+        pool = wellness.get_cpu_pool()
+        assert wellness.run_cpu_stage("pid", os.getpid) != os.getpid()
+        # Le pool est créé une seule fois puis réutilisé
+        assert wellness.get_cpu_pool() is pool
+        assert stage_stats["pid"]["calls"] == 1
+    finally:
+        if wellness._cpu_pool is not None:
+            wellness._cpu_pool.shutdown()
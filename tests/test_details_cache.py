@@ -0,0 +1,113 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import wellness
+
+
+class FakeCacheCollection:
+    """PlaceDetailsCache en mémoire (filtres namespace, place_id et timestamp $gte)."""
+
+    def __init__(self):
+        self.documents = {}
+        self.reads = 0
+
+    def find_one(self, query, projection=None):
+        self.reads += 1
+        document = self.documents.get((query["namespace"], query["place_id"]))
+        if document and document["timestamp"] >= query["timestamp"]["$gte"]:
+            return dict(document)
+        return None
+
+    def update_one(self, query, update, upsert=False):
+        self.documents[(query["namespace"], query["place_id"])] = dict(update["$set"])
+
+    def delete_one(self, query):
+        self.documents.pop((query["namespace"], query["place_id"]), None)
+
+
+def test_fetches_once_then_serves_copies_from_memory():
+    collection = FakeCacheCollection()
+    cache = wellness.DetailsCache(collection, "google_details")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"name": "Spa", "reviews": []}
+
+    first = cache.get_or_fetch("p1", fetch)
+    first["reviews"].append("modifié par l'appelant")
+    second = cache.get_or_fetch("p1", fetch)
+
+    assert calls == [1]
+    assert second == {"name": "Spa", "reviews": []}
+    assert cache.stats["memory_hits"] == 1
+
+
+def test_database_tier_serves_other_processes():
+    collection = FakeCacheCollection()
+    wellness.DetailsCache(collection, "google_details").put("p1", {"name": "Spa"})
+
+    cache = wellness.DetailsCache(collection, "google_details")
+
+    assert cache.get_or_fetch("p1", lambda: {"name": "autre"}) == {"name": "Spa"}
+    assert cache.stats["db_hits"] == 1
+
+
+def test_namespaces_do_not_share_entries():
+    collection = FakeCacheCollection()
+    wellness.DetailsCache(collection, "google_details").put("p1", {"name": "Spa"})
+
+    assert wellness.DetailsCache(collection, "place_record").get("p1") is None
+
+
+def test_expired_entries_are_refetched():
+    collection = FakeCacheCollection()
+    collection.documents[("google_details", "p1")] = {"details": {"name": "ancien"},
+                                                      "timestamp": datetime.now() - timedelta(days=365)}
+    cache = wellness.DetailsCache(collection, "google_details", ttl_days=7)
+
+    assert cache.get_or_fetch("p1", lambda: {"name": "nouveau"}) == {"name": "nouveau"}
+
+
+def test_memory_tier_is_bounded():
+    cache = wellness.DetailsCache(FakeCacheCollection(), "google_details", memory_size=2)
+    for place_id in ("p1", "p2", "p3"):
+        cache.put(place_id, {"id": place_id})
+
+    assert list(cache._memory) == ["p2", "p3"]
+
+
+def test_concurrent_requests_share_one_fetch():
+    cache = wellness.DetailsCache(FakeCacheCollection(), "google_details")
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(2)
+        return {"name": "Spa"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("p1", slow_fetch))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while cache.stats["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [{"name": "Spa"}] * 4
+
+
+def test_invalidate_forces_a_new_fetch():
+    collection = FakeCacheCollection()
+    cache = wellness.DetailsCache(collection, "google_details")
+    cache.get_or_fetch("p1", lambda: {"version": 1})
+
+    cache.invalidate("p1")
+
+    assert cache.get_or_fetch("p1", lambda: {"version": 2}) == {"version": 2}
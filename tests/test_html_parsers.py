@@ -0,0 +1,89 @@
+import pytest
+
+import wellness
+
+BING_PAGE = """
+<html><body>
+  <li class="b_algo">
+    <cite>https://www.tripadvisor.fr/Attraction_Review-g187147-d1-Reviews-Spa_Rivoli-Paris.html</cite>
+    <a href="https://www.tripadvisor.fr/Attraction_Review-g187147-d1-Reviews-Spa_Rivoli-Paris.html?ref=bing">Spa Rivoli</a>
+  </li>
+  <li class="b_algo">
+    <a href="https://www.bing.com/search?q=spa" data-url="https://www.tripadvisor.fr/Hotel_Review-x">Recherche</a>
+    <a href="https://www.example.com/">Autre site</a>
+  </li>
+</body></html>
+"""
+
+TRIPADVISOR_PAGE = """
+<html><body>
+  <div class="page"><div class="reviews"><div class="listing">
+    <div class="review-container"><p class="partial_entry"> Massage parfait, très bon accueil. </p></div>
+    <div class="review-container"><p class="partial_entry">Salon propre &amp; calme</p></div>
+    <div class="review-container"><span>Avis sans texte</span></div>
+  </div></div></div>
+  <div class="pagination">
+    <a class="nav previous" href="/Attraction_Review-g187147-d1-Reviews-Spa_Rivoli-Paris.html">Précédent</a>
+    <a class="nav next" href="/Attraction_Review-g187147-d1-Reviews-or10-Spa_Rivoli-Paris.html">Suivant</a>
+  </div>
+</body></html>
+"""
+
+BACKENDS = wellness.available_html_parsers()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_bing_backends_agree_with_bs4(backend):
+    urls = wellness.parse_bing_tripadvisor_urls(BING_PAGE.encode("utf-8"), backend)
+
+    assert urls == wellness.parse_bing_tripadvisor_urls(BING_PAGE, "bs4")
+    assert urls == ["https://www.tripadvisor.fr/Attraction_Review-g187147-d1-Reviews-Spa_Rivoli-Paris.html"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_tripadvisor_comments_are_extracted_by_every_backend(backend):
+    comments, _ = wellness.parse_tripadvisor_page(TRIPADVISOR_PAGE, "https://www.tripadvisor.fr/x", backend)
+
+    assert comments == ["Massage parfait, très bon accueil.", "Salon propre & calme"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_last_tripadvisor_page_has_no_next_url(backend):
+    assert wellness.parse_tripadvisor_page("<html></html>", "https://www.tripadvisor.fr/x", backend) == ([], False)
+
+
+def test_unavailable_backend_falls_back_to_the_fastest(monkeypatch):
+    monkeypatch.setattr(wellness, "SELECTOLAX_AVAILABLE", False)
+    monkeypatch.setattr(wellness, "LXML_AVAILABLE", False)
+
+    assert wellness.resolve_html_parser("selectolax") == "bs4-strainer"
+    assert wellness.resolve_html_parser("bs4") == "bs4"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_tripadvisor_backends_agree_with_bs4(backend):
+    url = "https://www.tripadvisor.fr/Attraction_Review-g187147-d1-Reviews-Spa_Rivoli-Paris.html"
+
+    comments, next_url = wellness.parse_tripadvisor_page(TRIPADVISOR_PAGE.encode("utf-8"), url, backend)
+
+    assert (comments, next_url) == wellness.parse_tripadvisor_page(TRIPADVISOR_PAGE, url, "bs4")
+    assert comments == ["Massage parfait, très bon accueil.", "Salon propre & calme"]
+    assert next_url == "https://www.tripadvisor.fr/Attraction_Review-g187147-d1-Reviews-or10-Spa_Rivoli-Paris.html"
+
+
+def test_strainer_only_builds_reviews_and_the_next_link():
+    soup = wellness.BeautifulSoup(TRIPADVISOR_PAGE, "html.parser", parse_only=wellness.TRIPADVISOR_STRAINER)
+
+    top_level = [(tag.name, tag.get("class")) for tag in soup.find_all(True, recursive=False)]
+    assert top_level == [("div", ["review-container"])] * 3 + [("a", ["nav", "next"])]
+    assert {tag.name for tag in soup.find_all(True)} == {"div", "p", "span", "a"}
+
+
+def test_benchmark_reports_no_mismatch_on_fixtures(tmp_path):
+    (tmp_path / "bing_1.html").write_text(BING_PAGE, encoding="utf-8")
+    (tmp_path / "tripadvisor_1.html").write_text(TRIPADVISOR_PAGE, encoding="utf-8")
+
+    results = wellness.benchmark_parsers(str(tmp_path), repeat=2)
+
+    assert set(results) == set(BACKENDS)
+    assert all(result["mismatches"] == [] for result in results.values())
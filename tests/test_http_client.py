@@ -0,0 +1,136 @@
+import asyncio
+
+import httpx
+import pytest
+
+import wellness
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(wellness.time, "sleep", delays.append)
+    monkeypatch.setattr(wellness.random, "uniform", lambda low, high: 1.0)
+    monkeypatch.setattr(wellness, "rate_limiter", wellness.RateLimiter({"test": (1000.0, 1000)}))
+    return delays
+
+
+def client_answering(*answers):
+    """HttpClient dont le transport rejoue les réponses (code HTTP ou exception) dans l'ordre."""
+    answers = list(answers)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        status, headers = answer if isinstance(answer, tuple) else (answer, {})
+        return httpx.Response(status, headers=headers, request=request)
+
+    client = wellness.HttpClient()
+    client.sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client, calls
+
+
+def test_retryable_statuses_are_retried_with_exponential_backoff(sleeps):
+    client, calls = client_answering(503, 502, 200)
+
+    response = client.get("test", "https://example.com/")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert sleeps == [wellness.HTTP_BACKOFF_BASE, wellness.HTTP_BACKOFF_BASE * 2]
+
+
+def test_retry_after_header_sets_the_delay(sleeps):
+    client, _ = client_answering((429, {"Retry-After": "7"}), 200)
+
+    assert client.get("test", "https://example.com/").status_code == 200
+    # Puis l'attente du seau à jetons, ralenti par le 429
+    assert sleeps[0] == 7.0
+
+
+def test_retry_after_is_capped(sleeps):
+    client, _ = client_answering((429, {"Retry-After": "3600"}), 200)
+
+    client.get("test", "https://example.com/")
+
+    assert sleeps[0] == wellness.HTTP_MAX_RETRY_AFTER
+
+
+def test_host_slot_is_released_while_waiting_to_retry(monkeypatch, sleeps):
+    client, _ = client_answering(503, 200)
+    semaphore = client._host_semaphore("https://example.com/")
+    free_slots = []
+    monkeypatch.setattr(wellness.time, "sleep", lambda delay: free_slots.append(semaphore._value))
+
+    client.get("test", "https://example.com/")
+
+    assert free_slots[0] == wellness.HTTP_MAX_CONNECTIONS_PER_HOST
+
+
+def test_last_response_is_returned_when_retries_run_out(sleeps):
+    client, calls = client_answering(*[500] * (wellness.HTTP_MAX_RETRIES + 1))
+
+    assert client.get("test", "https://example.com/").status_code == 500
+    assert len(calls) == wellness.HTTP_MAX_RETRIES + 1
+
+
+def test_client_errors_are_not_retried(sleeps):
+    client, calls = client_answering(404)
+
+    assert client.get("test", "https://example.com/").status_code == 404
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_transport_errors_are_retried_then_raised(sleeps):
+    error = httpx.ConnectError("refused")
+    client, calls = client_answering(error, 200)
+    assert client.get("test", "https://example.com/").status_code == 200
+
+    client, calls = client_answering(*[error] * (wellness.HTTP_MAX_RETRIES + 1))
+    with pytest.raises(httpx.ConnectError):
+        client.get("test", "https://example.com/")
+    assert len(calls) == wellness.HTTP_MAX_RETRIES + 1
+
+
+def test_throttled_upstream_is_slowed_down(sleeps):
+    client, _ = client_answering(429, 200)
+
+    client.get("test", "https://example.com/")
+
+    bucket = wellness.rate_limiter.buckets["test"]
+    assert bucket.rate < bucket.base_rate
+
+
+def test_connections_are_reused_from_one_pool(sleeps):
+    client, calls = client_answering(200, 200)
+
+    client.get("test", "https://example.com/a")
+    client.get("test", "https://example.com/b")
+
+    # Un seul client httpx (et son pool keep-alive) pour toutes les requêtes
+    assert [call.url.path for call in calls] == ["/a", "/b"]
+    assert client._host_semaphore("https://example.com/a") is client._host_semaphore("https://example.com/b")
+
+
+def test_async_requests_honour_retries(sleeps, monkeypatch):
+    async def no_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(wellness.asyncio, "sleep", no_sleep)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, request=request)
+
+    client = wellness.HttpClient()
+    client._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    response = asyncio.run(client.get_async("test", "https://example.com/", retries=0))
+
+    assert response.status_code == 503
+    assert len(calls) == 1
@@ -0,0 +1,113 @@
+import base64
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import wellness
+
+
+def png_bytes(color="red", size=(400, 300)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(wellness, "IMAGE_STORE_DIR", str(tmp_path))
+    return wellness.ImageStore(backend="local")
+
+
+def stored_files(tmp_path):
+    return sorted(path.name for path in tmp_path.rglob("*") if path.is_file())
+
+
+def test_identical_images_are_stored_once(store, tmp_path, monkeypatch):
+    writes = []
+    write = store._write
+    monkeypatch.setattr(store, "_write", lambda name, *args: writes.append(name) or write(name, *args))
+
+    first = store.put(png_bytes(), "image/png")
+    files = stored_files(tmp_path)
+    second = store.put(png_bytes(), "image/png")
+
+    assert first == second
+    assert stored_files(tmp_path) == files
+    assert len(writes) == len(files)
+
+
+def test_reference_is_the_content_hash(store):
+    data = png_bytes()
+
+    reference = store.put(data, "image/png")
+
+    image_hash = reference[len(wellness.IMAGE_PUBLIC_PREFIX):]
+    assert store.get(image_hash) == data
+    assert reference != store.put(png_bytes("blue"), "image/png")
+
+
+def test_thumbnails_are_generated_with_the_original(store):
+    image_hash = store.put(png_bytes(size=(400, 300)), "image/png")[len(wellness.IMAGE_PUBLIC_PREFIX):]
+
+    for size_name, max_width in wellness.IMAGE_THUMBNAIL_SIZES.items():
+        thumbnail = Image.open(BytesIO(store.get(image_hash, size_name)))
+        assert thumbnail.format == "JPEG"
+        assert thumbnail.size[0] == max_width
+
+
+def test_inline_data_url_is_replaced_by_a_reference(store):
+    data = png_bytes()
+    data_url = "data:image/png;base64," + base64.b64encode(data).decode()
+
+    reference = store.put_data_url(data_url)
+
+    assert wellness.is_inline_image(data_url)
+    assert not wellness.is_inline_image(reference)
+    assert store.get(reference[len(wellness.IMAGE_PUBLIC_PREFIX):]) == data
+
+
+def test_missing_image_returns_none(store):
+    assert store.get("0" * 64) is None
+
+
+def test_original_keeps_its_content_type(store, tmp_path):
+    store.put(png_bytes(), "image/png; charset=binary")
+
+    originals = [name for name in stored_files(tmp_path) if "_" not in name]
+    assert len(originals) == 1 and originals[0].endswith(".png")
+
+
+def test_concurrent_gridfs_upload_of_the_same_image_is_a_hit(store, monkeypatch):
+    from pymongo.errors import DuplicateKeyError
+
+    class FakeCollection:
+        def __init__(self):
+            self.deleted = []
+
+        def find_one(self, *args, **kwargs):
+            return None  # Un autre worker écrit la même image entre la vérification et l'envoi
+
+        def delete_many(self, query):
+            self.deleted.append(query)
+
+    class RacingBucket:
+        def __init__(self):
+            self.ids = []
+
+        def upload_from_stream_with_id(self, file_id, name, data, metadata=None):
+            self.ids.append(file_id)
+            raise DuplicateKeyError("E11000 duplicate key error: filename")
+
+    collections = {}
+    monkeypatch.setattr(wellness, "db", type("FakeDb", (), {
+        "__getitem__": lambda self, name: collections.setdefault(name, FakeCollection())
+    })())
+    store._bucket = RacingBucket()
+    data = png_bytes()
+
+    reference = store.put(data, "image/png")
+
+    assert reference == wellness.ImageStore.reference(wellness.hashlib.sha256(data).hexdigest())
+    chunks = collections[f"{wellness.IMAGE_STORE_BUCKET}.chunks"]
+    assert chunks.deleted == [{"files_id": file_id} for file_id in store._bucket.ids]
@@ -0,0 +1,96 @@
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+import wellness
+
+
+class FakeCollection:
+    def __init__(self, indexes=None, duplicates=False):
+        self.indexes = dict(indexes or {"_id_": {"key": [("_id", 1)]}})
+        self.duplicates = duplicates
+        self.dropped = []
+
+    def index_information(self):
+        return dict(self.indexes)
+
+    def create_index(self, keys, **options):
+        if self.duplicates and options.get("unique"):
+            raise OperationFailure("E11000 duplicate key error")
+        name = "_".join(f"{field}_{direction}" for field, direction in keys)
+        self.indexes[name] = dict(options, key=list(keys))
+        return name
+
+    def drop_index(self, name):
+        self.dropped.append(name)
+        del self.indexes[name]
+
+
+class FakeDb:
+    def __init__(self, **collections):
+        self.collections = collections
+        self.commands = []
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+    def command(self, *args, **kwargs):
+        self.commands.append((args, kwargs))
+
+
+def test_missing_indexes_are_created_with_their_options(monkeypatch):
+    fake_db = FakeDb()
+    monkeypatch.setattr(wellness, "db", fake_db)
+
+    wellness.ensure_indexes()
+
+    for collection_name, specs in wellness.INDEX_SPECS.items():
+        existing = fake_db[collection_name].index_information()
+        for keys, options in specs:
+            name, info = wellness._find_index(existing, keys)
+            assert name is not None, (collection_name, keys)
+            assert wellness._index_mismatch(info, options) is None
+
+
+def test_second_run_creates_nothing(monkeypatch):
+    fake_db = FakeDb()
+    monkeypatch.setattr(wellness, "db", fake_db)
+    wellness.ensure_indexes()
+    before = {name: collection.index_information() for name, collection in fake_db.collections.items()}
+
+    wellness.ensure_indexes()
+
+    assert {name: collection.index_information() for name, collection in fake_db.collections.items()} == before
+    assert fake_db.commands == []
+
+
+def test_changed_ttl_is_updated_in_place(monkeypatch):
+    ttl_keys = [("timestamp", ASCENDING)]
+    places_cache = FakeCollection({"timestamp_1": {"key": ttl_keys, "expireAfterSeconds": 60}})
+    fake_db = FakeDb(PlacesCache=places_cache)
+    monkeypatch.setattr(wellness, "db", fake_db)
+
+    wellness.ensure_indexes()
+
+    (args, kwargs), = fake_db.commands
+    assert args == ("collMod", "PlacesCache")
+    assert kwargs["index"] == {"keyPattern": {"timestamp": ASCENDING},
+                               "expireAfterSeconds": wellness.CACHE_TTL_DAYS * 86400}
+
+
+def test_duplicates_blocking_a_unique_index_do_not_stop_startup(monkeypatch):
+    beauty_places = FakeCollection(duplicates=True)
+    monkeypatch.setattr(wellness, "db", FakeDb(BeautyPlaces=beauty_places))
+
+    wellness.ensure_indexes()
+
+    assert wellness._find_index(beauty_places.index_information(), [("place_id", ASCENDING)]) == (None, None)
+    assert wellness._find_index(beauty_places.index_information(), [("last_updated", ASCENDING)])[0] is not None
+
+
+def test_obsolete_index_is_dropped(monkeypatch):
+    details_cache = FakeCollection({"place_id_1": {"key": [("place_id", 1)], "unique": True}})
+    monkeypatch.setattr(wellness, "db", FakeDb(PlaceDetailsCache=details_cache))
+
+    wellness.ensure_indexes()
+
+    assert details_cache.dropped == ["place_id_1"]
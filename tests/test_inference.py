@@ -0,0 +1,61 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import wellness
+
+
+@pytest.fixture
+def failing_daemon(monkeypatch):
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            hits.append(self.path)
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(503)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(wellness, "INFERENCE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(wellness, "_inference_unavailable_until", 0.0)
+    yield hits
+    server.shutdown()
+
+
+def test_failing_daemon_is_called_once_then_skipped(failing_daemon):
+    assert wellness.inference_request("/generate", {"prompt": "x"}) is None
+    assert failing_daemon == ["/generate"]
+
+    # Pendant INFERENCE_RETRY_DELAY, le daemon n'est plus sollicité
+    assert wellness.inference_request("/generate", {"prompt": "x"}) is None
+    assert failing_daemon == ["/generate"]
+
+
+def test_serve_inference_uses_configured_batch_size(monkeypatch):
+    servers = []
+
+    class FakeServer:
+        def __init__(self, address, handler):
+            servers.append(self)
+
+        def serve_forever(self):
+            raise KeyboardInterrupt
+
+        def server_close(self):
+            pass
+
+    # --analysis-batch-size modifie le global après la définition d'AnalysisBatcher
+    monkeypatch.setattr(wellness, "ThreadingHTTPServer", FakeServer)
+    monkeypatch.setattr(wellness, "ANALYSIS_BATCH_SIZE", 7)
+    monkeypatch.setattr(wellness, "ANALYSIS_BATCH_MAX_WAIT", 0.5)
+    wellness.serve_inference("127.0.0.1", 0)
+
+    batcher = servers[0].batcher
+    assert batcher.batch_size == 7
+    assert batcher.max_wait == 0.5
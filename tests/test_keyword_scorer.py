@@ -0,0 +1,78 @@
+import pytest
+
+import wellness
+
+MOTS_CLES = {"Cat": {"Propreté": ["propre", "hygiène"], "Accueil": ["accueil"]}}
+POLARITE = {"positif": ["excellent", "parfait"], "négatif": ["sale", "horrible"]}
+
+
+@pytest.fixture
+def scorer():
+    return wellness.KeywordCriteriaScorer(MOTS_CLES, POLARITE, ["pas", "jamais"])
+
+
+def test_each_clause_carries_its_own_polarity(scorer):
+    mentions, _ = scorer.scan("Accueil excellent. Hygiène horrible", "Cat")
+    assert mentions == [("Accueil", 1), ("Propreté", -1)]
+
+
+def test_accents_and_inflections_are_matched(scorer):
+    mentions, _ = scorer.scan("L'HYGIÈNE était parfaite", "Cat")
+    assert mentions == [("Propreté", 1)]
+
+
+def test_negation_flips_the_following_term(scorer):
+    mentions, polarity = scorer.scan("Accueil pas excellent", "Cat")
+    assert mentions == [("Accueil", -1)]
+    assert polarity == -1
+
+
+def test_negation_does_not_cross_mais(scorer):
+    mentions, _ = scorer.scan("L'hygiène n'est pas parfaite mais accueil parfait", "Cat")
+    assert mentions == [("Propreté", -1), ("Accueil", 1)]
+
+
+def test_negation_does_not_cross_commas():
+    scorer = wellness.KeywordCriteriaScorer(wellness.MOTS_CLES)
+    category = "Soins esthétiques et bien-être"
+
+    mentions, polarity = scorer.scan("Rien à redire, accueil excellent", category)
+
+    assert mentions == [("Accueil", 1)]
+    assert polarity == 1
+    assert wellness.score_sentiment_text("Rien à redire, accueil excellent") > 0
+
+
+def test_negation_only_reaches_the_next_few_words(scorer):
+    assert scorer.scan("Accueil pas vraiment très excellent", "Cat")[0] == [("Accueil", -1)]
+    assert scorer.scan("Jamais attendu une seule minute pour un accueil excellent", "Cat")[0] == [("Accueil", 1)]
+
+
+def test_keywords_of_other_categories_are_ignored(scorer):
+    mentions, polarity = scorer.scan("Accueil excellent", "Autre")
+    assert mentions == []
+    assert polarity == 1
+
+
+def test_unmentioned_criteria_get_the_overall_sentiment(scorer):
+    reviews = [{"text": "Accueil excellent", "rating": 5}, {"text": "Rien à signaler", "rating": 5}]
+    analysis = scorer.score(reviews, "Cat", ["Accueil", "Propreté"])
+
+    assert analysis["analyse"]["Accueil"] == {"note": 5.0, "mentions": 1}
+    assert analysis["analyse"]["Propreté"] == {"note": 5.0, "mentions": 0}
+    assert analysis["sentiment_general"] == "positif"
+
+
+def test_neutral_mentions_fall_back_on_the_star_rating(scorer):
+    analysis = scorer.score([{"text": "Accueil", "rating": 1}], "Cat", ["Accueil"])
+
+    assert analysis["analyse"]["Accueil"]["note"] == 0.0
+    assert analysis["lexical_score"] == 0.0
+    assert analysis["sentiment_general"] == "négatif"
+
+
+def test_plain_string_reviews_use_lexical_polarity(scorer):
+    analysis = scorer.score(["Hygiène horrible"], "Cat", ["Propreté"])
+
+    assert analysis["analyse"]["Propreté"]["note"] == 0.0
+    assert analysis["sentiment_score"] == -1.0
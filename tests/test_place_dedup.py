@@ -0,0 +1,43 @@
+import pytest
+
+import wellness
+
+
+@pytest.fixture(autouse=True)
+def fresh_seen_ids(monkeypatch):
+    monkeypatch.setattr(wellness, "SEEN_PLACE_IDS", set())
+
+
+def place(place_id, category, *google_types):
+    return {"place_id": place_id, "name": place_id, "category": category,
+            "google_type": google_types[0], "google_types": list(google_types)}
+
+
+def test_duplicates_keep_types_and_categories_of_every_query():
+    places = [
+        place("a", "Spa", "spa"),
+        place("b", "Spa", "spa"),
+        place("a", "Beauté", "beauty_salon", "spa"),
+        place("a", "Coiffure", "hair_care"),
+    ]
+
+    claimed = wellness.claim_unseen_places(places)
+
+    assert [p["place_id"] for p in claimed] == ["a", "b"]
+    assert claimed[0]["category"] == "Spa"
+    assert claimed[0]["categories"] == ["Spa", "Beauté", "Coiffure"]
+    assert claimed[0]["google_types"] == ["spa", "beauty_salon", "hair_care"]
+    assert claimed[1]["categories"] == ["Spa"]
+
+
+def test_merge_does_not_mutate_discovered_places():
+    first = place("a", "Spa", "spa")
+    wellness.merge_duplicate_places([first, place("a", "Beauté", "beauty_salon")])
+
+    assert first["google_types"] == ["spa"]
+    assert "categories" not in first
+
+
+def test_places_seen_in_an_earlier_zone_are_not_claimed_again():
+    assert len(wellness.claim_unseen_places([place("a", "Spa", "spa")])) == 1
+    assert wellness.claim_unseen_places([place("a", "Beauté", "beauty_salon")]) == []
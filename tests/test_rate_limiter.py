@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+import wellness
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(wellness.time, "monotonic", clock)
+    return clock
+
+
+def test_burst_is_free_then_requests_wait_for_the_rate(clock):
+    bucket = wellness.TokenBucket("test", rate=2.0, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    # Les réservations suivantes s'alignent derrière la précédente
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_over_time_up_to_burst(clock):
+    bucket = wellness.TokenBucket("test", rate=1.0, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 60
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_slow_down_halves_rate_down_to_floor(clock):
+    bucket = wellness.TokenBucket("test", rate=8.0, burst=5)
+
+    bucket.slow_down()
+    assert bucket.rate == 4.0
+    # Les jetons accumulés sont perdus: la requête suivante attend
+    assert bucket.reserve() > 0
+    for _ in range(20):
+        bucket.slow_down()
+    assert bucket.rate == pytest.approx(8.0 * wellness.RATE_LIMIT_MIN_FACTOR)
+
+
+def test_speed_up_recovers_towards_base_rate(clock):
+    bucket = wellness.TokenBucket("test", rate=10.0, burst=1)
+    bucket.slow_down()
+
+    for _ in range(50):
+        bucket.speed_up()
+    assert bucket.rate == 10.0
+
+
+def test_rate_limiter_adapts_to_status_codes(clock):
+    limiter = wellness.RateLimiter({"api": (4.0, 1)})
+
+    limiter.report("api", 429)
+    assert limiter.buckets["api"].rate == 2.0
+    limiter.report("api", 200)
+    assert limiter.buckets["api"].rate == pytest.approx(2.2)
+
+
+def test_concurrent_adjustments_keep_rate_within_bounds():
+    bucket = wellness.TokenBucket("test", rate=10.0, burst=1)
+
+    def adjust(slow):
+        for _ in range(500):
+            bucket.slow_down() if slow else bucket.speed_up()
+
+    threads = [threading.Thread(target=adjust, args=(i % 2 == 0,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 10.0 * wellness.RATE_LIMIT_MIN_FACTOR <= bucket.rate <= 10.0
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import wellness
+
+NOW = datetime(2025, 1, 1)
+
+
+def stored_place(days_old, ratings_total, **extra):
+    place = {"last_updated": NOW - timedelta(days=days_old), "rating": 4.5, "user_ratings_total": ratings_total}
+    place.update(extra)
+    return place
+
+
+def test_older_places_come_first():
+    assert wellness.refresh_priority(stored_place(60, 50), NOW) > wellness.refresh_priority(stored_place(10, 50), NOW)
+
+
+def test_popular_places_come_first_at_same_age():
+    assert wellness.refresh_priority(stored_place(30, 5000), NOW) > wellness.refresh_priority(stored_place(30, 5), NOW)
+
+
+def test_never_updated_place_is_urgent():
+    assert wellness.refresh_priority({"user_ratings_total": 5}, NOW) > wellness.refresh_priority(stored_place(90, 5), NOW)
+
+
+def test_changes_seen_by_nearby_raise_priority():
+    seen = {"nearby_seen_at": NOW, "nearby_user_ratings_total": 80, "nearby_rating": 4.0}
+    assert wellness.refresh_priority(stored_place(5, 50, **seen), NOW) > wellness.refresh_priority(stored_place(5, 50), NOW)
+
+
+def test_changes_seen_before_last_update_are_ignored():
+    seen = {"nearby_seen_at": NOW - timedelta(days=10), "nearby_user_ratings_total": 80, "nearby_rating": 4.0}
+    assert wellness.refresh_priority(stored_place(5, 50, **seen), NOW) == wellness.refresh_priority(stored_place(5, 50), NOW)
+
+
+def test_process_place_keeps_discovery_popularity(monkeypatch):
+    saved = []
+    monkeypatch.setattr(wellness, "scrape_place_details", lambda place_id, name: {
+        "place_id": place_id, "name": name, "rating": 4.2, "user_ratings_total": None,
+        "gps_coordinates": {}, "comments": [],
+    })
+    monkeypatch.setattr(wellness, "save_to_mongo", lambda place: saved.append(place) or True)
+    discovered = {
+        "place_id": "p1", "name": "Spa", "category": "Soins esthétiques et bien-être",
+        "rating": 4.0, "user_ratings_total": 321, "gps_coordinates": {"lat": 48.85, "lng": 2.35},
+    }
+
+    wellness.process_place(discovered)
+
+    assert saved[0]["user_ratings_total"] == 321
+    assert saved[0]["gps_coordinates"] == {"lat": 48.85, "lng": 2.35}
+    assert saved[0]["rating"] == 4.2
+
+
+class FakeScheduler:
+    def __init__(self, places):
+        self.places = list(places)
+        self.released = []
+
+    def next_place(self):
+        return self.places.pop(0) if self.places else None
+
+    def release(self, place_id):
+        self.released.append(place_id)
+
+
+def test_refresh_daemon_batches_writes_and_releases_failed_places(monkeypatch):
+    from test_worker import FakeCollection
+
+    collection = FakeCollection(failing={"op_p2"})
+    buffer = wellness.BulkWriteBuffer(collection, max_ops=100, max_delay=60)
+    monkeypatch.setattr(wellness, "_write_buffers", {"BeautyPlaces": buffer})
+    scheduler = FakeScheduler({"place_id": f"p{i}", "name": f"p{i}"} for i in range(1, 4))
+    monkeypatch.setattr(wellness, "RefreshScheduler", lambda: scheduler)
+    for cache in (wellness.google_details_cache, wellness.place_record_cache):
+        monkeypatch.setattr(cache, "invalidate", lambda place_id: None)
+
+    def fake_process_place(place):
+        buffer.add(f"op_{place['place_id']}", label=place["place_id"], track=True)
+        return dict(place)
+
+    monkeypatch.setattr(wellness, "process_place", fake_process_place)
+
+    assert wellness.run_refresh_daemon(rate_per_hour=3.6e9, max_places=3, concurrency=1) == 3
+    # Les trois lieux rafraîchis partent en un seul lot, à l'arrêt
+    assert len(collection.batches) == 1
+    assert scheduler.released == ["p2"]
+    assert buffer.pop_outcomes(["p1", "p2", "p3"]) == ([], [])
+    buffer.close()
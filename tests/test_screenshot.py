@@ -0,0 +1,84 @@
+import base64
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import wellness
+
+
+class FakeDriver:
+    """Page dont le nombre de ressources chargées suit resource_counts, une valeur par sondage."""
+
+    def __init__(self, resource_counts, title_present=True):
+        self.resource_counts = list(resource_counts)
+        self.title_present = title_present
+        self.cdp_calls = []
+
+    def find_element(self, by, value):
+        if not self.title_present:
+            from selenium.common.exceptions import NoSuchElementException
+            raise NoSuchElementException(value)
+        return object()
+
+    def execute_script(self, script):
+        count = self.resource_counts.pop(0) if len(self.resource_counts) > 1 else self.resource_counts[0]
+        return ["complete", count]
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_calls.append((command, params))
+        return {"data": "anBlZw=="}
+
+
+@pytest.fixture(autouse=True)
+def fast_idle(monkeypatch):
+    monkeypatch.setattr(wellness, "SCREENSHOT_NETWORK_IDLE_MS", 200)
+    monkeypatch.setattr(wellness, "SCREENSHOT_NETWORK_IDLE_TIMEOUT", 2)
+
+
+def test_page_is_ready_once_the_network_goes_idle():
+    driver = FakeDriver([10, 20, 30, 30])
+
+    assert wellness.wait_for_page_ready(driver, timeout=1)
+    # La page n'est déclarée prête qu'après avoir vu le nombre de ressources se stabiliser
+    assert driver.resource_counts == [30]
+
+
+def test_page_that_keeps_loading_times_out(monkeypatch):
+    monkeypatch.setattr(wellness, "SCREENSHOT_NETWORK_IDLE_TIMEOUT", 0.5)
+    driver = FakeDriver(list(range(1000)))
+
+    assert not wellness.wait_for_page_ready(driver, timeout=1)
+
+
+def test_missing_place_title_does_not_wait_for_the_network():
+    driver = FakeDriver([1], title_present=False)
+
+    assert not wellness.wait_for_page_ready(driver, timeout=0.2)
+
+
+def test_capture_requests_only_the_clip_as_jpeg():
+    driver = FakeDriver([0])
+
+    assert wellness.capture_clip_jpeg_base64(driver, clip=(30, 70, 330, 230), quality=80) == "anBlZw=="
+    command, params = driver.cdp_calls[0]
+    assert command == "Page.captureScreenshot"
+    assert params["format"] == "jpeg" and params["quality"] == 80
+    assert params["clip"] == {"x": 30, "y": 70, "width": 300, "height": 160, "scale": 1}
+
+
+def test_capture_without_cdp_crops_the_full_screenshot():
+    class NoCdpDriver(FakeDriver):
+        def execute_cdp_cmd(self, command, params):
+            raise RuntimeError("CDP indisponible")
+
+        def get_screenshot_as_png(self):
+            buffer = BytesIO()
+            Image.new("RGB", (1280, 800), "white").save(buffer, format="PNG")
+            return buffer.getvalue()
+
+    encoded = wellness.capture_clip_jpeg_base64(NoCdpDriver([0]), clip=(30, 70, 330, 230))
+
+    image = Image.open(BytesIO(base64.b64decode(encoded)))
+    assert image.format == "JPEG"
+    assert image.size == (300, 160)
@@ -0,0 +1,100 @@
+import pytest
+
+import wellness
+
+
+@pytest.mark.parametrize("text", [
+    "Pas terrible, déçu",
+    "Pas accueillant du tout.",
+    "Jamais propre",
+    "Très mauvais accueil",
+])
+def test_negative_reviews(text):
+    assert wellness.score_sentiment_text(text) < 0
+
+
+@pytest.mark.parametrize("text", [
+    "C'est pas mal du tout",
+    "Pas de souci, accueil parfait",
+    "Pas déçu !",
+    "Excellent, je recommande",
+])
+def test_positive_reviews(text):
+    assert wellness.score_sentiment_text(text) > 0
+
+
+def test_negation_does_not_cross_clause_punctuation():
+    assert wellness.score_sentiment_text("Pas de problème. Parfait") > 0
+    assert wellness.score_sentiment_text("Pas de souci; déçu quand même") < 0
+
+
+def test_negation_applies_to_next_polar_term_only():
+    # "pas" inverse "sale" mais pas "parfait" qui suit
+    assert wellness.score_sentiment_text("pas sale et parfait") == wellness.score_sentiment_text("propre et parfait")
+
+
+def test_intensifier_increases_magnitude():
+    assert wellness.score_sentiment_text("très bon") > wellness.score_sentiment_text("bon") > 0
+
+
+def test_score_is_bounded():
+    assert -1 <= wellness.score_sentiment_text("nul " * 50) < 0
+    assert wellness.score_sentiment_text("") == 0
+
+
+def test_engine_stats_are_updated_under_the_lock(monkeypatch):
+    class CachedScores:
+        name = "SentimentCache"
+
+        def find(self, query, projection=None):
+            return [{"_id": key, "score": 0.5} for key in query["_id"]["$in"][:1]]
+
+    engine = wellness.SentimentEngine(CachedScores())
+
+    class LockedStats(dict):
+        def __setitem__(self, key, value):
+            assert engine._lock.locked(), f"stats[{key!r}] modifié hors du verrou"
+            super().__setitem__(key, value)
+
+    engine.stats = LockedStats(engine.stats)
+    monkeypatch.setattr(wellness, "get_write_buffer", lambda name: type("Buffer", (), {"add": lambda self, op: None})())
+
+    engine.score_batch(["Accueil parfait", "Hygiène horrible"])
+    engine.score_batch(["Accueil parfait"])
+
+    assert engine.stats == {"memory_hits": 1, "db_hits": 1, "computed": 1}
+
+
+def test_rescore_updates_stored_google_reviews(monkeypatch):
+    place = {"_id": "p1", "comments": ["Accueil parfait"],
+             "google_reviews": [{"text": "Accueil parfait", "rating": 5, "sentiment": "Neutre", "sentiment_score": 0}]}
+
+    class Places:
+        def find(self, query, projection=None):
+            assert query == {"google_reviews.0": {"$exists": True}}
+            return [{"_id": place["_id"], "google_reviews": place["google_reviews"]}]
+
+    class ApplyingBuffer:
+        def add(self, operation, label=None, track=False):
+            assert operation._filter == {"_id": place["_id"]}
+            place.update(operation._doc["$set"])
+
+    class InlineExecutor:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(wellness, "db", type("FakeDb", (), {"BeautyPlaces": Places()})())
+    monkeypatch.setattr(wellness, "ProcessPoolExecutor", InlineExecutor)
+    monkeypatch.setattr(wellness.sentiment_engine, "score_batch", lambda texts, executor=None: [0.8] * len(texts))
+    monkeypatch.setattr(wellness, "get_write_buffer", lambda name: ApplyingBuffer())
+    monkeypatch.setattr(wellness, "flush_write_buffers", lambda: {})
+
+    assert wellness.rescore_sentiments(workers=1) == 1
+    assert place["google_reviews"] == [{"text": "Accueil parfait", "rating": 5, "sentiment": "Positif", "sentiment_score": 0.8}]
+    assert place["comments"] == ["Accueil parfait"]
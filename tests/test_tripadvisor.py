@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import pytest
+
+import wellness
+
+
+class FakeUrlCache:
+    def __init__(self):
+        self.documents = {}
+
+    def find_one(self, query):
+        document = self.documents.get(query["place_id"])
+        if document and document["expires_at"] > query["expires_at"]["$gt"]:
+            return document
+        return None
+
+    def update_one(self, query, update, upsert=False):
+        self.documents[query["place_id"]] = dict(update["$set"], place_id=query["place_id"])
+
+
+class FakeDb:
+    def __init__(self):
+        self.TripadvisorUrlCache = FakeUrlCache()
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+    results = {}
+
+    def fake_lookup(name, city="Paris"):
+        calls.append(name)
+        return results.get(name), True
+
+    monkeypatch.setattr(wellness, "db", FakeDb())
+    monkeypatch.setattr(wellness, "lookup_tripadvisor_url", fake_lookup)
+    monkeypatch.setattr(wellness, "BING_SEARCH_CACHE", OrderedDict())
+    return calls, results
+
+
+def test_found_url_is_served_from_memory(lookups):
+    calls, results = lookups
+    results["Spa"] = "https://www.tripadvisor.fr/Attraction_Review-g1-d2-Reviews-Spa.html"
+
+    assert wellness.resolve_tripadvisor_url("p1", "Spa") == results["Spa"]
+    assert wellness.resolve_tripadvisor_url("p1", "Spa") == results["Spa"]
+    assert calls == ["Spa"]
+
+
+def test_expired_negative_entry_is_searched_again(lookups):
+    calls, _ = lookups
+    assert wellness.resolve_tripadvisor_url("p1", "Spa") is None
+
+    # Après le TTL négatif, ni la mémoire ni la base ne doivent servir l'absence de page
+    expired = datetime.now() - timedelta(seconds=1)
+    wellness.BING_SEARCH_CACHE["p1"] = (None, expired)
+    wellness.db.TripadvisorUrlCache.documents["p1"]["expires_at"] = expired
+
+    assert wellness.resolve_tripadvisor_url("p1", "Spa") is None
+    assert calls == ["Spa", "Spa"]
+
+
+def test_memory_cache_is_bounded(lookups, monkeypatch):
+    monkeypatch.setattr(wellness, "BING_SEARCH_CACHE_SIZE", 2)
+    for place_id in ("p1", "p2", "p3"):
+        wellness.resolve_tripadvisor_url(place_id, place_id)
+    assert list(wellness.BING_SEARCH_CACHE) == ["p2", "p3"]
+
@@ -0,0 +1,22 @@
+import wellness
+
+
+def test_tripadvisor_page_urls_precomputes_offsets():
+    url = "https://www.tripadvisor.fr/Attraction_Review-g187147-d1-Reviews-Spa-Paris.html"
+    assert wellness.tripadvisor_page_urls(url, max_pages=3) == [
+        url,
+        "https://www.tripadvisor.fr/Attraction_Review-g187147-d1-Reviews-or10-Spa-Paris.html",
+        "https://www.tripadvisor.fr/Attraction_Review-g187147-d1-Reviews-or20-Spa-Paris.html",
+    ]
+
+
+def test_tripadvisor_page_urls_restarts_from_an_offset_url():
+    url = "https://www.tripadvisor.fr/Attraction_Review-g1-d1-Reviews-or30-Spa.html"
+    assert wellness.tripadvisor_page_urls(url, max_pages=2) == [
+        "https://www.tripadvisor.fr/Attraction_Review-g1-d1-Reviews-Spa.html",
+        "https://www.tripadvisor.fr/Attraction_Review-g1-d1-Reviews-or10-Spa.html",
+    ]
+
+
+def test_tripadvisor_page_urls_without_pattern():
+    assert wellness.tripadvisor_page_urls("https://example.com/spa", max_pages=3) == ["https://example.com/spa"]
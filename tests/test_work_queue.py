@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import wellness
+
+START = datetime(2025, 1, 1, 12, 0)
+
+
+def matches(document, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+            continue
+        value = document.get(field)
+        if isinstance(condition, dict):
+            for operator, operand in condition.items():
+                if operator == "$lt" and not (value is not None and value < operand):
+                    return False
+                if operator == "$gte" and not (value is not None and value >= operand):
+                    return False
+                if operator == "$in" and value not in operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class Result:
+    def __init__(self, modified=0, upserted=0):
+        self.modified_count = modified
+        self.upserted_count = upserted
+
+
+class MemoryCollection:
+    """Sous-ensemble des opérations pymongo utilisées par WorkQueue."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def _apply(self, document, update, inserting=False):
+        if inserting:
+            document.update(update.get("$setOnInsert", {}))
+        document.update(update.get("$set", {}))
+        for field, amount in update.get("$inc", {}).items():
+            document[field] = document.get(field, 0) + amount
+
+    def bulk_write(self, operations, ordered=False):
+        upserted = 0
+        for operation in operations:
+            job_id = operation._filter["_id"]
+            inserting = job_id not in self.documents
+            document = self.documents.setdefault(job_id, {"_id": job_id})
+            self._apply(document, operation._doc, inserting)
+            upserted += inserting
+        return Result(upserted=upserted)
+
+    def find_one_and_update(self, query, update, sort=None, return_document=None):
+        candidates = [document for document in self.documents.values() if matches(document, query)]
+        for field, _ in reversed(sort or []):
+            candidates.sort(key=lambda document: document[field])
+        if not candidates:
+            return None
+        self._apply(candidates[0], update)
+        return dict(candidates[0])
+
+    def update_one(self, query, update):
+        for document in self.documents.values():
+            if matches(document, query):
+                self._apply(document, update)
+                return Result(modified=1)
+        return Result()
+
+    def update_many(self, query, update):
+        documents = [document for document in self.documents.values() if matches(document, query)]
+        for document in documents:
+            self._apply(document, update)
+        return Result(modified=len(documents))
+
+    def delete_many(self, query):
+        for job_id in [job_id for job_id, document in self.documents.items() if matches(document, query)]:
+            del self.documents[job_id]
+
+    def count_documents(self, query, limit=0):
+        return sum(1 for document in self.documents.values() if matches(document, query))
+
+
+class Clock:
+    def __init__(self):
+        self.current = START
+
+    def now(self):
+        return self.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(wellness, "datetime", clock)
+    return clock
+
+
+@pytest.fixture
+def work_queue(monkeypatch, clock):
+    monkeypatch.setattr(wellness, "db", type("FakeDb", (), {"ScrapeJobs": MemoryCollection()})())
+    return wellness.WorkQueue("paris")
+
+
+def zone(zone_id):
+    return {"id": zone_id, "lat": 48.85, "lng": 2.35, "radius": 500, "google_types": ["spa"]}
+
+
+def test_places_are_claimed_before_zones_and_not_duplicated(work_queue):
+    work_queue.seed_zones([zone("z1")])
+    assert work_queue.enqueue_places([{"place_id": "p1"}, {"place_id": "p2"}]) == 2
+    assert work_queue.enqueue_places([{"place_id": "p1"}]) == 0
+
+    claimed = [work_queue.claim("w1")["_id"] for _ in range(3)]
+
+    assert claimed == ["paris:place:p1", "paris:place:p2", "paris:zone:z1"]
+    assert work_queue.claim("w1") is None
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(work_queue, clock):
+    work_queue.seed_zones([zone("z1")])
+    job = work_queue.claim("w1")
+    assert work_queue.claim("w2") is None
+
+    clock.current += timedelta(seconds=wellness.QUEUE_LEASE_SECONDS + 1)
+    reclaimed = work_queue.claim("w2")
+
+    assert reclaimed["_id"] == job["_id"]
+    assert reclaimed["lease_owner"] == "w2"
+    assert reclaimed["attempts"] == 2
+    # Le premier worker a perdu son bail: son résultat n'est pas enregistré
+    assert not work_queue.complete(job, "w1")
+    assert work_queue.complete(reclaimed, "w2")
+    assert not work_queue.has_open_jobs()
+
+
+def test_renewed_lease_is_not_reclaimed(work_queue, clock):
+    work_queue.seed_zones([zone("z1")])
+    job = work_queue.claim("w1")
+
+    clock.current += timedelta(seconds=wellness.QUEUE_LEASE_SECONDS - 1)
+    assert work_queue.renew({job["_id"]}, "w1") == 1
+    clock.current += timedelta(seconds=2)
+
+    assert work_queue.claim("w2") is None
+
+
+def test_job_abandoned_too_often_is_swept_as_failed(work_queue, clock):
+    work_queue.seed_zones([zone("z1")])
+    for attempt in range(wellness.QUEUE_MAX_ATTEMPTS):
+        assert work_queue.claim(f"w{attempt}") is not None
+        clock.current += timedelta(seconds=wellness.QUEUE_LEASE_SECONDS + 1)
+
+    assert work_queue.claim("w_last") is None
+    assert work_queue.sweep_expired() == 1
+    assert not work_queue.has_open_jobs()
+
+
+def test_failed_job_returns_to_the_queue_until_attempts_run_out(work_queue):
+    work_queue.seed_zones([zone("z1")])
+    statuses = []
+    while (job := work_queue.claim("w1")) is not None:
+        statuses.append(work_queue.fail(job, "w1", "timeout"))
+
+    assert statuses == ["pending"] * (wellness.QUEUE_MAX_ATTEMPTS - 1) + ["failed"]
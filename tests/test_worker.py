@@ -0,0 +1,74 @@
+from pymongo.errors import BulkWriteError
+
+import wellness
+
+
+class FakeCollection:
+    name = "BeautyPlaces"
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.batches = []
+
+    def bulk_write(self, operations, ordered=False):
+        self.batches.append(list(operations))
+        errors = [{"index": i, "errmsg": "duplicate key"} for i, op in enumerate(operations) if op in self.failing]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+        return type("Result", (), {"upserted_count": len(operations), "matched_count": 0, "modified_count": 0})()
+
+
+class FakeQueue:
+    def __init__(self, place_ids):
+        self.pending = [{"_id": f"job_{place_id}", "kind": "place", "attempts": 1,
+                         "payload": {"place_id": place_id, "name": place_id}} for place_id in place_ids]
+        self.leased = {}
+        self.completed = []
+        self.failed = []
+
+    def claim(self, worker_id):
+        if not self.pending:
+            return None
+        job = self.pending.pop(0)
+        self.leased[job["_id"]] = job
+        return job
+
+    def complete(self, job, worker_id, outcome="done"):
+        self.completed.append((self.leased.pop(job["_id"])["payload"]["place_id"], outcome))
+        return True
+
+    def fail(self, job, worker_id, error):
+        self.failed.append(self.leased.pop(job["_id"])["payload"]["place_id"])
+        return "failed"
+
+    def renew(self, job_ids, worker_id):
+        return len(job_ids)
+
+    def sweep_expired(self):
+        return 0
+
+    def has_open_jobs(self):
+        return bool(self.pending or self.leased)
+
+
+def test_place_jobs_complete_once_their_write_is_confirmed(monkeypatch):
+    collection = FakeCollection(failing={"op_p2"})
+    buffer = wellness.BulkWriteBuffer(collection, max_ops=100, max_delay=60)
+    monkeypatch.setattr(wellness, "_write_buffers", {"BeautyPlaces": buffer})
+    queue = FakeQueue(["p1", "p2", "p3"])
+    monkeypatch.setattr(wellness, "WorkQueue", lambda plan_name: queue)
+
+    def fake_process_place(place):
+        # Aucun job ne doit être terminé avant l'envoi de son écriture
+        assert queue.completed == []
+        buffer.add(f"op_{place['place_id']}", label=place["place_id"], track=True)
+        return dict(place)
+
+    monkeypatch.setattr(wellness, "process_place", fake_process_place)
+
+    assert wellness.run_worker("paris", worker_id="test", concurrency=1) == 2
+    # Les écritures des trois lieux partent en un seul lot
+    assert len(collection.batches) == 1
+    assert sorted(queue.completed) == [("p1", "saved"), ("p3", "saved")]
+    assert queue.failed == ["p2"]
+    buffer.close()
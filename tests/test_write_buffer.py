@@ -0,0 +1,207 @@
+import time
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+import wellness
+
+
+class FakeCollection:
+    def __init__(self, name="BeautyPlaces", failing=()):
+        self.name = name
+        self.failing = set(failing)
+        self.written = []
+
+    def bulk_write(self, operations, ordered=False):
+        errors = [{"index": i, "errmsg": "duplicate key"} for i, op in enumerate(operations) if op in self.failing]
+        self.written.extend(op for op in operations if op not in self.failing)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nUpserted": len(operations) - len(errors)})
+        return type("Result", (), {"upserted_count": len(operations), "matched_count": 0, "modified_count": 0})()
+
+
+def make_buffer(collection, max_delay=60):
+    return wellness.BulkWriteBuffer(collection, max_ops=100, max_delay=max_delay)
+
+
+def wait_until(condition):
+    deadline = time.monotonic() + 2
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_operations_are_sent_in_one_bulk_write_when_the_buffer_is_full():
+    collection = FakeCollection()
+    buffer = wellness.BulkWriteBuffer(collection, max_ops=3, max_delay=60)
+
+    buffer.add("op_a")
+    buffer.add("op_b")
+    time.sleep(0.05)
+    assert collection.written == []
+    buffer.add("op_c")
+
+    # Envoyé par le thread de fond, réveillé sans attendre max_delay
+    wait_until(lambda: collection.written)
+    assert collection.written == ["op_a", "op_b", "op_c"]
+    assert buffer.stats["flushes"] == 1
+    buffer.close()
+
+
+def test_pending_operations_are_sent_after_the_delay():
+    collection = FakeCollection()
+    buffer = make_buffer(collection, max_delay=0.05)
+    buffer.add("op_a")
+
+    deadline = time.monotonic() + 2
+    while not collection.written and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert collection.written == ["op_a"]
+    buffer.close()
+
+
+def test_failed_operations_do_not_block_the_rest_of_the_batch():
+    collection = FakeCollection(failing={"op_b"})
+    buffer = make_buffer(collection)
+    for operation in ("op_a", "op_b", "op_c"):
+        buffer.add(operation, label=operation)
+
+    buffer.flush()
+
+    assert collection.written == ["op_a", "op_c"]
+    assert buffer.stats["errors"] == 1
+    buffer.close()
+
+
+def test_save_to_mongo_queues_one_upsert_per_place(monkeypatch):
+    class RecordingCollection(FakeCollection):
+        def bulk_write(self, operations, ordered=False):
+            self.written.extend(operations)
+            return super().bulk_write([], ordered)
+
+    collection = RecordingCollection()
+    buffer = make_buffer(collection)
+    monkeypatch.setattr(wellness, "_write_buffers", {"BeautyPlaces": buffer})
+
+    assert wellness.save_to_mongo({"place_id": "p1", "name": "Spa", "category": "Soins esthétiques et bien-être"})
+    assert collection.written == []
+    buffer.flush()
+
+    operation, = collection.written
+    assert operation._filter == {"place_id": "p1"}
+    assert operation._upsert
+    buffer.close()
+
+
+def test_flush_reports_succeeded_and_failed_labels():
+    buffer = make_buffer(FakeCollection(failing={"op_a"}))
+    for label in ("a", "b", "c"):
+        buffer.add(f"op_{label}", label=label, track=True)
+
+    assert buffer.flush() == (["b", "c"], ["a"])
+    assert buffer.pop_outcomes(["a", "b", "unknown"]) == (["b"], ["a"])
+    # Un résultat n'est rendu qu'une fois
+    assert buffer.pop_outcomes(["a", "b"]) == ([], [])
+    buffer.close()
+
+
+def test_outcomes_survive_background_flush():
+    buffer = make_buffer(FakeCollection(), max_delay=0.05)
+    buffer.add("op_a", label="a", track=True)
+    buffer.add("op_b", label="b")
+
+    deadline = time.monotonic() + 2
+    while buffer._ops and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # L'envoi a été fait par le thread de fond: l'appelant n'a plus rien à envoyer
+    assert buffer.flush() == ([], [])
+    assert buffer.pop_outcomes(["a", "b"]) == (["a"], [])
+    buffer.close()
+
+
+class FlakyCollection(FakeCollection):
+    """Perd les `outages` premiers envois en entier, comme une coupure réseau."""
+
+    def __init__(self, outages):
+        super().__init__()
+        self.outages = outages
+        self.attempts = []
+
+    def bulk_write(self, operations, ordered=False):
+        self.attempts.append(list(operations))
+        if len(self.attempts) <= self.outages:
+            raise ConnectionError("serveur injoignable")
+        return super().bulk_write(operations, ordered)
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(wellness, "WRITE_BUFFER_RETRY_BASE", 0.01)
+
+
+def test_lost_batch_is_retried_ahead_of_newer_operations(fast_retries):
+    collection = FlakyCollection(outages=1)
+    buffer = make_buffer(collection)
+    buffer.add("op_a", label="a", track=True)
+
+    assert buffer.flush() == ([], [])
+    assert buffer.pop_outcomes(["a"]) == ([], [])
+    buffer.add("op_b", label="b", track=True)
+
+    assert buffer.drain() == (["a", "b"], [])
+    assert collection.written == ["op_a", "op_b"]
+    buffer.close()
+
+
+def test_lost_batch_marks_tracked_operations_failed_once_retries_run_out(fast_retries):
+    collection = FlakyCollection(outages=wellness.WRITE_BUFFER_MAX_RETRIES + 1)
+    buffer = make_buffer(collection)
+    buffer.add("op_a", label="a", track=True)
+
+    assert buffer.drain() == ([], ["a"])
+    assert len(collection.attempts) == wellness.WRITE_BUFFER_MAX_RETRIES + 1
+    assert buffer.pop_outcomes(["a"]) == ([], ["a"])
+    assert buffer.stats["errors"] == 1
+    buffer.close()
+
+
+def test_add_never_raises_when_a_full_buffer_cannot_be_written(fast_retries):
+    collection = FlakyCollection(outages=1)
+    buffer = wellness.BulkWriteBuffer(collection, max_ops=2, max_delay=60)
+
+    buffer.add("op_a")
+    buffer.add("op_b")
+
+    wait_until(lambda: collection.written)
+    assert collection.written == ["op_a", "op_b"]
+    buffer.close()
+
+
+class RecordingJournal:
+    def __init__(self):
+        self.stages = []
+
+    def record(self, place_id, stage, **fields):
+        self.stages.append((place_id, stage))
+
+    def flush(self):
+        pass
+
+
+def test_process_places_journals_only_successful_writes(monkeypatch):
+    buffer = make_buffer(FakeCollection(failing={"op_p2"}))
+    monkeypatch.setattr(wellness, "_write_buffers", {"BeautyPlaces": buffer})
+    journal = RecordingJournal()
+    monkeypatch.setattr(wellness, "_scrape_journal", journal)
+
+    def fake_process_place(place):
+        buffer.add(f"op_{place['place_id']}", label=place["place_id"], track=True)
+        return dict(place)
+
+    monkeypatch.setattr(wellness, "process_place", fake_process_place)
+    places = [{"place_id": "p1", "name": "Spa 1"}, {"place_id": "p2", "name": "Spa 2"}]
+
+    assert len(wellness.process_places(places, concurrency=1)) == 2
+    assert journal.stages == [("p1", "saved")]
+    buffer.close()
@@ -1,11 +1,13 @@
 import os
-import requests
 import time
 import re
 import json
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne, ReturnDocument, ASCENDING, GEOSPHERE
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+import gridfs
+from bson import ObjectId
 from collections import OrderedDict
 import logging
 import base64
@@ -15,14 +17,28 @@ import sys
 import argparse  # Pour les arguments de ligne de commande
 import hashlib
 import shutil
+import copy
+import unicodedata
 from io import BytesIO
 from PIL import Image
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
+from geopy.exc import GeocoderTimedOut, GeocoderRateLimited
 import random
+import math
+import atexit
+import asyncio
+from urllib.parse import urlsplit
+import threading
+import queue
+import heapq
+import socket
+import multiprocessing
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
 
 # Ajouter le chemin pour accéder aux utilitaires Mistral
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -43,13 +59,342 @@ BRIGHTDATA_ZONE = "web_unlocker1"
 BRIGHTDATA_ENABLED = bool(BRIGHTDATA_TOKEN)
 
 # Configuration pour Bing Search
-BING_SEARCH_CACHE = {}
+BING_SEARCH_CACHE = OrderedDict()  # LRU place_id -> (URL Tripadvisor ou None, expires_at), devant TripadvisorUrlCache
+BING_SEARCH_CACHE_SIZE = 5000  # Entrées gardées en mémoire
+BING_SEARCH_CACHE_LOCK = threading.Lock()
+TRIPADVISOR_URL_TTL_DAYS = 90  # Durée de validité d'une URL Tripadvisor trouvée
+TRIPADVISOR_URL_NEGATIVE_TTL_DAYS = 14  # Un lieu sans page Tripadvisor n'est pas recherché de nouveau avant ce délai
+TRIPADVISOR_REVIEWS_PER_PAGE = 10  # Décalage entre deux pages d'avis (-or10-, -or20-...)
+TRIPADVISOR_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Configuration de l'exécution concurrente (--concurrency)
+CONCURRENCY = 1  # Nombre de lieux traités simultanément
+
+# Budgets de débit par upstream: (requêtes par seconde, rafale autorisée)
+RATE_LIMITS = {
+    "places_nearby": (5.0, 10),
+    "places_details": (5.0, 10),
+    "places_photo": (5.0, 10),
+    "static_map": (5.0, 10),
+    "google_maps_web": (1.0, 2),
+    "bing": (0.5, 2),
+    "tripadvisor": (1.0, 3),
+    "brightdata": (2.0, 4),
+    "nominatim": (1.0, 1),  # Politique d'usage Nominatim: 1 requête/s maximum
+    "inference": (1000.0, 1000),  # Daemon d'inférence local: pas de limite effective
+}
+RATE_LIMIT_MIN_FACTOR = 0.1  # Débit plancher après ralentissements successifs (fraction du débit nominal)
+
+# Configuration du client HTTP partagé
+HTTP_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_CONNECTIONS_PER_HOST = 8
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_BASE = 0.5  # Délai de base du backoff exponentiel (secondes)
+HTTP_MAX_RETRY_AFTER = 60  # Attente maximale (secondes) demandée par un en-tête Retry-After
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# HTTP/2 uniquement si le paquet h2 est installé (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Backends de parsing HTML optionnels (pip install lxml / selectolax)
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Parsing des pages Bing et Tripadvisor (--html-parser)
+HTML_PARSER_BACKEND = "auto"  # auto, bs4, bs4-strainer, lxml, selectolax
+HTML_FIXTURES_DIR = None  # Dossier où enregistrer les pages brutes (--save-html-fixtures)
+
+# Pool de processus pour les étapes CPU (--cpu-workers)
+CPU_WORKERS = 0  # 0: étapes CPU exécutées dans le thread appelant
+
+# Configuration du pool de navigateurs Selenium
+BROWSER_POOL_SIZE = None  # None: aligné sur CONCURRENCY (--browser-pool-size)
+BROWSER_MAX_USES = 50  # Un navigateur est recyclé après ce nombre de captures (--browser-max-uses)
+
+# Configuration de la capture Google Maps
+SCREENSHOT_CLIP = (30, 70, 330, 230)  # Zone capturée (left, top, right, bottom) en pixels CSS
+SCREENSHOT_JPEG_QUALITY = 90
+SCREENSHOT_READY_TIMEOUT = 15  # Attente max du titre du lieu (secondes)
+SCREENSHOT_NETWORK_IDLE_MS = 500  # Durée sans nouvelle ressource pour considérer le réseau inactif
+SCREENSHOT_NETWORK_IDLE_TIMEOUT = 8  # Attente max de l'inactivité réseau (secondes)
+SCREENSHOT_RESOURCE_BUFFER_SIZE = 5000  # Entrées Resource Timing conservées (défaut navigateur: 250)
+# Ressources lourdes inutiles pour la zone capturée: tuiles de carte et polices
+SCREENSHOT_BLOCKED_URLS = [
+    "*://*.google.com/maps/vt*",
+    "*://*.googleapis.com/maps/vt*",
+    "*://khms*.google.com/*",
+    "*://*.gstatic.com/maps/*tile*",
+    "*://fonts.gstatic.com/*",
+    "*://fonts.googleapis.com/*",
+    "*.woff2",
+    "*.woff",
+    "*.ttf",
+]
+
+# Configuration du stockage des images (adressage par contenu)
+IMAGE_STORE_BACKEND = "gridfs"  # "gridfs" ou "local" (--image-store)
+IMAGE_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "venue_images")
+IMAGE_STORE_BUCKET = "wellness_images"
+IMAGE_PUBLIC_PREFIX = "/api/wellness/images/"  # Servi par routes/wellness.js
+IMAGE_THUMBNAIL_SIZES = {"thumb": 96, "medium": 200}  # Largeur maximale en pixels
+IMAGE_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}  # Stockage local
+
+# Configuration des écritures groupées MongoDB
+WRITE_BUFFER_MAX_OPS = 50  # Nombre d'opérations avant envoi d'un bulk_write
+WRITE_BUFFER_MAX_DELAY = 5  # Délai maximum (secondes) avant envoi des opérations en attente
+WRITE_BUFFER_MAX_TRACKED = 10000  # Résultats d'écriture suivis non réclamés conservés au plus
+WRITE_BUFFER_MAX_RETRIES = 3  # Nouvelles tentatives d'un lot perdu (réseau, bascule du primaire)
+WRITE_BUFFER_RETRY_BASE = 1  # Délai de base (secondes) du backoff exponentiel entre ces tentatives
+
+# Durées de fraîcheur des données
+CACHE_TTL_DAYS = 7  # Caches Google (Nearby Search, détails)
+DETAILS_MEMORY_CACHE_SIZE = 2000  # Entrées gardées en mémoire par espace de noms de PlaceDetailsCache
+PLACE_REFRESH_DAYS = 30  # Un lieu traité depuis moins longtemps n'est pas retraité
+
+# Journal d'avancement par lieu de scrape_all_zones (ScrapeJournal)
+SCRAPE_JOURNAL_TTL_DAYS = 60  # Les entrées plus anciennes sont supprimées par MongoDB
+
+# File de travail distribuée (--seed-queue, --worker, --queue-status)
+QUEUE_LEASE_SECONDS = 900  # Un job non renouvelé pendant ce délai est repris par un autre worker
+QUEUE_HEARTBEAT_SECONDS = 60  # Renouvellement des baux des jobs en cours
+QUEUE_MAX_ATTEMPTS = 3  # Au-delà, le job est marqué en échec
+QUEUE_POLL_SECONDS = 15  # Attente d'un worker sans job alors que d'autres baux sont actifs
+
+# Rafraîchissement continu (--refresh-daemon)
+REFRESH_RATE_PER_HOUR = 60  # Lieux re-scrapés par heure, à débit constant (--refresh-rate)
+REFRESH_MIN_AGE_HOURS = 24  # Un lieu mis à jour plus récemment n'est jamais re-scrapé
+REFRESH_CHANGE_WEIGHT = 2.0  # Poids des écarts note/nombre d'avis constatés par Nearby Search
+REFRESH_POPULARITY_WEIGHT = 0.5  # Bonus d'âge des lieux populaires (log du nombre d'avis)
+REFRESH_REBUILD_SECONDS = 900  # Reconstruction de la file de priorité depuis BeautyPlaces
+REFRESH_IDLE_SECONDS = 300  # Attente quand aucun lieu n'est à rafraîchir
+
+# Lieux déjà pris en charge pendant cette exécution (zones voisines qui se recouvrent)
+SEEN_PLACE_IDS = set()
+SEEN_PLACE_IDS_LOCK = threading.Lock()
+
+# Pagination Nearby Search
+NEARBY_PAGE_SIZE = 20
+NEARBY_MAX_PAGES = 3  # Google ne renvoie jamais plus de 60 résultats
+NEXT_PAGE_TOKEN_DELAY = 1.0  # Délai (croissant) avant de réessayer un next_page_token pas encore actif
+NEXT_PAGE_TOKEN_RETRIES = 4
+
+# Configuration du planificateur de couverture (scrape_all_zones)
+PARIS_BBOX = (48.8156, 2.2242, 48.9022, 2.4699)  # (lat_min, lng_min, lat_max, lng_max)
+COVERAGE_ROOT_CELL_DEG = 0.04  # Taille des cellules racines (~4 km)
+COVERAGE_MAX_DEPTH = 5  # Subdivisions maximales d'une cellule racine (~125 m)
+COVERAGE_EMPTY_SKIP_DAYS = 30  # Une cellule vide lors d'un passage récent n'est pas réinterrogée
+COVERAGE_PLAN_TTL_DAYS = CACHE_TTL_DAYS  # Un plan persisté plus récent est réutilisé tel quel
+
+# Cache des analyses de commentaires
+ANALYSIS_MODEL_NAME = "Mistral-7B-Instruct-v0.3"
+ANALYSIS_PROMPT_VERSION = "2"  # À incrémenter à chaque changement du prompt ou du parsing: invalide le cache
+ANALYSIS_CACHE_MAX_ENTRIES = 50000  # Au-delà, les entrées les moins récemment utilisées sont supprimées
+ANALYSIS_CACHE_EVICTION_INTERVAL = 200  # Vérification de la taille toutes les N écritures
+
+# Construction du prompt d'analyse (--prompt-token-budget)
+PROMPT_TOKEN_BUDGET = 600  # Tokens maximum consacrés aux avis dans le prompt
+PROMPT_MAX_REVIEW_TOKENS = 120  # Un avis plus long est tronqué
+PROMPT_CHARS_PER_TOKEN = 4  # Estimation du nombre de caractères par token (texte français)
+
+# File d'analyse groupée (--analysis-batch-size)
+ANALYSIS_MAX_TOKENS = 100  # Tokens générés par lieu analysé
+ANALYSIS_BATCH_SIZE = 4  # Lieux regroupés au maximum dans un même prompt (plafonné à --concurrency)
+ANALYSIS_BATCH_MAX_WAIT = 2.0  # Secondes d'attente maximum pour compléter un lot
+
+# Moteur de sentiment (SentimentEngine)
+SENTIMENT_LEXICON_VERSION = "2"  # À incrémenter à chaque changement du lexique: invalide le cache
+SENTIMENT_MEMORY_CACHE_SIZE = 20000  # Scores gardés en mémoire (LRU)
+SENTIMENT_WORKERS = os.cpu_count() or 2  # Processus pour les rescorings massifs (--rescore-sentiment)
+SENTIMENT_POOL_MIN_BATCH = 200  # En dessous, le calcul reste dans le processus courant
+SENTIMENT_RESCORE_CHUNK = 200  # Lieux relus par lot lors d'un rescoring
+
+# Routage des analyses: notation par mots-clés si elle suffit, sinon LLM
+CASCADE_MIN_CONFIDENCE = 0.6  # Confiance minimale des signaux rapides (> 1: toujours le LLM)
+CASCADE_MIN_COVERAGE = 0.5  # Part minimale des critères mentionnés dans les avis
+CASCADE_MIN_REVIEWS = 5  # En dessous, la confiance est réduite proportionnellement
+
+# Daemon d'inférence local (--serve-inference / --inference-url)
+INFERENCE_HOST = "127.0.0.1"
+INFERENCE_PORT = 8765
+INFERENCE_URL = None  # Ex: "http://127.0.0.1:8765"; None = génération dans le processus
+INFERENCE_TIMEOUT = 300  # Secondes (une génération groupée peut être longue)
+INFERENCE_CONNECT_TIMEOUT = 2  # Secondes: un daemon arrêté est détecté immédiatement
+INFERENCE_RETRY_DELAY = 60  # Après un échec, génération locale pendant ce délai avant de réessayer le daemon
+
+# Verrou autour des appels Mistral: le modèle local n'est pas garanti thread-safe
+MISTRAL_LOCK = threading.Lock()
 
 # Obtenir le client MongoDB
 client = MongoClient(MONGO_URI)
 db = client[DB_NAME]
 analyzer = SentimentIntensityAnalyzer()
 
+# Index attendus pour chaque collection utilisée par le scraper: (clés, options)
+INDEX_SPECS = {
+    "PlacesCache": [
+        ([("key", ASCENDING)], {"unique": True}),
+        ([("timestamp", ASCENDING)], {"expireAfterSeconds": CACHE_TTL_DAYS * 86400}),
+    ],
+    "PlaceDetailsCache": [
+        ([("namespace", ASCENDING), ("place_id", ASCENDING)], {"unique": True}),
+        ([("timestamp", ASCENDING)], {"expireAfterSeconds": CACHE_TTL_DAYS * 86400}),
+    ],
+    "ScreenshotCache": [
+        ([("place_id", ASCENDING)], {"unique": True}),
+    ],
+    "TripadvisorUrlCache": [
+        ([("place_id", ASCENDING)], {"unique": True}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ],
+    "AnalysisCache": [
+        ([("key", ASCENDING)], {"unique": True}),
+        ([("last_access", ASCENDING)], {}),
+    ],
+    "ScrapeJournal": [
+        ([("run", ASCENDING), ("place_id", ASCENDING)], {"unique": True}),
+        ([("run", ASCENDING), ("stage_rank", ASCENDING)], {}),
+        ([("updated_at", ASCENDING)], {"expireAfterSeconds": SCRAPE_JOURNAL_TTL_DAYS * 86400}),
+    ],
+    "ScrapeJobs": [
+        ([("queue", ASCENDING), ("status", ASCENDING), ("priority", ASCENDING), ("created_at", ASCENDING)], {}),
+        ([("queue", ASCENDING), ("status", ASCENDING), ("lease_expires_at", ASCENDING)], {}),
+    ],
+    # Une image n'est stockée qu'une fois par adresse (hash): un envoi concurrent échoue sur doublon
+    f"{IMAGE_STORE_BUCKET}.files": [
+        ([("filename", ASCENDING)], {"unique": True}),
+    ],
+    "BeautyPlaces": [
+        ([("place_id", ASCENDING)], {"unique": True}),
+        ([("location", GEOSPHERE)], {}),
+        ([("last_updated", ASCENDING)], {}),
+    ],
+}
+
+# Index remplacés, supprimés par ensure_indexes
+OBSOLETE_INDEXES = {
+    # Unique sur place_id seul: empêchait de stocker réponse brute et fiche structurée d'un même lieu
+    "PlaceDetailsCache": [[("place_id", ASCENDING)]],
+}
+
+def cache_cutoff(days=CACHE_TTL_DAYS):
+    """Date limite de fraîcheur: un document plus ancien est considéré comme expiré."""
+    return datetime.now() - timedelta(days=days)
+
+def _find_index(existing_indexes, keys):
+    """Retourne (nom, infos) de l'index existant portant exactement ces clés, sinon (None, None)."""
+    for name, info in existing_indexes.items():
+        normalized = [(field, direction if isinstance(direction, str) else int(direction)) for field, direction in info["key"]]
+        if normalized == keys:
+            return name, info
+    return None, None
+
+def _index_mismatch(info, options):
+    """Décrit l'écart entre un index existant et les options attendues (None si conforme)."""
+    if options.get("unique", False) != info.get("unique", False):
+        return "unicité différente"
+    if options.get("expireAfterSeconds") != info.get("expireAfterSeconds"):
+        return f"TTL {info.get('expireAfterSeconds')} au lieu de {options.get('expireAfterSeconds')}"
+    return None
+
+def ensure_indexes():
+    """
+    Crée les index de INDEX_SPECS au démarrage: index uniques et de recherche sur
+    les clés des caches et de BeautyPlaces, index 2dsphere sur location et index
+    TTL qui font expirer les entrées de cache côté serveur.
+    Un TTL existant dont la durée a changé est mis à jour via collMod.
+    """
+    for collection_name, obsolete in OBSOLETE_INDEXES.items():
+        existing = db[collection_name].index_information()
+        for keys in obsolete:
+            name, _ = _find_index(existing, keys)
+            if name:
+                db[collection_name].drop_index(name)
+                logger.info(f"Index obsolète supprimé sur {collection_name}: {name}")
+    
+    for collection_name, specs in INDEX_SPECS.items():
+        collection = db[collection_name]
+        existing = collection.index_information()
+        for keys, options in specs:
+            name, info = _find_index(existing, keys)
+            try:
+                if name is None:
+                    collection.create_index(keys, **options)
+                    logger.info(f"Index créé sur {collection_name}: {keys} {options}")
+                    continue
+                
+                mismatch = _index_mismatch(info, options)
+                if mismatch and "expireAfterSeconds" in options and options.get("unique", False) == info.get("unique", False):
+                    db.command("collMod", collection_name, index={
+                        "keyPattern": dict(keys), "expireAfterSeconds": options["expireAfterSeconds"]
+                    })
+                    logger.info(f"TTL mis à jour sur {collection_name}.{name}")
+                elif mismatch:
+                    logger.warning(f"Index {collection_name}.{name} non conforme ({mismatch}), à corriger manuellement")
+            except OperationFailure as e:
+                # Typiquement des doublons empêchant la création d'un index unique
+                logger.error(f"Impossible de créer l'index {keys} sur {collection_name}: {e}")
+
+def index_report():
+    """
+    Affiche l'état des index de chaque collection: index attendus présents,
+    manquants ou non conformes, et utilisation ($indexStats) des index existants.
+    
+    Returns:
+        dict: Rapport par collection
+    """
+    report = {}
+    for collection_name, specs in INDEX_SPECS.items():
+        collection = db[collection_name]
+        existing = collection.index_information()
+        try:
+            usage = {stat["name"]: stat["accesses"]["ops"] for stat in collection.aggregate([{"$indexStats": {}}])}
+        except OperationFailure:
+            usage = {}
+        
+        entry = {"ok": [], "missing": [], "mismatch": [], "unused": []}
+        expected_names = set()
+        for keys, options in specs:
+            name, info = _find_index(existing, keys)
+            if name is None:
+                entry["missing"].append(keys)
+                continue
+            expected_names.add(name)
+            mismatch = _index_mismatch(info, options)
+            if mismatch:
+                entry["mismatch"].append((name, mismatch))
+            else:
+                entry["ok"].append(name)
+        entry["unused"] = [name for name, ops in usage.items() if ops == 0 and name != "_id_"]
+        report[collection_name] = entry
+        
+        logger.info(f"[{collection_name}] {collection.estimated_document_count()} documents, "
+                    f"{len(entry['ok'])} index conformes")
+        for keys in entry["missing"]:
+            logger.warning(f"[{collection_name}] Index manquant: {keys}")
+        for name, mismatch in entry["mismatch"]:
+            logger.warning(f"[{collection_name}] Index non conforme {name}: {mismatch}")
+        for name in entry["unused"]:
+            logger.info(f"[{collection_name}] Index jamais utilisé depuis le démarrage du serveur: {name}")
+        for name in sorted(set(existing) - expected_names - {"_id_"}):
+            logger.info(f"[{collection_name}] Index supplémentaire: {name} ({usage.get(name, '?')} accès)")
+    
+    return report
+
 # Définition des catégories, sous-catégories et critères d'évaluation
 CATEGORIES = {
     "Soins esthétiques et bien-être": {
@@ -109,6 +454,313 @@ MOTS_CLES = {
     }
 }
 
+# Termes de polarité utilisés pour pondérer les mentions de critères (KeywordCriteriaScorer)
+POLARITE_MOTS = {
+    "positif": [
+        "excellent", "parfait", "super", "génial", "top", "bien", "bon", "bonne", "ravi", "satisfait",
+        "agréable", "adorable", "impeccable", "recommande", "merci", "professionnel", "chaleureux",
+        "magnifique", "incroyable", "efficace", "propre", "doux", "calme", "accueillant", "attentionné"
+    ],
+    "négatif": [
+        "mauvais", "nul", "horrible", "déçu", "décevant", "déception", "sale", "cher", "arnaque",
+        "désagréable", "impoli", "froid", "retard", "attente", "douloureux", "douleur", "pire",
+        "catastrophe", "bâclé", "raté", "éviter", "problème", "rude", "médiocre", "insatisfait", "mal"
+    ]
+}
+NEGATIONS = ["pas", "jamais", "aucun", "aucune", "rien", "sans", "ni"]
+INTENSIFICATEURS = ["tres", "trop", "vraiment", "super", "extremement", "tellement", "absolument"]
+
+class TokenBucket:
+    """
+    Seau à jetons thread-safe pour un upstream donné.
+    
+    Le débit est réduit de moitié à chaque réponse 429/403 puis remonte
+    progressivement vers le débit nominal à chaque réponse correcte.
+    """
+    
+    def __init__(self, name, rate, burst):
+        self.name = name
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated = now
+    
+    def reserve(self):
+        """Réserve un jeton et retourne le délai d'attente nécessaire en secondes."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def slow_down(self):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate = max(self.base_rate * RATE_LIMIT_MIN_FACTOR, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+        logger.warning(f"Limitation détectée sur {self.name}, débit réduit à {rate:.2f} req/s")
+    
+    def speed_up(self):
+        # Lecture et écriture du débit sous le verrou: un ralentissement concurrent n'est pas écrasé
+        with self.lock:
+            if self.rate < self.base_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.base_rate, self.rate * 1.1)
+
+class RateLimiter:
+    """Registre des seaux à jetons, un par upstream (voir RATE_LIMITS)."""
+    
+    def __init__(self, limits):
+        self.buckets = {name: TokenBucket(name, rate, burst) for name, (rate, burst) in limits.items()}
+    
+    def acquire(self, name):
+        self.buckets[name].acquire()
+    
+    async def acquire_async(self, name):
+        await self.buckets[name].acquire_async()
+    
+    def report(self, name, status_code):
+        """Adapte le débit de l'upstream selon le code de réponse HTTP."""
+        if status_code in (429, 403):
+            self.buckets[name].slow_down()
+        elif status_code and status_code < 400:
+            self.buckets[name].speed_up()
+    
+    def report_google_status(self, name, data):
+        """Les API Google signalent le dépassement de quota dans le corps JSON (HTTP 200)."""
+        status = data.get("status") if isinstance(data, dict) else None
+        self.report(name, 429 if status == "OVER_QUERY_LIMIT" else 200)
+
+rate_limiter = RateLimiter(RATE_LIMITS)
+
+class HttpClient:
+    """
+    Client HTTP partagé par tous les appels sortants du module.
+    
+    Un seul pool de connexions keep-alive (HTTP/2 si disponible) est réutilisé
+    entre les requêtes, le nombre de connexions simultanées par hôte est borné,
+    et chaque requête passe par le rate limiter de son upstream avec des retries
+    à backoff exponentiel aléatoire. Le client async vit sur une boucle asyncio
+    dédiée; le code synchrone y soumet ses coroutines via run().
+    """
+    
+    def __init__(self):
+        self.limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=60
+        )
+        self.sync_client = httpx.Client(
+            http2=HTTP2_AVAILABLE, limits=self.limits, timeout=HTTP_TIMEOUT, follow_redirects=True
+        )
+        self._lock = threading.Lock()
+        self._host_semaphores = {}
+        self._async_host_semaphores = {}
+        self._loop = None
+        self._async_client = None
+    
+    def _host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(HTTP_MAX_CONNECTIONS_PER_HOST)
+            return self._host_semaphores[host]
+    
+    def _async_host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._async_host_semaphores:
+            self._async_host_semaphores[host] = asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST)
+        return self._async_host_semaphores[host]
+    
+    @staticmethod
+    def _backoff_delay(attempt, response=None):
+        """Délai avant la prochaine tentative: Retry-After si fourni (borné), sinon backoff exponentiel avec jitter."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), HTTP_MAX_RETRY_AFTER)
+        return HTTP_BACKOFF_BASE * (2 ** attempt) * random.uniform(0.5, 1.5)
+    
+    def request(self, budget, method, url, retries=HTTP_MAX_RETRIES, **kwargs):
+        """
+        Effectue une requête synchrone via le pool partagé.
+        
+        Args:
+            budget: Nom de l'upstream dans RATE_LIMITS
+            method: Méthode HTTP
+            url: URL cible
+            retries: Nouvelles tentatives après une erreur réseau ou une réponse 429/5xx
+            **kwargs: Arguments transmis à httpx (headers, params, json, timeout...)
+            
+        Returns:
+            httpx.Response (la dernière réponse obtenue si les retries sont épuisés)
+        """
+        # Le créneau de l'hôte n'est tenu que pendant l'échange: les attentes entre
+        # tentatives ne bloquent pas les autres requêtes vers cet hôte
+        for attempt in range(retries + 1):
+            rate_limiter.acquire(budget)
+            try:
+                with self._host_semaphore(url):
+                    response = self.sync_client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"Erreur réseau {budget} ({e.__class__.__name__}), nouvelle tentative {attempt+1}/{retries}")
+                time.sleep(self._backoff_delay(attempt))
+                continue
+            
+            rate_limiter.report(budget, response.status_code)
+            if response.status_code not in HTTP_RETRY_STATUSES or attempt == retries:
+                return response
+            logger.warning(f"Réponse {response.status_code} de {budget}, nouvelle tentative {attempt+1}/{retries}")
+            time.sleep(self._backoff_delay(attempt, response))
+    
+    def get(self, budget, url, **kwargs):
+        return self.request(budget, "GET", url, **kwargs)
+    
+    def post(self, budget, url, **kwargs):
+        return self.request(budget, "POST", url, **kwargs)
+    
+    def _get_async_client(self):
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE, limits=self.limits, timeout=HTTP_TIMEOUT, follow_redirects=True
+            )
+        return self._async_client
+    
+    async def request_async(self, budget, method, url, retries=HTTP_MAX_RETRIES, **kwargs):
+        """
+        Équivalent asynchrone de request(). Doit être appelé depuis une coroutine
+        exécutée sur la boucle du client (voir run()).
+        """
+        client = self._get_async_client()
+        for attempt in range(retries + 1):
+            await rate_limiter.acquire_async(budget)
+            try:
+                async with self._async_host_semaphore(url):
+                    response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"Erreur réseau {budget} ({e.__class__.__name__}), nouvelle tentative {attempt+1}/{retries}")
+                await asyncio.sleep(self._backoff_delay(attempt))
+                continue
+            
+            rate_limiter.report(budget, response.status_code)
+            if response.status_code not in HTTP_RETRY_STATUSES or attempt == retries:
+                return response
+            logger.warning(f"Réponse {response.status_code} de {budget}, nouvelle tentative {attempt+1}/{retries}")
+            await asyncio.sleep(self._backoff_delay(attempt, response))
+    
+    async def get_async(self, budget, url, **kwargs):
+        return await self.request_async(budget, "GET", url, **kwargs)
+    
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="http_io_loop", daemon=True).start()
+            return self._loop
+    
+    def run(self, coro):
+        """Exécute une coroutine sur la boucle I/O du client depuis du code synchrone."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+    
+    def close(self):
+        self.sync_client.close()
+        if self._loop is not None:
+            if self._async_client is not None:
+                self.run(self._async_client.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+http_client = HttpClient()
+atexit.register(http_client.close)
+
+# Temps passé dans chaque étape CPU: appels, temps CPU (dans le processus qui calcule), temps écoulé
+CPU_STAGE_STATS = {}
+CPU_STAGE_STATS_LOCK = threading.Lock()
+_cpu_pool = None
+_cpu_pool_lock = threading.Lock()
+
+def _timed_call(func, args):
+    """Exécute func(*args) et mesure le temps CPU du processus qui l'exécute."""
+    start = time.process_time()
+    result = func(*args)
+    return result, time.process_time() - start
+
+def _noop():
+    return None
+
+def get_cpu_pool():
+    """
+    Retourne le pool de processus des étapes CPU (None si CPU_WORKERS vaut 0).
+    
+    Les processus sont démarrés par "spawn" (interpréteur neuf qui réimporte le
+    module) et non par fork: le MongoClient créé à l'import a déjà lancé ses
+    threads de surveillance, et forker un processus multi-thread n'est pas sûr.
+    Ils sont tous préchauffés à la création, appelée depuis __main__ par les
+    commandes qui traitent des lieux, pour que ce coût ne tombe pas sur le
+    premier lieu traité.
+    """
+    global _cpu_pool
+    if CPU_WORKERS <= 0:
+        return None
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            _cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            for future in [_cpu_pool.submit(_noop) for _ in range(CPU_WORKERS)]:
+                future.result()
+            atexit.register(_cpu_pool.shutdown)
+            logger.info(f"Pool de processus CPU démarré ({CPU_WORKERS} processus)")
+        return _cpu_pool
+
+def run_cpu_stage(stage, func, *args):
+    """
+    Exécute une étape CPU (parsing HTML, sentiment, mots-clés, images) sur le pool
+    de processus si --cpu-workers est actif, sinon dans le thread courant.
+    
+    func doit être une fonction de module et args des valeurs sérialisables
+    (octets, chaînes, listes...): les étapes ne partagent aucun état.
+    """
+    pool = get_cpu_pool()
+    start = time.monotonic()
+    if pool is not None:
+        result, cpu_seconds = pool.submit(_timed_call, func, args).result()
+    else:
+        result, cpu_seconds = _timed_call(func, args)
+    wall_seconds = time.monotonic() - start
+    
+    with CPU_STAGE_STATS_LOCK:
+        stats = CPU_STAGE_STATS.setdefault(stage, {"calls": 0, "cpu_seconds": 0.0, "wall_seconds": 0.0})
+        stats["calls"] += 1
+        stats["cpu_seconds"] += cpu_seconds
+        stats["wall_seconds"] += wall_seconds
+    return result
+
+def log_cpu_stage_stats():
+    with CPU_STAGE_STATS_LOCK:
+        for stage, stats in sorted(CPU_STAGE_STATS.items(), key=lambda item: -item[1]["cpu_seconds"]):
+            logger.info(f"Étape CPU {stage}: {stats['calls']} appels, {stats['cpu_seconds']:.2f}s CPU, "
+                        f"{stats['wall_seconds']:.2f}s écoulées (pool: {CPU_WORKERS or 'non'})")
+
 # Classe pour gérer les requêtes Brightdata
 def get_brightdata_request(url, timeout=30):
     """
@@ -145,7 +797,8 @@ def get_brightdata_request(url, timeout=30):
         logger.info(f"Requête BrightData vers: {url}")
         
         # Requête avec BrightData Web Unlocker API
-        response = requests.post(
+        response = http_client.post(
+            "brightdata",
             "https://api.brightdata.com/request", 
             headers=headers, 
             json=payload,
@@ -162,45 +815,130 @@ def get_brightdata_request(url, timeout=30):
         logger.error(f"Erreur de requête BrightData: {e}")
         return None
 
-def get_places_by_category(category_name, google_types, lat, lng, radius=5000):
-    """Récupère les lieux d'une catégorie spécifique dans une zone donnée.
-    Optimise en faisant une seule requête par type et en stockant les résultats en cache."""
-    places = []
+async def fetch_nearby_results_async(lat, lng, radius, type_name):
+    """
+    Interroge Nearby Search pour un type donné via le client HTTP asynchrone partagé,
+    en suivant next_page_token jusqu'à NEARBY_MAX_PAGES pages.
+    
+    Returns:
+        tuple: (type_name, {"results": [...], "saturated": bool}) ou (type_name, None) en cas d'erreur.
+        saturated indique que toutes les pages étaient pleines: la zone contient
+        probablement plus de lieux que ce que Google peut renvoyer.
+    """
+    logger.info(f"Récupération des lieux de type {type_name} depuis Google Maps API")
+    base_url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+    params = {"location": f"{lat},{lng}", "radius": radius, "type": type_name, "key": API_KEY}
+    results = []
+    page_size = 0
+    pages = 0
+    
+    try:
+        while pages < NEARBY_MAX_PAGES:
+            response = await http_client.get_async("places_nearby", base_url, params=params)
+            data = response.json()
+            rate_limiter.report_google_status("places_nearby", data)
+            
+            # Un next_page_token n'est valide qu'après un court délai côté Google
+            retries = 0
+            while data.get("status") == "INVALID_REQUEST" and "pagetoken" in params and retries < NEXT_PAGE_TOKEN_RETRIES:
+                retries += 1
+                await asyncio.sleep(NEXT_PAGE_TOKEN_DELAY * retries)
+                response = await http_client.get_async("places_nearby", base_url, params=params)
+                data = response.json()
+            
+            if data.get("status") not in ("OK", "ZERO_RESULTS"):
+                if pages == 0:
+                    logger.error(f"Nearby Search {type_name}: statut {data.get('status')}")
+                    return type_name, None
+                break
+            
+            page_size = len(data.get("results", []))
+            results.extend(data.get("results", []))
+            pages += 1
+            
+            next_page_token = data.get("next_page_token")
+            if not next_page_token:
+                break
+            params = {"pagetoken": next_page_token, "key": API_KEY}
+    except Exception as e:
+        logger.error(f"Erreur Nearby Search pour {type_name}: {e}")
+        if not results:
+            return type_name, None
+    
+    saturated = pages >= NEARBY_MAX_PAGES and page_size >= NEARBY_PAGE_SIZE
+    return type_name, {"results": results, "saturated": saturated}
+
+def nearby_search(lat, lng, radius, google_types):
+    """
+    Résultats Nearby Search (toutes pages) pour plusieurs types autour d'un point.
+    Les types en cache sont servis depuis PlacesCache, les autres sont interrogés en parallèle.
+    
+    Returns:
+        dict: type -> {"results": [...], "saturated": bool}
+    """
+    cache_collection = db.PlacesCache
+    results_by_type = {}
+    missing_types = []
     for type_name in google_types:
         # Vérifier si les résultats sont déjà en cache
-        cache_collection = db.PlacesCache
         cache_key = f"{lat}_{lng}_{radius}_{type_name}"
-        cached_results = cache_collection.find_one({"key": cache_key})
+        cached_results = cache_collection.find_one({"key": cache_key, "timestamp": {"$gte": cache_cutoff()}})
         
-        if cached_results and (datetime.now() - cached_results["timestamp"]).days < 7:
+        if cached_results:
             logger.info(f"Utilisation des résultats en cache pour {type_name}")
-            place_results = cached_results["results"]
+            results_by_type[type_name] = {
+                "results": cached_results["results"],
+                "saturated": cached_results.get("saturated", False)
+            }
         else:
-            logger.info(f"Récupération des lieux de type {type_name} depuis Google Maps API")
-            url = f"https://maps.googleapis.com/maps/api/place/nearbysearch/json?location={lat},{lng}&radius={radius}&type={type_name}&key={API_KEY}"
-            response = requests.get(url)
-            data = response.json()
-            
-            if 'results' in data:
-                place_results = data['results']
+            missing_types.append(type_name)
+    
+    if missing_types:
+        async def fetch_missing():
+            return await asyncio.gather(*(fetch_nearby_results_async(lat, lng, radius, t) for t in missing_types))
+        
+        for type_name, data in http_client.run(fetch_missing()):
+            if data:
+                results_by_type[type_name] = data
                 # Mise en cache des résultats
+                cache_key = f"{lat}_{lng}_{radius}_{type_name}"
                 cache_collection.update_one(
                     {"key": cache_key},
                     {"$set": {
                         "key": cache_key,
-                        "results": place_results,
+                        "results": data["results"],
+                        "saturated": data["saturated"],
                         "timestamp": datetime.now()
                     }},
                     upsert=True
                 )
             else:
-                place_results = []
-        
-        for place in place_results:
+                results_by_type[type_name] = {"results": [], "saturated": False}
+    
+    return results_by_type
+
+def get_places_by_category(category_name, google_types, lat, lng, radius=5000):
+    """Récupère les lieux d'une catégorie spécifique dans une zone donnée.
+    Optimise en faisant une seule requête par type et en stockant les résultats en cache.
+    Les types absents du cache sont interrogés en parallèle. Un lieu renvoyé pour
+    plusieurs types n'apparaît qu'une fois, avec la liste de ses types dans google_types."""
+    results_by_type = {
+        type_name: data["results"] for type_name, data in nearby_search(lat, lng, radius, google_types).items()
+    }
+    
+    places_by_id = OrderedDict()
+    for type_name in google_types:
+        for place in results_by_type.get(type_name, []):
+            place_id = place.get("place_id")
+            if place_id in places_by_id:
+                # Lieu déjà trouvé pour un autre type: conserver tous les types correspondants
+                places_by_id[place_id]["google_types"].append(type_name)
+                continue
+            
             # Déterminer la sous-catégorie
             sous_categorie = determiner_sous_categorie(place.get("name", ""), category_name)
             
-            places.append({
+            places_by_id[place_id] = {
                 "place_id": place.get("place_id"),
                 "name": place.get("name"),
                 "address": place.get("vicinity"),
@@ -210,10 +948,11 @@ def get_places_by_category(category_name, google_types, lat, lng, radius=5000):
                 "category": category_name,
                 "sous_categorie": sous_categorie,
                 "google_type": type_name,
+                "google_types": [type_name],
                 "photos": place.get("photos", [])  # Récupérer les références de photos
-            })
+            }
     
-    return places
+    return list(places_by_id.values())
 
 def determiner_sous_categorie(place_name, category_name):
     """Détermine la sous-catégorie en fonction du nom du lieu et de la catégorie principale."""
@@ -228,35 +967,127 @@ def determiner_sous_categorie(place_name, category_name):
     # Par défaut, retourner la première sous-catégorie
     return CATEGORIES[category_name]["sous_categories"][0]
 
-def extract_place_details(place_id):
-    """Récupère les détails d'un lieu depuis Google Maps, y compris les avis et photos."""
-    # Vérifier si déjà en cache
-    cache_collection = db.PlaceDetailsCache
-    cached_place = cache_collection.find_one({"place_id": place_id})
+class DetailsCache:
+    """
+    Cache à deux niveaux des détails de lieux: LRU en mémoire devant PlaceDetailsCache.
     
-    if cached_place and (datetime.now() - cached_place["timestamp"]).days < 7:
-        logger.info(f"Utilisation des détails en cache pour {place_id}")
-        return cached_place["details"]
+    Chaque espace de noms (réponse brute de l'API, fiche structurée...) a ses
+    propres documents, clé (namespace, place_id). Les lectures renvoient des
+    copies, les appelants pouvant modifier le résultat. Des demandes simultanées
+    pour un même lieu sont regroupées (single-flight): un seul appel à fetch,
+    les autres attendent son résultat.
+    """
     
-    url = f"https://maps.googleapis.com/maps/api/place/details/json?place_id={place_id}&fields=name,formatted_address,rating,reviews,photos,website,formatted_phone_number&key={API_KEY}"
-    response = requests.get(url)
-    data = response.json()
+    def __init__(self, collection, namespace, ttl_days=CACHE_TTL_DAYS, memory_size=DETAILS_MEMORY_CACHE_SIZE):
+        self.collection = collection
+        self.namespace = namespace
+        self.ttl_days = ttl_days
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "db_hits": 0, "fetches": 0, "coalesced": 0}
     
-    if "result" in data:
-        place_details = data["result"]
+    def _remember(self, place_id, value, stored_at):
+        with self._lock:
+            self._memory[place_id] = (value, stored_at)
+            self._memory.move_to_end(place_id)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+    
+    def get(self, place_id):
+        """Valeur en cache (copie) si elle a moins de ttl_days, sinon None."""
+        cutoff = cache_cutoff(self.ttl_days)
+        with self._lock:
+            entry = self._memory.get(place_id)
+            if entry and entry[1] >= cutoff:
+                self._memory.move_to_end(place_id)
+                self.stats["memory_hits"] += 1
+                return copy.deepcopy(entry[0])
         
-        # Mise en cache des détails
-        cache_collection.update_one(
-            {"place_id": place_id},
-            {"$set": {
-                "place_id": place_id,
-                "details": place_details,
-                "timestamp": datetime.now()
-            }},
+        cached = self.collection.find_one(
+            {"namespace": self.namespace, "place_id": place_id, "timestamp": {"$gte": cutoff}},
+            {"details": 1, "timestamp": 1}
+        )
+        if not cached:
+            return None
+        self._remember(place_id, cached["details"], cached["timestamp"])
+        with self._lock:
+            self.stats["db_hits"] += 1
+        return copy.deepcopy(cached["details"])
+    
+    def put(self, place_id, value):
+        now = datetime.now()
+        self._remember(place_id, copy.deepcopy(value), now)
+        self.collection.update_one(
+            {"namespace": self.namespace, "place_id": place_id},
+            {"$set": {"details": value, "timestamp": now}},
             upsert=True
         )
+    
+    def invalidate(self, place_id):
+        """Oublie la valeur d'un lieu (mémoire et base) pour forcer un nouvel appel à fetch."""
+        with self._lock:
+            self._memory.pop(place_id, None)
+        self.collection.delete_one({"namespace": self.namespace, "place_id": place_id})
+    
+    def get_or_fetch(self, place_id, fetch, store=True):
+        """
+        Retourne la valeur en cache ou l'obtient via fetch(), une seule fois par lieu à la fois.
         
-        return place_details
+        Args:
+            place_id: Clé du lieu
+            fetch: Fonction sans argument renvoyant la valeur (None si introuvable)
+            store: Mettre en cache le résultat de fetch
+        """
+        value = self.get(place_id)
+        if value is not None:
+            return value
+        
+        with self._lock:
+            future = self._inflight.get(place_id)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[place_id] = future
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return copy.deepcopy(future.result())
+        
+        try:
+            value = self.get(place_id)
+            if value is None:
+                with self._lock:
+                    self.stats["fetches"] += 1
+                value = fetch()
+                if value is not None and store:
+                    self.put(place_id, value)
+            future.set_result(copy.deepcopy(value))
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(place_id, None)
+
+google_details_cache = DetailsCache(db.PlaceDetailsCache, "google_details")
+place_record_cache = DetailsCache(db.PlaceDetailsCache, "place_record")
+
+def extract_place_details(place_id):
+    """Récupère les détails d'un lieu depuis Google Maps, y compris les avis et photos."""
+    return google_details_cache.get_or_fetch(place_id, lambda: fetch_place_details(place_id))
+
+def fetch_place_details(place_id):
+    """Appel à l'API Place Details (sans cache, voir extract_place_details)."""
+    url = f"https://maps.googleapis.com/maps/api/place/details/json?place_id={place_id}&fields=name,formatted_address,geometry,rating,user_ratings_total,reviews,photos,website,formatted_phone_number&key={API_KEY}"
+    response = http_client.get("places_details", url)
+    data = response.json()
+    rate_limiter.report_google_status("places_details", data)
+    
+    if "result" in data:
+        return data["result"]
     
     return None
 
@@ -267,9 +1098,10 @@ def extract_reviews(place_details):
     if not place_details or "reviews" not in place_details:
         return reviews
     
-    for review in place_details["reviews"][:10]:  # Limite à 10 avis
-        sentiment = analyzer.polarity_scores(review["text"])['compound']
-        sentiment_label = "Positif" if sentiment >= 0.05 else "Négatif" if sentiment <= -0.05 else "Neutre"
+    place_reviews = place_details["reviews"][:10]  # Limite à 10 avis
+    sentiments = sentiment_engine.score_batch([review["text"] for review in place_reviews])
+    for review, sentiment in zip(place_reviews, sentiments):
+        sentiment_label = sentiment_label_for(sentiment)
         reviews.append({
             "source": "Google Maps",
             "author_name": review.get("author_name", ""),
@@ -313,13 +1145,22 @@ def search_links_bing(name, city="Paris"):
     Returns:
         URL Tripadvisor ou None si rien n'est trouvé
     """
+    return lookup_tripadvisor_url(name, city)[0]
+
+def lookup_tripadvisor_url(name, city="Paris"):
+    """
+    Recherche Bing d'une URL Tripadvisor, en distinguant l'absence de résultat d'un échec.
+    
+    Returns:
+        tuple: (URL ou None, True si la recherche a abouti, False en cas d'erreur)
+    """
     # Nettoyage du nom et de la ville
     name = name.strip()
     city = city.strip()
     
     # Construction de la requête Bing
     query = f"{name} {city} site:tripadvisor.fr"
-    search_url = f"https://www.bing.com/search?q={requests.utils.quote(query)}"
+    search_url = "https://www.bing.com/search"
     
     logger.info(f"Recherche Bing pour Tripadvisor: {query}")
     
@@ -340,74 +1181,251 @@ def search_links_bing(name, city="Paris"):
             "Upgrade-Insecure-Requests": "1"
         }
         
-        response = requests.get(search_url, headers=headers, timeout=10)
+        response = http_client.get("bing", search_url, params={"q": query}, headers=headers, timeout=10)
         
         if response.status_code != 200:
             logger.error(f"Échec de la requête Bing: code {response.status_code}")
-            return None
+            return None, False
         
-        # Parser les résultats
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Méthode 1: Chercher dans les éléments <a> avec href
-        tripadvisor_urls = []
-        
-        # Chercher d'abord les citations directes
-        for cite in soup.find_all('cite'):
-            cite_text = cite.text.strip()
-            if 'tripadvisor.fr' in cite_text:
-                url_parts = cite_text.split()
-                for part in url_parts:
-                    if part.startswith('https://') or part.startswith('http://'):
-                        if 'tripadvisor.fr' in part and ('Restaurant_Review' in part or 'Attraction_Review' in part or 'Hotel_Review' in part):
-                            tripadvisor_urls.append(part)
-        
-        # Ensuite chercher dans les liens
-        for link in soup.find_all('a'):
-            href = link.get('href', '')
-            # Chercher des URLs Tripadvisor dans href
-            if 'tripadvisor.fr' in href and ('bing.com/ck' in href or '/search?q=' not in href):
-                # Soit extraire directement le href
-                if 'http' in href and 'tripadvisor.fr' in href:
-                    tripadvisor_urls.append(href)
-                # Soit chercher dans le texte de l'attribut data-url si disponible
-                elif link.get('data-url') and 'tripadvisor.fr' in link.get('data-url'):
-                    tripadvisor_urls.append(link.get('data-url'))
-                # Soit chercher dans le texte du lien
-                elif 'tripadvisor.fr' in link.text:
-                    url_match = re.search(r'(https?://(?:www\.)?tripadvisor\.fr/[^\s]+)', link.text)
-                    if url_match:
-                        tripadvisor_urls.append(url_match.group(1))
-        
-        # Méthode 2: Extraire les URLs avec regex du HTML complet (fallback)
-        if not tripadvisor_urls:
-            # Regex pour trouver des URLs Tripadvisor
-            url_pattern = r'(https?://(?:www\.)?tripadvisor\.fr/(?:Restaurant|Attraction|Hotel)_Review[^"\s\'&]+)'
-            urls = re.findall(url_pattern, response.text)
-            tripadvisor_urls.extend(urls)
-        
-        # Nettoyer et trier les URLs
-        cleaned_urls = []
-        for url in tripadvisor_urls:
-            # Nettoyer l'URL (enlever les paramètres et fragments)
-            clean_url = url.split('#')[0].split('?')[0]
-            if clean_url not in cleaned_urls:
-                cleaned_urls.append(clean_url)
-        
-        # Filtrer pour ne garder que les URLs de type Review
-        review_urls = [url for url in cleaned_urls if 'Review' in url]
+        # Parser les résultats (étape CPU)
+        save_html_fixture("bing", str(response.url), response.content)
+        review_urls = run_cpu_stage("bing_parse", parse_bing_tripadvisor_urls, response.content, resolve_html_parser())
         
         if review_urls:
             best_url = review_urls[0]  # Prendre la première URL
             logger.info(f"URL Tripadvisor trouvée pour {name}: {best_url}")
-            return best_url
+            return best_url, True
         
         logger.warning(f"Aucune URL Tripadvisor trouvée pour {name} {city}")
-        return None
+        return None, True
             
     except Exception as e:
         logger.error(f"Erreur lors de la recherche Bing: {e}")
-        return None
+        return None, False
+
+def resolve_tripadvisor_url(place_id, name, city="Paris"):
+    """
+    URL Tripadvisor d'un lieu, sans requête Bing si elle est déjà connue.
+    
+    Les résultats sont conservés par place_id dans BING_SEARCH_CACHE (LRU du
+    processus) et TripadvisorUrlCache (partagé entre exécutions et workers): une
+    URL trouvée pendant TRIPADVISOR_URL_TTL_DAYS, une absence de page pendant
+    TRIPADVISOR_URL_NEGATIVE_TTL_DAYS, dans les deux niveaux. Les échecs de
+    recherche ne sont pas mémorisés.
+    
+    Returns:
+        URL Tripadvisor ou None
+    """
+    now = datetime.now()
+    with BING_SEARCH_CACHE_LOCK:
+        entry = BING_SEARCH_CACHE.get(place_id)
+        if entry and entry[1] > now:
+            BING_SEARCH_CACHE.move_to_end(place_id)
+            return entry[0]
+        if entry:
+            del BING_SEARCH_CACHE[place_id]
+    
+    cache_collection = db.TripadvisorUrlCache
+    cached = cache_collection.find_one({"place_id": place_id, "expires_at": {"$gt": now}})
+    if cached:
+        logger.info(f"URL Tripadvisor en cache pour {name}: {cached.get('url') or 'aucune page'}")
+        remember_tripadvisor_url(place_id, cached.get("url"), cached["expires_at"])
+        return cached.get("url")
+    
+    url, searched = lookup_tripadvisor_url(name, city)
+    if searched:
+        ttl_days = TRIPADVISOR_URL_TTL_DAYS if url else TRIPADVISOR_URL_NEGATIVE_TTL_DAYS
+        now = datetime.now()
+        expires_at = now + timedelta(days=ttl_days)
+        cache_collection.update_one(
+            {"place_id": place_id},
+            {"$set": {"url": url, "name": name, "checked_at": now, "expires_at": expires_at}},
+            upsert=True
+        )
+        remember_tripadvisor_url(place_id, url, expires_at)
+    return url
+
+def remember_tripadvisor_url(place_id, url, expires_at):
+    """Ajoute une URL (ou une absence de page) au LRU BING_SEARCH_CACHE jusqu'à expires_at."""
+    with BING_SEARCH_CACHE_LOCK:
+        BING_SEARCH_CACHE[place_id] = (url, expires_at)
+        BING_SEARCH_CACHE.move_to_end(place_id)
+        while len(BING_SEARCH_CACHE) > BING_SEARCH_CACHE_SIZE:
+            BING_SEARCH_CACHE.popitem(last=False)
+
+def available_html_parsers():
+    """Backends de parsing utilisables dans cet environnement, du plus rapide au plus lent."""
+    backends = []
+    if SELECTOLAX_AVAILABLE:
+        backends.append("selectolax")
+    if LXML_AVAILABLE:
+        backends.append("lxml")
+    return backends + ["bs4-strainer", "bs4"]
+
+def resolve_html_parser(backend=None):
+    """Backend effectif: celui demandé s'il est disponible, sinon le plus rapide disponible."""
+    backend = backend or HTML_PARSER_BACKEND
+    available = available_html_parsers()
+    if backend in available:
+        return backend
+    if backend != "auto":
+        logger.warning(f"Backend HTML {backend} indisponible, utilisation de {available[0]}")
+    return available[0]
+
+_LXML_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+
+def _is_tripadvisor_node_class(value):
+    """
+    Classes conservées par le backend bs4-strainer sur une page Tripadvisor:
+    avis (review-container) et lien de la page suivante (nav next).
+    
+    Selon la version de bs4, la fonction reçoit l'attribut class entier
+    ("nav next") ou chacune de ses valeurs: seule la liste complète accepte le lien.
+    """
+    classes = set((value or "").split())
+    return "review-container" in classes or {"nav", "next"} <= classes
+
+# Seuls les avis (et leur contenu) et le lien suivant sont construits: pas les <div> qui les englobent
+TRIPADVISOR_STRAINER = SoupStrainer(["div", "a"], class_=_is_tripadvisor_node_class)
+
+def _lxml_parser():
+    # Le texte est déjà décodé: forcer l'UTF-8 plutôt que la déclaration de la page
+    return lxml.html.HTMLParser(encoding="utf-8")
+
+def extract_bing_nodes(html, backend):
+    """
+    Extrait d'une page Bing le texte des <cite> et les liens (href, data-url, texte).
+    Seuls ces éléments sont construits avec les backends partiels.
+    """
+    if backend == "selectolax":
+        tree = SelectolaxParser(html)
+        cites = [node.text() for node in tree.css("cite")]
+        links = [(node.attributes.get("href") or "", node.attributes.get("data-url"), node.text()) for node in tree.css("a")]
+    elif backend == "lxml":
+        if not html.strip():
+            return [], []
+        doc = lxml.html.fromstring(html.encode("utf-8"), parser=_lxml_parser())
+        cites = [node.text_content() for node in doc.iter("cite")]
+        links = [(node.get("href", ""), node.get("data-url"), node.text_content()) for node in doc.iter("a")]
+    else:
+        if backend == "bs4-strainer":
+            soup = BeautifulSoup(html, "lxml" if LXML_AVAILABLE else "html.parser", parse_only=SoupStrainer(["cite", "a"]))
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+        cites = [cite.text for cite in soup.find_all('cite')]
+        links = [(link.get('href', ''), link.get('data-url'), link.text) for link in soup.find_all('a')]
+    return cites, links
+
+def extract_tripadvisor_nodes(html, backend):
+    """
+    Extrait d'une page d'avis Tripadvisor le texte des avis (p.partial_entry des
+    div.review-container) et le href du lien "nav next" (None s'il n'y en a pas).
+    """
+    if backend == "selectolax":
+        tree = SelectolaxParser(html)
+        texts = []
+        for review in tree.css("div.review-container"):
+            text_elem = review.css_first("p.partial_entry")
+            texts.append(text_elem.text() if text_elem else "")
+        next_page = tree.css_first("a.nav.next")
+        next_href = (next_page.attributes.get("href") or "") if next_page else None
+    elif backend == "lxml":
+        if not html.strip():
+            return [], None
+        doc = lxml.html.fromstring(html.encode("utf-8"), parser=_lxml_parser())
+        texts = []
+        for review in doc.xpath(f"//div[{_LXML_CLASS.format('review-container')}]"):
+            text_elems = review.xpath(f".//p[{_LXML_CLASS.format('partial_entry')}]")
+            texts.append(text_elems[0].text_content() if text_elems else "")
+        next_pages = doc.xpath(f"//a[{_LXML_CLASS.format('nav')} and {_LXML_CLASS.format('next')}]")
+        next_href = next_pages[0].get("href", "") if next_pages else None
+    else:
+        if backend == "bs4-strainer":
+            soup = BeautifulSoup(html, "lxml" if LXML_AVAILABLE else "html.parser", parse_only=TRIPADVISOR_STRAINER)
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+        texts = []
+        for review in soup.find_all("div", class_="review-container"):
+            text_elem = review.find("p", class_="partial_entry")
+            texts.append(text_elem.text if text_elem else "")
+        next_page = soup.find("a", class_="nav next")
+        next_href = (next_page.get("href") or "") if next_page else None
+    return texts, next_href
+
+def save_html_fixture(kind, url, content):
+    """Enregistre une page brute dans HTML_FIXTURES_DIR (pour --benchmark-parsers)."""
+    if not HTML_FIXTURES_DIR:
+        return
+    try:
+        os.makedirs(HTML_FIXTURES_DIR, exist_ok=True)
+        name = f"{kind}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.html"
+        with open(os.path.join(HTML_FIXTURES_DIR, name), "wb") as f:
+            f.write(content)
+    except OSError as e:
+        logger.warning(f"Impossible d'enregistrer la page {url}: {e}")
+
+def parse_bing_tripadvisor_urls(html, backend=None):
+    """
+    Extrait les URLs de fiches Tripadvisor d'une page de résultats Bing.
+    
+    Args:
+        html: Page de résultats (octets ou texte)
+        backend: Backend de parsing (HTML_PARSER_BACKEND par défaut)
+        
+    Returns:
+        list: URLs Tripadvisor de type Review, dans l'ordre des résultats
+    """
+    html = html.decode("utf-8", "replace") if isinstance(html, bytes) else html
+    cites, links = extract_bing_nodes(html, resolve_html_parser(backend))
+    
+    # Méthode 1: Chercher dans les éléments <a> avec href
+    tripadvisor_urls = []
+    
+    # Chercher d'abord les citations directes
+    for cite_text in cites:
+        cite_text = cite_text.strip()
+        if 'tripadvisor.fr' in cite_text:
+            url_parts = cite_text.split()
+            for part in url_parts:
+                if part.startswith('https://') or part.startswith('http://'):
+                    if 'tripadvisor.fr' in part and ('Restaurant_Review' in part or 'Attraction_Review' in part or 'Hotel_Review' in part):
+                        tripadvisor_urls.append(part)
+    
+    # Ensuite chercher dans les liens
+    for href, data_url, link_text in links:
+        # Chercher des URLs Tripadvisor dans href
+        if 'tripadvisor.fr' in href and ('bing.com/ck' in href or '/search?q=' not in href):
+            # Soit extraire directement le href
+            if 'http' in href and 'tripadvisor.fr' in href:
+                tripadvisor_urls.append(href)
+            # Soit chercher dans le texte de l'attribut data-url si disponible
+            elif data_url and 'tripadvisor.fr' in data_url:
+                tripadvisor_urls.append(data_url)
+            # Soit chercher dans le texte du lien
+            elif 'tripadvisor.fr' in link_text:
+                url_match = re.search(r'(https?://(?:www\.)?tripadvisor\.fr/[^\s]+)', link_text)
+                if url_match:
+                    tripadvisor_urls.append(url_match.group(1))
+    
+    # Méthode 2: Extraire les URLs avec regex du HTML complet (fallback)
+    if not tripadvisor_urls:
+        # Regex pour trouver des URLs Tripadvisor
+        url_pattern = r'(https?://(?:www\.)?tripadvisor\.fr/(?:Restaurant|Attraction|Hotel)_Review[^"\s\'&]+)'
+        urls = re.findall(url_pattern, html)
+        tripadvisor_urls.extend(urls)
+    
+    # Nettoyer et trier les URLs
+    cleaned_urls = []
+    for url in tripadvisor_urls:
+        # Nettoyer l'URL (enlever les paramètres et fragments)
+        clean_url = url.split('#')[0].split('?')[0]
+        if clean_url not in cleaned_urls:
+            cleaned_urls.append(clean_url)
+    
+    # Filtrer pour ne garder que les URLs de type Review
+    review_urls = [url for url in cleaned_urls if 'Review' in url]
+    
+    return review_urls
 
 def find_tripadvisor_url(place_name, address=None):
     """Version simplifiée pour trouver l'URL Tripadvisor d'un lieu."""
@@ -452,27 +1470,552 @@ def extract_google_maps_reviews(place_id):
         logger.error(f"Erreur lors de l'extraction des commentaires Google Maps: {e}")
         return []
 
-def extract_place_screenshot(place_id, place_name):
+def accept_google_cookies(driver):
     """
-    Génère une capture d'écran du lieu via Google Maps avec Chrome headless
-    en utilisant la même méthode que billetreduc_shotgun_mistral.py
+    Accepte la boîte de dialogue des cookies Google (méthode billetreduc).
     
     Args:
-        place_id: Identifiant Google Maps du lieu
-        place_name: Nom du lieu pour le log
+        driver: WebDriver Selenium positionné sur une page Google
         
     Returns:
-        URL de l'image en format data:image/jpeg;base64 ou URL statique
+        bool: True si un bouton de consentement a été cliqué
     """
+    from selenium.webdriver.common.by import By
+    
     try:
-        # Vérification du cache
-        cache_collection = db.ScreenshotCache
-        cache_key = place_id
+        logger.info("Recherche et acceptation de la boîte de dialogue des cookies")
+        
+        # Méthode 1: Recherche par texte (plus fiable)
+        cookie_buttons = driver.find_elements(By.XPATH, 
+            "//button[contains(., 'Tout accepter') or contains(., 'Accept all') or contains(., 'Accepter')]")
+        
+        # Méthode 2: Recherche par attributs (fallback)
+        if not cookie_buttons:
+            cookie_buttons = driver.find_elements(By.CSS_SELECTOR, 
+                "button.VfPpkd-LgbsSe, button.VfPpkd-LgbsSe-OWXEXe-k8QpJ")
+        
+        for button in cookie_buttons:
+            try:
+                button.click()
+                logger.info("Cookies acceptés")
+                # Attendre la fermeture de la boîte de dialogue plutôt qu'une pause fixe
+                try:
+                    WebDriverWait(driver, 5).until(EC.staleness_of(button))
+                except Exception:
+                    pass
+                return True
+            except Exception:
+                pass
+    except Exception as e:
+        logger.warning(f"Impossible d'accepter les cookies: {e}")
+    
+    return False
+
+class BrowserPool:
+    """
+    Pool de navigateurs Chrome headless préchauffés pour les captures Google Maps.
+    
+    Chaque navigateur est démarré une seule fois, le consentement cookies y est
+    accepté au préchauffage, puis il est prêté aux captures successives. Il est
+    recyclé après BROWSER_MAX_USES captures ou dès qu'il ne répond plus.
+    """
+    
+    def __init__(self, size, max_uses=BROWSER_MAX_USES):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._unhealthy = set()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._driver_path = None
+    
+    def _chrome_options(self):
+        from selenium.webdriver.chrome.options import Options
+        
+        # Options Chrome - EXACTEMENT comme dans billetreduc
+        chrome_options = Options()
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1280,800")
+        
+        # Ne pas ajouter trop d'options qui peuvent causer des problèmes
+        chrome_options.add_argument("--lang=fr-FR")
+        chrome_options.add_argument("--mute-audio")
+        return chrome_options
+    
+    def _create_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+        
+        # Résolution du chromedriver une seule fois pour tout le pool
+        with self._lock:
+            if self._driver_path is None:
+                self._driver_path = ChromeDriverManager().install()
+        
+        driver = webdriver.Chrome(service=Service(self._driver_path), options=self._chrome_options())
+        driver.set_page_load_timeout(30)
+        
+        # Bloquer tuiles de carte et polices: elles ne figurent pas dans la zone capturée
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": SCREENSHOT_BLOCKED_URLS})
+        except Exception as e:
+            logger.debug(f"Blocage des ressources indisponible: {e}")
+        
+        # Agrandir le tampon Resource Timing avant chaque navigation (sinon il peut
+        # être plein avant que wait_for_page_ready ne commence à compter)
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                "source": f"performance.setResourceTimingBufferSize({SCREENSHOT_RESOURCE_BUFFER_SIZE});"
+            })
+        except Exception as e:
+            logger.debug(f"Tampon Resource Timing non agrandi: {e}")
+        
+        # Préchauffage: charger Google Maps et accepter les cookies une fois pour toutes
+        try:
+            rate_limiter.acquire("google_maps_web")
+            driver.get("https://www.google.com/maps?hl=fr")
+            accept_google_cookies(driver)
+        except Exception as e:
+            logger.warning(f"Préchauffage du navigateur incomplet: {e}")
+        
+        self._uses[id(driver)] = 0
+        logger.info("Nouveau navigateur ajouté au pool")
+        return driver
+    
+    def warm_up(self):
+        """Démarre tous les navigateurs du pool en parallèle."""
+        with self._lock:
+            missing = self.size - self._created
+            self._created += missing
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [executor.submit(self._create_driver) for _ in range(missing)]
+        for future in futures:
+            try:
+                self._idle.put(future.result())
+            except Exception as e:
+                logger.error(f"Impossible de démarrer un navigateur: {e}")
+                with self._lock:
+                    self._created -= 1
+    
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        while True:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._create_driver()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            # Pool plein: attendre qu'un navigateur soit rendu (ou qu'une place se libère)
+            try:
+                return self._idle.get(timeout=5)
+            except queue.Empty:
+                continue
+    
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+    
+    def _discard(self, driver):
+        self._uses.pop(id(driver), None)
+        self._unhealthy.discard(id(driver))
+        with self._lock:
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def mark_unhealthy(self, driver):
+        """Retire le navigateur du pool à sa restitution (erreur rattrapée par l'appelant)."""
+        self._unhealthy.add(id(driver))
+    
+    def _release(self, driver, healthy):
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        if not healthy or id(driver) in self._unhealthy or not self._is_alive(driver):
+            logger.warning("Navigateur défaillant retiré du pool")
+            self._discard(driver)
+        elif self._uses[id(driver)] >= self.max_uses:
+            logger.info(f"Recyclage d'un navigateur après {self.max_uses} captures")
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+    
+    @contextmanager
+    def lease(self):
+        """Prête un navigateur du pool pour la durée du bloc with."""
+        from selenium.common.exceptions import WebDriverException
+        
+        driver = self._acquire()
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self._release(driver, healthy)
+    
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+def get_browser_pool():
+    """Retourne le pool de navigateurs partagé, dimensionné sur la concurrence du pipeline."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(BROWSER_POOL_SIZE or CONCURRENCY, BROWSER_MAX_USES)
+            atexit.register(_browser_pool.close)
+        return _browser_pool
+
+def wait_for_page_ready(driver, timeout=SCREENSHOT_READY_TIMEOUT):
+    """
+    Attend que la fiche Google Maps soit prête: titre du lieu (DUwDvf) présent,
+    document chargé et plus aucune nouvelle ressource réseau pendant
+    SCREENSHOT_NETWORK_IDLE_MS.
+    
+    Args:
+        driver: WebDriver Selenium
+        timeout: Attente maximale du titre du lieu en secondes
+        
+    Returns:
+        bool: True si la page est prête, False si l'attente a expiré
+    """
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "DUwDvf"))
+        )
+    except Exception:
+        logger.warning("Titre du lieu introuvable, capture sans attendre la fiche")
+        return False
+    
+    idle_seconds = SCREENSHOT_NETWORK_IDLE_MS / 1000
+    deadline = time.monotonic() + SCREENSHOT_NETWORK_IDLE_TIMEOUT
+    last_count = -1
+    stable_since = time.monotonic()
+    while time.monotonic() < deadline:
+        state, count = driver.execute_script(
+            "return [document.readyState, performance.getEntriesByType('resource').length];"
+        )
+        now = time.monotonic()
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        elif state == "complete" and now - stable_since >= idle_seconds:
+            return True
+        time.sleep(0.1)
+    
+    logger.debug("Réseau toujours actif à l'expiration, capture en l'état")
+    return False
+
+def capture_clip_jpeg_base64(driver, clip=SCREENSHOT_CLIP, quality=SCREENSHOT_JPEG_QUALITY):
+    """
+    Capture uniquement la zone utile de la page, en mémoire, encodée une seule fois en JPEG.
+    
+    Args:
+        driver: WebDriver Selenium
+        clip: Zone à capturer (left, top, right, bottom)
+        quality: Qualité JPEG
+        
+    Returns:
+        str: Image JPEG encodée en base64
+    """
+    left, top, right, bottom = clip
+    try:
+        # Chrome DevTools: capture directe de la zone en JPEG
+        result = driver.execute_cdp_cmd("Page.captureScreenshot", {
+            "format": "jpeg",
+            "quality": quality,
+            "clip": {"x": left, "y": top, "width": right - left, "height": bottom - top, "scale": 1}
+        })
+        return result["data"]
+    except Exception as e:
+        logger.debug(f"Capture CDP indisponible ({e}), recadrage de la capture complète")
+    
+    # Fallback sans CDP: capture complète en mémoire puis recadrage (étape CPU)
+    jpeg = run_cpu_stage("image_crop", crop_png_to_jpeg, driver.get_screenshot_as_png(), clip, quality)
+    return base64.b64encode(jpeg).decode()
+
+def crop_png_to_jpeg(png_bytes, clip, quality=SCREENSHOT_JPEG_QUALITY):
+    """Recadre une capture PNG sur clip (left, top, right, bottom) et l'encode en JPEG."""
+    image = Image.open(BytesIO(png_bytes)).convert("RGB")
+    buffer = BytesIO()
+    image.crop(clip).save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+def render_thumbnails(data, sizes):
+    """
+    Génère les miniatures JPEG d'une image.
+    
+    Args:
+        data: Octets de l'image
+        sizes: {nom: largeur maximale}
+        
+    Returns:
+        tuple: (largeur, hauteur, {nom: (octets, largeur, hauteur)})
+    """
+    image = Image.open(BytesIO(data)).convert("RGB")
+    thumbnails = {}
+    for size_name, max_width in sizes.items():
+        thumbnail = image.copy()
+        thumbnail.thumbnail((max_width, max_width * image.height // max(image.width, 1)))
+        buffer = BytesIO()
+        thumbnail.save(buffer, format="JPEG", quality=85)
+        thumbnails[size_name] = (buffer.getvalue(), thumbnail.width, thumbnail.height)
+    return image.width, image.height, thumbnails
+
+def is_inline_image(url):
+    """Indique si une URL est une image embarquée (data URL base64)."""
+    return isinstance(url, str) and url.startswith("data:image/")
+
+class ImageStore:
+    """
+    Stockage d'images adressé par contenu (SHA-256), sur disque local ou GridFS.
+    
+    Une image identique n'est stockée qu'une fois; les miniatures de
+    IMAGE_THUMBNAIL_SIZES sont générées à l'insertion. Les documents ne
+    conservent qu'une référence courte (IMAGE_PUBLIC_PREFIX + hash).
+    """
+    
+    def __init__(self, backend=IMAGE_STORE_BACKEND):
+        self.backend = backend
+        self._bucket = None
+        if backend == "gridfs":
+            self._bucket = gridfs.GridFSBucket(db, bucket_name=IMAGE_STORE_BUCKET)
+        else:
+            os.makedirs(IMAGE_STORE_DIR, exist_ok=True)
+    
+    @staticmethod
+    def _name(image_hash, size=None):
+        return f"{image_hash}_{size}" if size else image_hash
+    
+    @staticmethod
+    def _content_type(content_type):
+        """Type MIME sans paramètres (image/png; charset=... -> image/png)."""
+        return (content_type or "image/jpeg").split(";")[0].strip().lower()
+    
+    def _path(self, name, content_type="image/jpeg"):
+        extension = IMAGE_EXTENSIONS.get(self._content_type(content_type), ".bin")
+        return os.path.join(IMAGE_STORE_DIR, name[:2], f"{name}{extension}")
+    
+    def _find_path(self, name):
+        """Fichier local d'une image, quelle que soit son extension (None si absent)."""
+        for extension in list(IMAGE_EXTENSIONS.values()) + [".bin"]:
+            path = os.path.join(IMAGE_STORE_DIR, name[:2], f"{name}{extension}")
+            if os.path.exists(path):
+                return path
+        return None
+    
+    def exists(self, image_hash, size=None):
+        name = self._name(image_hash, size)
+        if self._bucket is not None:
+            return db[f"{IMAGE_STORE_BUCKET}.files"].find_one({"filename": name}, {"_id": 1}) is not None
+        return self._find_path(name) is not None
+    
+    def _write(self, name, data, metadata):
+        """
+        Écrit une image sous ce nom; retourne False si un autre worker l'a déjà écrite.
+        
+        En GridFS, l'index unique sur filename rejette le second envoi d'une même
+        adresse: ses chunks, écrits avant le document du fichier, sont supprimés.
+        """
+        if self._bucket is not None:
+            file_id = ObjectId()
+            try:
+                self._bucket.upload_from_stream_with_id(file_id, name, data, metadata=metadata)
+            except DuplicateKeyError:
+                db[f"{IMAGE_STORE_BUCKET}.chunks"].delete_many({"files_id": file_id})
+                return False
+            return True
+        
+        path = self._path(name, metadata.get("content_type"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Fichier temporaire propre à l'écrivain: os.replace rend l'écriture atomique
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return True
+    
+    def get(self, image_hash, size=None):
+        """Retourne les octets de l'image (ou de sa miniature), None si absente."""
+        name = self._name(image_hash, size)
+        try:
+            if self._bucket is not None:
+                return self._bucket.open_download_stream_by_name(name).read()
+            path = self._find_path(name)
+            if path is None:
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except (gridfs.NoFile, FileNotFoundError):
+            return None
+    
+    @staticmethod
+    def reference(image_hash):
+        return f"{IMAGE_PUBLIC_PREFIX}{image_hash}"
+    
+    def put(self, data, content_type="image/jpeg"):
+        """
+        Stocke une image si elle n'est pas déjà présente.
+        
+        Args:
+            data: Octets de l'image
+            content_type: Type MIME de l'image
+            
+        Returns:
+            str: Référence courte de l'image
+        """
+        image_hash = hashlib.sha256(data).hexdigest()
+        if self.exists(image_hash):
+            return self.reference(image_hash)
+        
+        # Miniatures d'abord: l'original n'est visible qu'une fois l'ensemble complet
+        width, height, thumbnails = run_cpu_stage("thumbnails", render_thumbnails, data, IMAGE_THUMBNAIL_SIZES)
+        for size_name, (thumbnail, thumbnail_width, thumbnail_height) in thumbnails.items():
+            self._write(self._name(image_hash, size_name), thumbnail, {
+                "content_type": "image/jpeg", "source_hash": image_hash, "size": size_name,
+                "width": thumbnail_width, "height": thumbnail_height
+            })
+        
+        # Un doublon sur l'original signifie qu'un autre worker a stocké la même image: même référence
+        self._write(image_hash, data, {
+            "content_type": self._content_type(content_type), "width": width, "height": height
+        })
+        return self.reference(image_hash)
+    
+    def put_data_url(self, data_url):
+        """Stocke une image embarquée (data:image/...;base64,...) et retourne sa référence."""
+        header, encoded = data_url.split(",", 1)
+        content_type = header[len("data:"):].split(";")[0] or "image/jpeg"
+        return self.put(base64.b64decode(encoded), content_type)
+
+_image_store = None
+
+def get_image_store():
+    """Retourne le stockage d'images partagé (backend choisi par --image-store)."""
+    global _image_store
+    if _image_store is None:
+        _image_store = ImageStore(IMAGE_STORE_BACKEND)
+    return _image_store
+
+def migrate_inline_images(batch_size=100):
+    """
+    Migration unique: déplace les images base64 embarquées de BeautyPlaces et
+    ScreenshotCache vers le stockage d'images et les remplace par leur référence.
+    
+    Args:
+        batch_size: Nombre de mises à jour par bulk_write
+        
+    Returns:
+        int: Nombre de documents modifiés
+    """
+    store = get_image_store()
+    inline = {"$regex": "^data:image/"}
+    migrated = 0
+    
+    def convert(url):
+        return store.put_data_url(url) if is_inline_image(url) else url
+    
+    # BeautyPlaces: photo de profil et liste de photos
+    operations = []
+    cursor = db.BeautyPlaces.find(
+        {"$or": [{"profile_photo": inline}, {"photos.url": inline}]},
+        {"profile_photo": 1, "photos": 1, "name": 1}
+    )
+    for doc in cursor:
+        try:
+            # Ne réécrire que les champs qui contiennent effectivement une image embarquée
+            updates = {}
+            if is_inline_image(doc.get("profile_photo")):
+                updates["profile_photo"] = convert(doc["profile_photo"])
+            photos = doc.get("photos", [])
+            if any(is_inline_image(photo.get("url") if isinstance(photo, dict) else photo) for photo in photos):
+                updates["photos"] = [
+                    dict(photo, url=convert(photo.get("url"))) if isinstance(photo, dict) else convert(photo)
+                    for photo in photos
+                ]
+            if updates:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": updates}))
+        except Exception as e:
+            logger.error(f"Migration impossible pour {doc.get('name', doc['_id'])}: {e}")
+        if len(operations) >= batch_size:
+            migrated += db.BeautyPlaces.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        migrated += db.BeautyPlaces.bulk_write(operations, ordered=False).modified_count
+    
+    # ScreenshotCache
+    operations = []
+    for doc in db.ScreenshotCache.find({"screenshot_url": inline}, {"screenshot_url": 1}):
+        try:
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+                "screenshot_url": convert(doc["screenshot_url"])
+            }, "$unset": {"local_path": ""}}))
+        except Exception as e:
+            logger.error(f"Migration impossible pour le screenshot {doc['_id']}: {e}")
+        if len(operations) >= batch_size:
+            migrated += db.ScreenshotCache.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        migrated += db.ScreenshotCache.bulk_write(operations, ordered=False).modified_count
+    
+    logger.info(f"Migration des images terminée: {migrated} documents mis à jour")
+    return migrated
+
+def extract_place_screenshot(place_id, place_name):
+    """
+    Génère une capture d'écran du lieu via Google Maps avec Chrome headless
+    en utilisant la même méthode que billetreduc_shotgun_mistral.py
+    
+    Args:
+        place_id: Identifiant Google Maps du lieu
+        place_name: Nom du lieu pour le log
+        
+    Returns:
+        Référence de l'image dans le stockage d'images ou URL statique
+    """
+    try:
+        # Vérification du cache
+        cache_collection = db.ScreenshotCache
+        cache_key = place_id
         cached_screenshot = cache_collection.find_one({"place_id": cache_key})
         
         if cached_screenshot and cached_screenshot.get("screenshot_url"):
             logger.info(f"Utilisation du screenshot en cache pour {place_name}")
-            return cached_screenshot.get("screenshot_url")
+            screenshot_url = cached_screenshot.get("screenshot_url")
+            # Ancienne entrée base64: la déplacer vers le stockage d'images au passage
+            if is_inline_image(screenshot_url):
+                screenshot_url = get_image_store().put_data_url(screenshot_url)
+                cache_collection.update_one({"place_id": cache_key}, {"$set": {"screenshot_url": screenshot_url}})
+            return screenshot_url
             
         # Construire l'URL Google Maps
         maps_url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
@@ -482,191 +2025,87 @@ def extract_place_screenshot(place_id, place_name):
             static_url = f"https://maps.googleapis.com/maps/api/staticmap?center=place_id:{place_id}&zoom=17&size=800x600&maptype=roadmap&markers=color:red%7Cplace_id:{place_id}&key={API_KEY}"
             
             try:
-                # Télécharger l'image et la convertir en base64
-                import base64 as b64_module  # Renommer l'import pour éviter la confusion
-                response = requests.get(static_url, timeout=10)
+                # Télécharger l'image et la placer dans le stockage d'images
+                response = http_client.get("static_map", static_url, timeout=10)
                 if response.status_code == 200:
-                    image_base64 = b64_module.b64encode(response.content).decode('utf-8')
-                    data_url = f"data:image/jpeg;base64,{image_base64}"
+                    image_ref = get_image_store().put(response.content, response.headers.get("content-type", "image/png"))
                     
                     # Mise en cache
                     cache_collection.update_one(
                         {"place_id": cache_key},
                         {"$set": {
                             "place_id": cache_key,
-                            "screenshot_url": data_url,
+                            "screenshot_url": image_ref,
                             "is_test_data": True,
                             "timestamp": datetime.now()
                         }},
                         upsert=True
                     )
                     
-                    logger.info(f"Image statique convertie en base64 pour {place_name}")
-                    return data_url
+                    logger.info(f"Image statique stockée pour {place_name}: {image_ref}")
+                    return image_ref
             except Exception as e:
                 logger.error(f"Erreur lors de la conversion de l'image statique: {e}")
                 return static_url
         
         # MÉTHODE DE BILLETREDUC: Utiliser Selenium pour naviguer et capturer l'écran
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.chrome.service import Service
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from webdriver_manager.chrome import ChromeDriverManager
-        import time
-        from PIL import Image
-        import io
-        import base64 as b64_module  # Correction de la référence base64
-        
-        # Options Chrome - EXACTEMENT comme dans billetreduc
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1280,800")
-        
-        # Ne pas ajouter trop d'options qui peuvent causer des problèmes
-        chrome_options.add_argument("--lang=fr-FR")
-        chrome_options.add_argument("--mute-audio")
-        
-        # Génération d'un ID unique pour ce screenshot
-        screenshot_id = hashlib.md5(f"{place_id}_{place_name}".encode()).hexdigest()[:10]
-        
-        # Créer le répertoire des images s'il n'existe pas
-        workspace_dir = os.path.dirname(os.path.abspath(__file__))
-        image_dir = os.path.join(workspace_dir, "venue_images")
-        os.makedirs(image_dir, exist_ok=True)
-        
-        # Chemins des fichiers
-        screenshot_path = os.path.join(image_dir, f"maps_raw_{screenshot_id}.png")
-        cropped_path = os.path.join(image_dir, f"maps_{screenshot_id}.jpg")
-        
-        # Initialisation du driver
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-        
-        try:
-            # Définir un timeout plus long
-            driver.set_page_load_timeout(30)
-            
-            logger.info(f"Navigation vers Google Maps pour {place_name}: {maps_url}")
-            driver.get(maps_url)
-            
-            # Attendre que la page se charge (10 secondes max)
-            time.sleep(2)
-            
-            # IMPORTANT: Gestion des cookies exactement comme billetreduc
+        # Emprunt d'un navigateur préchauffé (cookies déjà acceptés)
+        from selenium.common.exceptions import WebDriverException
+        browser_pool = get_browser_pool()
+        with browser_pool.lease() as driver:
             try:
-                logger.info("Recherche et acceptation de la boîte de dialogue des cookies")
+                logger.info(f"Navigation vers Google Maps pour {place_name}: {maps_url}")
+                rate_limiter.acquire("google_maps_web")
+                driver.get(maps_url)
                 
-                # Méthode 1: Recherche par texte (plus fiable)
-                cookie_buttons = driver.find_elements(By.XPATH, 
-                    "//button[contains(., 'Tout accepter') or contains(., 'Accept all') or contains(., 'Accepter')]")
-                if cookie_buttons:
-                    for button in cookie_buttons:
-                        try:
-                            button.click()
-                            logger.info("Cookies acceptés via bouton textuel")
-                            time.sleep(1)
-                            break
-                        except:
-                            pass
+                # Le consentement est accepté au préchauffage; ne le refaire que si Google le redemande
+                if "consent." in driver.current_url:
+                    accept_google_cookies(driver)
+                
+                # Attendre la fiche du lieu et l'inactivité réseau plutôt que des pauses fixes
+                wait_for_page_ready(driver)
+                
+                # Capturer uniquement la zone utile, en mémoire
+                logger.info(f"Capture de la zone {SCREENSHOT_CLIP}")
+                img_base64 = capture_clip_jpeg_base64(driver)
+                image_ref = get_image_store().put(base64.b64decode(img_base64))
+                
+                # Mise en cache
+                cache_collection.update_one(
+                    {"place_id": cache_key},
+                    {"$set": {
+                        "place_id": cache_key,
+                        "screenshot_url": image_ref,
+                        "timestamp": datetime.now()
+                    }},
+                    upsert=True
+                )
+                
+                logger.info(f"Screenshot stocké pour {place_name}: {image_ref}")
+                return image_ref
                 
-                # Méthode 2: Recherche par attributs (fallback)
-                if not cookie_buttons:
-                    cookie_buttons = driver.find_elements(By.CSS_SELECTOR, 
-                        "button.VfPpkd-LgbsSe, button.VfPpkd-LgbsSe-OWXEXe-k8QpJ")
-                    if cookie_buttons:
-                        for button in cookie_buttons:
-                            try:
-                                button.click()
-                                logger.info("Cookies acceptés via bouton CSS")
-                                time.sleep(1)
-                                break
-                            except:
-                                pass
             except Exception as e:
-                logger.warning(f"Impossible d'accepter les cookies: {e}")
-            
-            # Attendre que la carte se charge complètement
-            time.sleep(5)
-            
-            # Capturer l'écran entier
-            logger.info("Capture de l'écran complet")
-            driver.save_screenshot(screenshot_path)
-            logger.info(f"Screenshot brut capturé et sauvegardé: {screenshot_path}")
-            
-            # Ouvrir l'image pour la recadrer
-            img = Image.open(screenshot_path)
-            
-            # Coordonnées du crop (à ajuster si nécessaire selon la mise en page de Google Maps)
-            left = 30
-            top = 70
-            right = 330
-            bottom = 230
-            
-            crop_box = (left, top, right, bottom)
-            logger.info(f"Recadrage de l'image: {crop_box}")
-            cropped_img = img.crop(crop_box)
-            
-            # Sauvegarder l'image recadrée
-            cropped_img.save(cropped_path, format="JPEG", quality=90)
-            logger.info(f"Image recadrée sauvegardée: {cropped_path}")
-            
-            # Convertir l'image en base64 pour l'application web
-            buffer = io.BytesIO()
-            cropped_img.save(buffer, format="JPEG", quality=90)
-            buffer.seek(0)
-            img_base64 = b64_module.b64encode(buffer.read()).decode()
-            data_url = f"data:image/jpeg;base64,{img_base64}"
-            
-            # Mise en cache
-            cache_collection.update_one(
-                {"place_id": cache_key},
-                {"$set": {
-                    "place_id": cache_key,
-                    "screenshot_url": data_url,
-                    "local_path": cropped_path,
-                    "timestamp": datetime.now()
-                }},
-                upsert=True
-            )
-            
-            logger.info(f"Screenshot converti en base64 pour {place_name}")
-            return data_url
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de la capture d'écran pour {place_name}: {e}")
-            
-            # Fallback vers l'URL statique en cas d'erreur
-            static_url = f"https://maps.googleapis.com/maps/api/staticmap?center=place_id:{place_id}&zoom=17&size=800x600&maptype=roadmap&markers=color:red%7Cplace_id:{place_id}&key={API_KEY}"
-            
-            # Mise en cache de l'URL statique
-            cache_collection.update_one(
-                {"place_id": cache_key},
-                {"$set": {
-                    "place_id": cache_key,
-                    "screenshot_url": static_url,
-                    "error": str(e),
-                    "timestamp": datetime.now()
-                }},
-                upsert=True
-            )
-            
-            return static_url
-            
-        finally:
-            # Fermer le navigateur
-            driver.quit()
-            
-            # Supprimer le screenshot brut pour économiser de l'espace (facultatif)
-            try:
-                if os.path.exists(screenshot_path):
-                    os.remove(screenshot_path)
-            except:
-                pass
+                logger.error(f"Erreur lors de la capture d'écran pour {place_name}: {e}")
+                # Erreur du navigateur: ne pas le rendre au pool, même si l'URL statique sert de repli
+                if isinstance(e, WebDriverException):
+                    browser_pool.mark_unhealthy(driver)
+                
+                # Fallback vers l'URL statique en cas d'erreur
+                static_url = f"https://maps.googleapis.com/maps/api/staticmap?center=place_id:{place_id}&zoom=17&size=800x600&maptype=roadmap&markers=color:red%7Cplace_id:{place_id}&key={API_KEY}"
+                
+                # Mise en cache de l'URL statique
+                cache_collection.update_one(
+                    {"place_id": cache_key},
+                    {"$set": {
+                        "place_id": cache_key,
+                        "screenshot_url": static_url,
+                        "error": str(e),
+                        "timestamp": datetime.now()
+                    }},
+                    upsert=True
+                )
+                
+                return static_url
     
     except Exception as e:
         logger.error(f"Erreur générale lors de la génération du screenshot pour {place_name}: {e}")
@@ -687,15 +2126,15 @@ def scrape_place_details(place_id, name, city="Paris"):
     """
     logger.info(f"Récupération des détails pour {name} (ID: {place_id})")
     
-    # Vérifier le cache MongoDB, même en mode test
+    # Toujours vérifier le cache, même en mode test (mais sans y écrire)
+    is_test_mode = '--test' in sys.argv
+    return place_record_cache.get_or_fetch(
+        place_id, lambda: build_place_record(place_id, name, city), store=not is_test_mode
+    )
+
+def build_place_record(place_id, name, city="Paris"):
+    """Construit la fiche structurée d'un lieu (sans cache, voir scrape_place_details)."""
     is_test_mode = '--test' in sys.argv
-    cache_collection = db.PlaceDetailsCache
-    
-    # Toujours vérifier le cache, même en mode test
-    cached_data = cache_collection.find_one({"place_id": place_id})
-    if cached_data and (datetime.now() - cached_data["timestamp"]).days < 7:
-        logger.info(f"Utilisation des détails en cache pour {place_id}")
-        return cached_data["details"]
     
     # Récupérer les détails de base via Google Maps
     place_details = extract_place_details(place_id)
@@ -734,7 +2173,7 @@ def scrape_place_details(place_id, name, city="Paris"):
     
     # 1. Essayer d'abord Tripadvisor via Bing
     tripadvisor_comments = []
-    tripadvisor_url = search_links_bing(name, city)
+    tripadvisor_url = resolve_tripadvisor_url(place_id, name, city)
     
     if tripadvisor_url:
         logger.info(f"URL Tripadvisor trouvée pour {name}: {tripadvisor_url}")
@@ -755,16 +2194,21 @@ def scrape_place_details(place_id, name, city="Paris"):
     # 2. Si pas de commentaires Tripadvisor, utiliser Google Maps
     if not tripadvisor_comments:
         logger.info(f"Extraction des commentaires Google Maps pour {name}")
-        google_comments = extract_google_maps_reviews(place_id)
+        # comments reste une liste de textes; les avis complets (note étoilée, sentiment),
+        # dont la cascade d'analyse a besoin, sont conservés à part dans google_reviews
+        google_reviews = [review for review in extract_reviews(place_details) if review["text"].strip()]
+        google_comments = [review["text"].strip() for review in google_reviews]
         
         if google_comments and len(google_comments) > 0:
             logger.info(f"Récupéré {len(google_comments)} commentaires Google Maps pour {name}")
             structured_data["comments"] = google_comments
+            structured_data["google_reviews"] = google_reviews
             structured_data["comments_source"] = "Google Maps"
             
             # En mode test, limiter à 5 commentaires maximum
             if is_test_mode and len(google_comments) > 5:
                 structured_data["comments"] = google_comments[:5]
+                structured_data["google_reviews"] = google_reviews[:5]
                 logger.info(f"Mode TEST: Limité à 5 commentaires Google Maps")
         else:
             logger.warning(f"Aucun commentaire trouvé pour {name} - ni sur Tripadvisor ni sur Google Maps")
@@ -787,18 +2231,6 @@ def scrape_place_details(place_id, name, city="Paris"):
     else:
         structured_data["average_score"] = 0
     
-    # Mise en cache des données (sauf en mode test)
-    if not is_test_mode:
-        cache_collection.update_one(
-            {"place_id": place_id},
-            {"$set": {
-                "place_id": place_id,
-                "details": structured_data,
-                "timestamp": datetime.now()
-            }},
-            upsert=True
-        )
-    
     return structured_data
 
 def process_place(place):
@@ -814,10 +2246,23 @@ def process_place(place):
     # Si aucun commentaire n'a été trouvé, ignorer ce lieu
     if not enriched_place:
         logger.warning(f"Lieu {place_name} ignoré car aucun commentaire trouvé")
+        journal_stage(place_id, "saved", outcome="skipped")
         return None
+    journal_stage(place_id, "fetched")
+    
+    # Conserver les types Google trouvés lors de la découverte
+    for key in ("google_type", "google_types", "categories"):
+        if place.get(key):
+            enriched_place[key] = place[key]
+    # Compléter avec la découverte ce que Place Details n'a pas renvoyé
+    # (user_ratings_total sert à la priorité de rafraîchissement)
+    for key in ("user_ratings_total", "rating", "gps_coordinates"):
+        if not enriched_place.get(key) and place.get(key):
+            enriched_place[key] = place[key]
     
-    # Récupérer les commentaires pour analyse
-    comments = enriched_place.get("comments", [])
+    # Récupérer les commentaires pour analyse (avis Google Maps complets si disponibles,
+    # pour que la cascade voie les étoiles)
+    comments = enriched_place.get("google_reviews") or enriched_place.get("comments", [])
     comments_source = enriched_place.get("comments_source", "Google Maps")
     
     logger.info(f"Analyse des {len(comments)} commentaires de {comments_source} pour {place_name}")
@@ -848,6 +2293,13 @@ def process_place(place):
                 "time": comment.get("time", 0)
             })
     
+    # Scorer en un seul lot les avis arrivés sans sentiment (Tripadvisor, Google Maps web)
+    unscored = [review for review in formatted_reviews if review["sentiment"] == "Non analysé" and review["text"]]
+    if unscored:
+        for review, sentiment in zip(unscored, sentiment_engine.score_batch([review["text"] for review in unscored])):
+            review["sentiment_score"] = sentiment
+            review["sentiment"] = sentiment_label_for(sentiment)
+    
     # En mode test, forcer l'utilisation de l'analyse de secours pour éviter les erreurs Mistral
     is_test_mode = '--test' in sys.argv
     
@@ -860,14 +2312,15 @@ def process_place(place):
             # En mode test, on peut utiliser directement le fallback pour être sûr
             if is_test_mode and not '--force-analysis' in sys.argv:
                 logger.info(f"Mode TEST: Utilisation de l'analyse simplifiée pour {place_name}")
-                mistral_analysis = simple_analysis_fallback(formatted_reviews, criteria)
+                mistral_analysis = simple_analysis_fallback(formatted_reviews, criteria, category_name)
+                record_cascade_tier("test")
             else:
-                # Sinon, on essaie d'abord avec Mistral-7B-Instruct-v0.3
-                logger.info(f"Analyse avec Mistral-7B-Instruct-v0.3 pour {place_name} (catégorie: {category_name})")
-                mistral_analysis = analyze_reviews_with_mistral(formatted_reviews, category_name)
+                # Sinon, notation rapide par mots-clés, et Mistral seulement si elle est peu fiable
+                mistral_analysis = route_analysis(formatted_reviews, category_name, enriched_place.get("rating"), place_name)
             
             # Ajouter l'analyse aux données du lieu
             enriched_place["mistral_analysis"] = mistral_analysis
+            journal_stage(place_id, "analysed")
             
             # Calculer un score global basé sur l'analyse
             if "analyse" in mistral_analysis:
@@ -907,7 +2360,7 @@ def process_place(place):
             logger.error(f"Erreur lors de l'analyse pour {place_name}: {e}")
             
             # Analyse de secours en cas d'erreur
-            fallback_analysis = simple_analysis_fallback(formatted_reviews, criteria)
+            fallback_analysis = simple_analysis_fallback(formatted_reviews, criteria, category_name)
             enriched_place["mistral_analysis"] = fallback_analysis
             
             # Scores par défaut
@@ -948,60 +2401,1040 @@ def process_place(place):
     
     return enriched_place
 
+def normalize_review_text(text):
+    """Normalise un avis pour la comparaison: espaces compactés, casse ignorée."""
+    return " ".join(str(text).split()).casefold()
+
+def fold_accents(text):
+    """Retire les accents et la casse ("Propreté" -> "proprete")."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def estimate_tokens(text):
+    """Estimation rapide du nombre de tokens d'un texte (sans tokenizer)."""
+    return max(1, -(-len(text) // PROMPT_CHARS_PER_TOKEN)) if text else 0
+
+def truncate_to_tokens(text, max_tokens):
+    """Tronque un texte à max_tokens (estimés) en coupant sur une limite de mot."""
+    max_chars = max_tokens * PROMPT_CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return (cut or text[:max_chars]).rstrip(" ,;.") + "…"
+
+def select_prompt_reviews(reviews, token_budget=None):
+    """
+    Sélectionne le texte des avis à placer dans un prompt d'analyse.
+    
+    Seul le texte est conservé (pas d'auteur, de date ni de champs vides),
+    les doublons sont retirés, chaque avis est tronqué à PROMPT_MAX_REVIEW_TOKENS
+    et l'ensemble est limité à token_budget.
+    
+    Args:
+        reviews: Avis (dictionnaires avec "text" ou chaînes)
+        token_budget: Tokens maximum pour les avis (PROMPT_TOKEN_BUDGET par défaut)
+        
+    Returns:
+        tuple: (lignes "- avis", statistiques de sélection)
+    """
+    token_budget = token_budget or PROMPT_TOKEN_BUDGET
+    
+    seen = set()
+    lines = []
+    used_tokens = 0
+    truncated = 0
+    duplicates = 0
+    for review in reviews:
+        text = review.get("text", "") if isinstance(review, dict) else review
+        text = " ".join(str(text or "").split())
+        if not text:
+            continue
+        normalized = text.casefold()
+        if normalized in seen:
+            duplicates += 1
+            continue
+        seen.add(normalized)
+        
+        short_text = truncate_to_tokens(text, PROMPT_MAX_REVIEW_TOKENS)
+        if short_text != text:
+            truncated += 1
+        tokens = estimate_tokens(short_text)
+        if used_tokens + tokens > token_budget:
+            if lines:
+                break
+            short_text = truncate_to_tokens(short_text, token_budget)
+            tokens = estimate_tokens(short_text)
+        lines.append(f"- {short_text}")
+        used_tokens += tokens
+    
+    stats = {
+        "review_tokens": used_tokens,
+        "reviews_total": len(reviews),
+        "reviews_used": len(lines),
+        "reviews_truncated": truncated,
+        "duplicates_removed": duplicates
+    }
+    return lines, stats
+
+def build_analysis_prompt(reviews, category, token_budget=None):
+    """
+    Construit un prompt compact pour l'analyse d'un ensemble d'avis.
+    
+    Les avis sont sélectionnés par select_prompt_reviews et les critères
+    d'évaluation de la catégorie sont listés pour obtenir une note par critère.
+    
+    Args:
+        reviews: Avis (dictionnaires avec "text" ou chaînes)
+        category: Catégorie de l'établissement (clé de CATEGORIES)
+        token_budget: Tokens maximum pour les avis (PROMPT_TOKEN_BUDGET par défaut)
+        
+    Returns:
+        tuple: (prompt, statistiques du prompt)
+    """
+    criteria = CATEGORIES.get(category, {}).get("criteres_evaluation", [])
+    lines, stats = select_prompt_reviews(reviews, token_budget)
+    
+    prompt = (
+        f"Avis clients d'un établissement ({category}) :\n"
+        + "\n".join(lines)
+        + "\n\nNote chaque critère sur 5, une ligne par critère au format \"critère: note\", sans autre texte.\n"
+        + "Critères : " + ", ".join(criteria)
+    )
+    stats["prompt_tokens"] = estimate_tokens(prompt)
+    return prompt, stats
+
+def build_batch_analysis_prompt(items, token_budget=None):
+    """
+    Construit un prompt unique couvrant plusieurs établissements.
+    
+    Chaque établissement a sa section "### Lieu N" (catégorie, critères, avis);
+    le modèle doit reprendre ces en-têtes pour que parse_batch_analysis_response
+    puisse rendre à chaque lieu ses notes.
+    
+    Args:
+        items: Liste de (reviews, category)
+        token_budget: Tokens maximum pour les avis de chaque lieu
+        
+    Returns:
+        tuple: (prompt, statistiques du prompt pour chaque lieu)
+    """
+    header = (
+        "Évalue séparément chaque établissement ci-dessous. Pour chacun, recopie la ligne "
+        "\"### Lieu N\" puis note chacun de ses critères sur 5, une ligne par critère au format "
+        "\"critère: note\", sans autre texte."
+    )
+    sections = []
+    all_stats = []
+    for index, (reviews, category) in enumerate(items, start=1):
+        criteria = CATEGORIES.get(category, {}).get("criteres_evaluation", [])
+        lines, stats = select_prompt_reviews(reviews, token_budget)
+        section = (
+            f"### Lieu {index}\n"
+            f"Catégorie : {category}\n"
+            f"Critères : {', '.join(criteria)}\n"
+            "Avis :\n" + "\n".join(lines)
+        )
+        stats["prompt_tokens"] = estimate_tokens(section) + estimate_tokens(header) // len(items)
+        stats["batch_size"] = len(items)
+        sections.append(section)
+        all_stats.append(stats)
+    
+    return header + "\n\n" + "\n\n".join(sections), all_stats
+
+def match_criterion(aspect, criteria):
+    """
+    Rattache un aspect renvoyé par le modèle au critère canonique correspondant, ou None.
+    
+    La comparaison porte sur les mots (accents, casse et ponctuation ignorés):
+    mêmes mots, aspect commençant par les mots du critère ("Propreté générale"),
+    ou aspect formé des premiers mots d'un seul critère ("Qualité").
+    """
+    words = re.findall(r"[a-z]+", fold_accents(aspect))
+    if not words:
+        return None
+    
+    abbreviations = []
+    for criterion in criteria:
+        criterion_words = re.findall(r"[a-z]+", fold_accents(criterion))
+        if words == criterion_words or words[:len(criterion_words)] == criterion_words:
+            return criterion
+        if criterion_words[:len(words)] == words:
+            abbreviations.append(criterion)
+    return abbreviations[0] if len(abbreviations) == 1 else None
+
+def analysis_cache_key(reviews, category):
+    """
+    Clé de cache d'une analyse: empreinte de l'ensemble normalisé des avis
+    (ordre et doublons ignorés), de la catégorie, de la version du prompt et du modèle.
+    """
+    texts = set()
+    for review in reviews:
+        text = review.get("text", "") if isinstance(review, dict) else review
+        if text and str(text).strip():
+            texts.add(normalize_review_text(text))
+    payload = json.dumps({
+        "reviews": sorted(texts),
+        "category": category,
+        "token_budget": PROMPT_TOKEN_BUDGET,
+        "prompt_version": ANALYSIS_PROMPT_VERSION,
+        "model": ANALYSIS_MODEL_NAME
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class AnalysisCache:
+    """
+    Cache persistant (collection AnalysisCache) des analyses de commentaires.
+    
+    Seul le résultat compact de l'analyse est stocké, sous une clé d'empreinte
+    (voir analysis_cache_key). Les entrées d'une autre version de prompt sont
+    invalidées au démarrage et la taille est bornée par une éviction LRU sur last_access.
+    """
+    
+    def __init__(self, collection, max_entries=ANALYSIS_CACHE_MAX_ENTRIES):
+        self.collection = collection
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        entry = self.collection.find_one_and_update(
+            {"key": key, "prompt_version": ANALYSIS_PROMPT_VERSION},
+            {"$set": {"last_access": datetime.now()}, "$inc": {"hits": 1}},
+            projection={"analysis": 1, "_id": 0}
+        )
+        with self._lock:
+            if entry:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry["analysis"] if entry else None
+    
+    def put(self, key, analysis):
+        now = datetime.now()
+        self.collection.update_one(
+            {"key": key},
+            {"$set": {
+                "analysis": analysis,
+                "prompt_version": ANALYSIS_PROMPT_VERSION,
+                "model": ANALYSIS_MODEL_NAME,
+                "last_access": now
+            }, "$setOnInsert": {"created_at": now, "hits": 0}},
+            upsert=True
+        )
+        with self._lock:
+            self._writes += 1
+            check = self._writes % ANALYSIS_CACHE_EVICTION_INTERVAL == 0
+        if check:
+            self.evict()
+    
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_entries."""
+        excess = self.collection.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return 0
+        stale_ids = [doc["_id"] for doc in self.collection.find({}, {"_id": 1}).sort("last_access", ASCENDING).limit(excess)]
+        deleted = self.collection.delete_many({"_id": {"$in": stale_ids}}).deleted_count
+        logger.info(f"Cache d'analyse: {deleted} entrées les moins utilisées supprimées")
+        return deleted
+    
+    def invalidate_stale_versions(self):
+        """Supprime les analyses produites par une autre version du prompt."""
+        deleted = self.collection.delete_many({"prompt_version": {"$ne": ANALYSIS_PROMPT_VERSION}}).deleted_count
+        if deleted:
+            logger.info(f"Cache d'analyse: {deleted} entrées d'une ancienne version de prompt invalidées")
+        return deleted
+    
+    def clear(self):
+        return self.collection.delete_many({}).deleted_count
+
+analysis_cache = AnalysisCache(db.AnalysisCache)
+
+def parse_analysis_notes(response, category):
+    """Extrait les lignes "critère: note" d'une réponse, rattachées aux critères de la catégorie."""
+    criteria = CATEGORIES.get(category, {}).get("criteres_evaluation", [])
+    notes = {}
+    for line in response.split('\n'):
+        if ':' in line:
+            aspect, note = line.split(':', 1)
+            criterion = match_criterion(aspect, criteria)
+            if not criterion:
+                continue
+            match = re.search(r"\d+(?:[.,]\d+)?", note)
+            if not match:
+                continue
+            note = float(match.group(0).replace(",", "."))
+            # Première note valide conservée: une ligne parasite ne l'écrase pas
+            if 0 <= note <= 5 and criterion not in notes:
+                notes[criterion] = note
+    return notes
+
+def parse_batch_analysis_response(response, count):
+    """
+    Découpe une réponse multi-lieux en sections "### Lieu N" (index 0..count-1).
+    
+    Les variantes d'en-tête fréquentes sont acceptées: "**Lieu 2**", "Lieu 1 :",
+    "### **Lieu 3 :**", "- Lieu n°4".
+    """
+    sections = {}
+    parts = re.split(r"^[ \t#>*_-]*Lieu[ \t]+(?:n[°o][ \t]*)?(\d+)[ \t*_]*:?[ \t*_]*$",
+                     response, flags=re.MULTILINE | re.IGNORECASE)
+    for i in range(1, len(parts) - 1, 2):
+        index = int(parts[i]) - 1
+        if 0 <= index < count and index not in sections:
+            sections[index] = parts[i + 1]
+    return sections
+
+def build_analysis_result(notes, prompt_stats):
+    """Met en forme les notes extraites au format attendu par process_place."""
+    return {"analyse": {aspect: {"note": note} for aspect, note in notes.items()},
+            "sentiment_general": "positif" if sum(notes.values())/len(notes) > 3 else "mitigé",
+            "resume": f"Analyse basée sur les reviews fournies.",
+            "prompt_stats": prompt_stats}
+
+class InferenceStats:
+    """Compteurs de la génération locale et du daemon d'inférence (exposés par /stats)."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.generations = 0
+        self.generated_tokens = 0
+        self.generation_seconds = 0.0
+    
+    def request_started(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+    
+    def request_finished(self, error=False):
+        with self._lock:
+            self.in_flight -= 1
+            if error:
+                self.errors += 1
+    
+    def record_generation(self, seconds, text):
+        with self._lock:
+            self.generations += 1
+            self.generated_tokens += estimate_tokens(text or "")
+            self.generation_seconds += seconds
+    
+    def snapshot(self, batcher=None):
+        with self._lock:
+            uptime = time.monotonic() - self.started_at
+            return {
+                "uptime_seconds": round(uptime, 1),
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - 1) + (batcher.pending() if batcher else 0),
+                "requests": self.requests,
+                "errors": self.errors,
+                "generations": self.generations,
+                "requests_per_minute": round(60 * self.requests / uptime, 2) if uptime else 0,
+                "generated_tokens_per_second": round(self.generated_tokens / self.generation_seconds, 1) if self.generation_seconds else 0,
+                "model_busy_ratio": round(self.generation_seconds / uptime, 3) if uptime else 0,
+                "batches": batcher.batches if batcher else 0,
+                "batched_places": batcher.batched_places if batcher else 0
+            }
+
+inference_stats = InferenceStats()
+_inference_unavailable_until = 0
+
+def inference_request(path, payload):
+    """
+    Envoie une requête au daemon d'inférence (INFERENCE_URL).
+    
+    Returns:
+        dict: Réponse JSON du daemon, ou None s'il est injoignable ou en erreur
+              (l'appelant génère alors dans le processus)
+    """
+    global _inference_unavailable_until
+    if not INFERENCE_URL or time.monotonic() < _inference_unavailable_until:
+        return None
+    try:
+        # Pas de nouvelle tentative: relancer une génération complète sur un daemon
+        # lent ou en erreur coûterait plus cher que de générer localement
+        response = http_client.post(
+            "inference", INFERENCE_URL.rstrip("/") + path, json=payload, retries=0,
+            timeout=httpx.Timeout(INFERENCE_TIMEOUT, connect=INFERENCE_CONNECT_TIMEOUT)
+        )
+        if response.status_code == 200:
+            return response.json()
+        logger.warning(f"Daemon d'inférence: réponse {response.status_code} sur {path}")
+    except Exception as e:
+        logger.warning(f"Daemon d'inférence injoignable ({e.__class__.__name__}), génération locale")
+    _inference_unavailable_until = time.monotonic() + INFERENCE_RETRY_DELAY
+    return None
+
+def generate_text(prompt, max_tokens=ANALYSIS_MAX_TOKENS, temperature=0.3, top_p=0.95):
+    """
+    Génère une réponse Mistral, via le daemon d'inférence si INFERENCE_URL est défini,
+    sinon (ou en cas d'échec du daemon) avec le modèle chargé dans ce processus.
+    """
+    remote = inference_request("/generate", {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "top_p": top_p})
+    if remote is not None:
+        return remote.get("text")
+    
+    with MISTRAL_LOCK:
+        start = time.monotonic()
+        text = generate_ai_response_mistral(prompt, max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+        inference_stats.record_generation(time.monotonic() - start, text)
+    return text
+
+def run_single_analysis(reviews, category):
+    """Analyse un seul ensemble d'avis avec Mistral (un appel au modèle)."""
+    # Construire un prompt compact (texte des avis uniquement, borné en tokens)
+    prompt, prompt_stats = build_analysis_prompt(reviews, category)
+    logger.info(f"Prompt d'analyse: ~{prompt_stats['prompt_tokens']} tokens, "
+                f"{prompt_stats['reviews_used']}/{prompt_stats['reviews_total']} avis")
+    
+    # Générer la réponse avec Mistral avec paramètres optimisés pour v0.3
+    response = generate_text(prompt, max_tokens=ANALYSIS_MAX_TOKENS, temperature=0.3, top_p=0.95)
+    
+    if not response:
+        logger.error("Erreur lors de l'analyse des reviews")
+        return None
+    
+    notes = parse_analysis_notes(response, category)
+    if not notes:
+        logger.error("Aucune note exploitable dans la réponse du modèle")
+        return None
+    return build_analysis_result(notes, prompt_stats)
+
+class AnalysisBatcher:
+    """
+    File d'analyse regroupant les avis de plusieurs lieux dans un même appel au modèle.
+    
+    Les workers (process_place) déposent leurs avis avec submit() et attendent
+    le Future retourné. Un thread dédié forme des lots d'au plus batch_size lieux,
+    ou moins si max_wait secondes se sont écoulées depuis la première demande,
+    génère un prompt multi-lieux et rend à chaque lieu ses notes. Un lieu absent
+    de la réponse est réanalysé seul.
+    """
+    
+    def __init__(self, batch_size=ANALYSIS_BATCH_SIZE, max_wait=ANALYSIS_BATCH_MAX_WAIT):
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="analysis_batcher", daemon=True)
+        self._thread.start()
+        self.batches = 0
+        self.batched_places = 0
+    
+    def pending(self):
+        return self._queue.qsize()
+    
+    def submit(self, reviews, category):
+        future = Future()
+        self._queue.put((reviews, category, future))
+        return future
+    
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.error(f"Erreur lors de l'analyse groupée de {len(batch)} lieux: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    def _process(self, batch):
+        if len(batch) == 1:
+            reviews, category, future = batch[0]
+            future.set_result(run_single_analysis(reviews, category))
+            return
+        
+        prompt, all_stats = build_batch_analysis_prompt([(reviews, category) for reviews, category, _ in batch])
+        logger.info(f"Analyse groupée de {len(batch)} lieux: ~{estimate_tokens(prompt)} tokens de prompt")
+        response = generate_text(prompt, max_tokens=ANALYSIS_MAX_TOKENS * len(batch), temperature=0.3, top_p=0.95)
+        self.batches += 1
+        self.batched_places += len(batch)
+        
+        sections = parse_batch_analysis_response(response or "", len(batch))
+        for index, (reviews, category, future) in enumerate(batch):
+            notes = parse_analysis_notes(sections.get(index, ""), category)
+            if notes:
+                future.set_result(build_analysis_result(notes, all_stats[index]))
+            else:
+                logger.warning(f"Lieu {index+1} absent de la réponse groupée, analyse individuelle")
+                future.set_result(run_single_analysis(reviews, category))
+
+_analysis_batcher = None
+_analysis_batcher_lock = threading.Lock()
+
+def get_analysis_batcher():
+    """Retourne la file d'analyse groupée (créée au premier appel), ou None si le regroupement est inutile."""
+    global _analysis_batcher
+    batch_size = min(ANALYSIS_BATCH_SIZE, CONCURRENCY)
+    if batch_size <= 1:
+        return None
+    with _analysis_batcher_lock:
+        if _analysis_batcher is None:
+            _analysis_batcher = AnalysisBatcher(batch_size=batch_size)
+        return _analysis_batcher
+
 def analyze_reviews_with_mistral(reviews, category):
-    """Analyse les reviews avec Mistral-7B-Instruct-v0.3 en fonction de la catégorie"""
+    """Analyse les reviews avec Mistral-7B-Instruct-v0.3 en fonction de la catégorie.
+    Un ensemble d'avis déjà analysé (même contenu, catégorie et version de prompt)
+    est servi depuis le cache sans appeler le modèle. Avec plusieurs workers,
+    l'analyse passe par la file groupée (AnalysisBatcher)."""
+    try:
+        cache_key = analysis_cache_key(reviews, category)
+        cached_analysis = analysis_cache.get(cache_key)
+        if cached_analysis:
+            logger.info(f"Analyse servie depuis le cache ({category})")
+            return cached_analysis
+        
+        # Daemon d'inférence partagé (il regroupe lui-même les lieux de tous les workers)
+        remote = inference_request("/analyze", {"reviews": review_texts(reviews), "category": category})
+        if remote is not None:
+            analysis = remote.get("analysis")
+        else:
+            batcher = get_analysis_batcher()
+            if batcher:
+                analysis = batcher.submit(reviews, category).result()
+            else:
+                analysis = run_single_analysis(reviews, category)
+        
+        if analysis:
+            analysis_cache.put(cache_key, analysis)
+        return analysis
+            
+    except Exception as e:
+        logger.error(f"Erreur lors de l'analyse des reviews: {e}")
+        return None
+
+def review_texts(reviews):
+    """Texte seul des avis (format transmis au daemon d'inférence)."""
+    return [review.get("text", "") if isinstance(review, dict) else str(review) for review in reviews]
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """
+    API du daemon d'inférence:
+        POST /generate {"prompt", "max_tokens", "temperature", "top_p"} -> {"text"}
+        POST /analyze {"reviews", "category"} -> {"analysis"}
+        GET /stats -> file d'attente et débit
+    """
+    
+    server_version = "WellnessInference/1.0"
+    
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, inference_stats.snapshot(self.server.batcher))
+        else:
+            self._send_json(404, {"error": "not found"})
+    
+    def do_POST(self):
+        if self.path not in ("/generate", "/analyze"):
+            self._send_json(404, {"error": "not found"})
+            return
+        
+        inference_stats.request_started()
+        error = False
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path == "/generate":
+                text = generate_text(
+                    payload["prompt"],
+                    max_tokens=payload.get("max_tokens", ANALYSIS_MAX_TOKENS),
+                    temperature=payload.get("temperature", 0.3),
+                    top_p=payload.get("top_p", 0.95)
+                )
+                self._send_json(200, {"text": text})
+            else:
+                reviews, category = payload["reviews"], payload["category"]
+                if self.server.batcher:
+                    analysis = self.server.batcher.submit(reviews, category).result()
+                else:
+                    analysis = run_single_analysis(reviews, category)
+                self._send_json(200, {"analysis": analysis})
+        except Exception as e:
+            error = True
+            logger.error(f"Daemon d'inférence: erreur sur {self.path}: {e}")
+            self._send_json(500, {"error": str(e)})
+        finally:
+            inference_stats.request_finished(error)
+    
+    def log_message(self, format, *args):
+        logger.debug("Daemon d'inférence: " + format % args)
+
+def serve_inference(host=INFERENCE_HOST, port=INFERENCE_PORT):
+    """
+    Lance le daemon d'inférence: un seul modèle chaud partagé par tous les
+    processus wellness.py lancés avec --inference-url. Les requêtes /analyze
+    concurrentes sont regroupées par un AnalysisBatcher.
+    """
+    server = ThreadingHTTPServer((host, port), InferenceRequestHandler)
+    server.daemon_threads = True
+    server.batcher = (
+        AnalysisBatcher(batch_size=ANALYSIS_BATCH_SIZE, max_wait=ANALYSIS_BATCH_MAX_WAIT)
+        if ANALYSIS_BATCH_SIZE > 1 else None
+    )
+    logger.info(f"Daemon d'inférence à l'écoute sur http://{host}:{port} (lots de {ANALYSIS_BATCH_SIZE} lieux)")
     try:
-        # Vider le cache de Mistral avant chaque analyse
-        clear_mistral_cache()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Arrêt du daemon d'inférence")
+    finally:
+        server.server_close()
+
+def stem_keyword(word):
+    """Racine approximative d'un mot-clé français (accents retirés, terminaisons courantes ôtées)."""
+    word = fold_accents(word)
+    for suffix in ("ement", "ique", "eux", "euse", "ees", "es", "ee", "e", "s", "x"):
+        if len(word) - len(suffix) >= 4 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+class KeywordCriteriaScorer:
+    """
+    Notation des critères par mots-clés (MOTS_CLES), sans modèle.
+    
+    Tous les mots-clés et termes de polarité sont compilés en une seule
+    expression régulière sur le texte sans accents; chaque avis est parcouru
+    une fois. Une mention de critère est pondérée par la polarité de sa
+    proposition (négations comprises) ou, à défaut, par celle de l'avis
+    (note étoilée, sentiment_score). Les critères jamais mentionnés reçoivent
+    la note globale de l'avis.
+    """
+    
+    CLAUSE_SPLIT = re.compile(r"[.,!?;\n]+|\bmais\b")
+    WORD = re.compile(r"\w+")
+    # Une négation ne porte que sur un terme polaire de ses NEGATION_WINDOW mots suivants
+    NEGATION_WINDOW = 3
+    
+    def __init__(self, mots_cles, polarity_words=POLARITE_MOTS, negations=NEGATIONS):
+        # Chaque groupe de l'expression correspond à une racine: (type, valeur)
+        self._targets = []
+        alternatives = []
+        by_stem = OrderedDict()
+        for category, criteria in mots_cles.items():
+            for criterion, keywords in criteria.items():
+                for keyword in keywords:
+                    by_stem.setdefault(stem_keyword(keyword), []).append(("criterion", (category, criterion)))
+        for label, sign in (("positif", 1), ("négatif", -1)):
+            for word in polarity_words[label]:
+                by_stem.setdefault(stem_keyword(word), []).append(("polarity", sign))
+        for word in negations:
+            by_stem.setdefault(fold_accents(word), []).append(("negation", None))
         
-        # Construire le prompt pour l'analyse optimisé pour Mistral v0.3
-        prompt = f"""Analyse les reviews suivantes pour un établissement de type {category} :
+        # Racines les plus longues d'abord pour que l'alternance préfère la plus spécifique
+        for stem in sorted(by_stem, key=len, reverse=True):
+            escaped = re.escape(stem)
+            if len(stem) <= 4:
+                alternatives.append(rf"\b({escaped})(?:e|s|es|x)?\b")
+            else:
+                alternatives.append(rf"\b({escaped})[\w-]*")
+            self._targets.append(by_stem[stem])
+        self.pattern = re.compile("|".join(alternatives))
+    
+    @staticmethod
+    def review_sentiment(review):
+        """Sentiment de l'avis dans [-1, 1]: note étoilée si connue, sinon sentiment_score."""
+        if not isinstance(review, dict):
+            return 0.0
+        rating = review.get("rating") or 0
+        if rating:
+            return max(-1.0, min(1.0, (float(rating) - 3) / 2))
+        return float(review.get("sentiment_score") or 0)
+    
+    def scan(self, text, category):
+        """
+        Parcourt un avis et retourne ses mentions de critères et sa polarité lexicale.
         
-        Reviews à analyser :
-        {reviews}
+        Returns:
+            tuple: (liste de (critère, polarité de la proposition), polarité de l'avis)
+        """
+        mentions = []
+        review_polarity = 0
+        for clause in self.CLAUSE_SPLIT.split(fold_accents(text)):
+            clause_criteria = []
+            polarity = 0
+            negation_end = None
+            for match in self.pattern.finditer(clause):
+                targets = self._targets[match.lastindex - 1]
+                for kind, value in targets:
+                    if kind == "criterion" and value[0] == category:
+                        clause_criteria.append(value[1])
+                    elif kind == "negation":
+                        negation_end = match.end()
+                # Une négation inverse le terme de polarité qui la suit de près ("pas très propre"),
+                # comme dans score_sentiment_text
+                sign = next((value for kind, value in targets if kind == "polarity"), 0)
+                if sign:
+                    negated = (negation_end is not None and
+                               len(self.WORD.findall(clause, negation_end, match.start())) < self.NEGATION_WINDOW)
+                    polarity += -sign if negated else sign
+                    negation_end = None
+            polarity = max(-1, min(1, polarity))
+            review_polarity += polarity
+            mentions.extend((criterion, polarity) for criterion in dict.fromkeys(clause_criteria))
+        return mentions, max(-1, min(1, review_polarity))
+    
+    def score(self, reviews, category, criteria=None):
+        """
+        Note chaque critère sur 5 à partir des avis d'un lieu.
         
-        Donne uniquement une note sur 5 pour chaque aspect mentionné dans les reviews.
-        Ne génère pas de texte explicatif, uniquement les notes.
+        Args:
+            reviews: Avis (dictionnaires avec "text" ou chaînes)
+            category: Catégorie de l'établissement (clé de MOTS_CLES)
+            criteria: Critères à noter (criteres_evaluation de la catégorie par défaut)
+            
+        Returns:
+            dict: Analyse au format de analyze_reviews_with_mistral, avec le nombre
+                  de mentions par critère
         """
+        criteria = criteria or CATEGORIES.get(category, {}).get("criteres_evaluation", [])
+        totals = {criterion: [0.0, 0] for criterion in criteria}
+        sentiments = []
+        lexical_polarities = []
         
-        # Générer la réponse avec Mistral avec paramètres optimisés pour v0.3
-        response = generate_ai_response_mistral(prompt, max_tokens=100, temperature=0.3, top_p=0.95)
+        for review in reviews:
+            text = review.get("text", "") if isinstance(review, dict) else review
+            if not text:
+                continue
+            mentions, lexical_polarity = self.scan(text, category)
+            lexical_polarities.append(float(lexical_polarity))
+            sentiment = self.review_sentiment(review) or float(lexical_polarity)
+            sentiments.append(sentiment)
+            for criterion, polarity in mentions:
+                if criterion in totals:
+                    totals[criterion][0] += polarity if polarity else sentiment
+                    totals[criterion][1] += 1
         
-        if not response:
-            logger.error("Erreur lors de l'analyse des reviews")
-            return None
+        overall = sum(sentiments) / len(sentiments) if sentiments else 0.0
+        analyse = {}
+        for criterion, (weighted, count) in totals.items():
+            # Lissage vers le sentiment global: peu de mentions = note prudente
+            value = (weighted + overall) / (count + 1)
+            analyse[criterion] = {"note": round(2.5 + 2.5 * value, 1), "mentions": count}
         
-        # Nettoyer et parser la réponse
-        try:
-            # Extraire les notes de la réponse
-            notes = {}
-            for line in response.split('\n'):
-                if ':' in line:
-                    aspect, note = line.split(':', 1)
-                    aspect = aspect.strip().lower()
-                    try:
-                        note = float(note.strip())
-                        if 0 <= note <= 5:
-                            notes[aspect] = note
-                    except ValueError:
-                        continue
-            
-            return {"analyse": {aspect: {"note": note} for aspect, note in notes.items()},
-                    "sentiment_general": "positif" if sum(notes.values())/len(notes) > 3 else "mitigé",
-                    "resume": f"Analyse basée sur les reviews fournies."}
+        sentiment_general = "positif" if overall > 0.2 else "négatif" if overall < -0.2 else "mitigé"
+        return {
+            "analyse": analyse,
+            "sentiment_general": sentiment_general,
+            "sentiment_score": round(overall, 3),
+            # Polarité du seul texte (sans les étoiles), comparée aux étoiles par scoring_confidence
+            "lexical_score": round(sum(lexical_polarities) / len(lexical_polarities), 3) if lexical_polarities else 0.0,
+            "resume": f"Analyse par mots-clés basée sur {len(sentiments)} avis."
+        }
+
+keyword_scorer = KeywordCriteriaScorer(MOTS_CLES)
+
+def score_keywords(reviews, category, criteria=None):
+    """Notation par mots-clés (unité de travail envoyée aux processus, voir run_cpu_stage)."""
+    return keyword_scorer.score(reviews, category, criteria)
+
+_SENTIMENT_LEXICON = {}
+for _label, _sign in (("positif", 1.0), ("négatif", -1.0)):
+    for _word in POLARITE_MOTS[_label]:
+        _SENTIMENT_LEXICON[stem_keyword(_word)] = _sign
+_NEGATION_WORDS = frozenset(fold_accents(word) for word in NEGATIONS)
+_INTENSIFIER_WORDS = frozenset(INTENSIFICATEURS)
+_CLAUSE_BREAKS = frozenset(",;.!?")
+_ENGLISH_MARKERS = frozenset(["the", "and", "was", "very", "is", "were", "with", "staff", "great", "this", "but", "not"])
+_FRENCH_MARKERS = frozenset(["le", "la", "les", "et", "est", "tres", "un", "une", "pour", "avec", "mais", "pas", "je", "nous"])
+
+def sentiment_label_for(score):
+    return "Positif" if score >= 0.05 else "Négatif" if score <= -0.05 else "Neutre"
+
+def score_sentiment_text(text):
+    """
+    Sentiment d'un avis dans [-1, 1].
+    
+    Les avis en français sont notés avec le lexique POLARITE_MOTS (une négation
+    inverse le premier terme polaire des trois mots suivants, dans la même
+    proposition; intensificateurs x1.5; normalisation façon VADER); les avis
+    majoritairement en anglais restent notés par VADER. Fonction pure,
+    utilisable dans un ProcessPoolExecutor.
+    """
+    tokens = re.findall(r"[a-z]+|[,;.!?]", fold_accents(text))
+    english = sum(1 for word in tokens if word in _ENGLISH_MARKERS)
+    french = sum(1 for word in tokens if word in _FRENCH_MARKERS)
+    if english > french:
+        return analyzer.polarity_scores(text)['compound']
+    
+    total = 0.0
+    negation_window = 0
+    boost = 1.0
+    for word in tokens:
+        if word in _CLAUSE_BREAKS:
+            # Fin de proposition: "pas terrible, déçu" ne nie pas "déçu"
+            negation_window = 0
+            boost = 1.0
+            continue
+        if word in _NEGATION_WORDS:
+            negation_window = 3
+            continue
+        if word in _INTENSIFIER_WORDS:
+            boost = 1.5
+            continue
+        polarity = _SENTIMENT_LEXICON.get(stem_keyword(word)) or _SENTIMENT_LEXICON.get(word)
+        if polarity:
+            total += -polarity * boost if negation_window else polarity * boost
+            negation_window = 0
+            boost = 1.0
+        elif negation_window:
+            negation_window -= 1
+    return round(total / math.sqrt(total * total + 15), 4)
+
+def score_sentiment_chunk(texts):
+    """Note une liste d'avis (unité de travail envoyée aux processus)."""
+    return [score_sentiment_text(text) for text in texts]
+
+class SentimentEngine:
+    """
+    Sentiment des avis, calculé par lots et mis en cache.
+    
+    Les scores sont indexés par empreinte du texte normalisé (et version du
+    lexique): un avis déjà vu n'est jamais recalculé, ni dans ce processus
+    (LRU mémoire), ni d'une exécution à l'autre (collection SentimentCache).
+    Les gros lots peuvent être répartis sur un ProcessPoolExecutor.
+    """
+    
+    def __init__(self, collection, memory_size=SENTIMENT_MEMORY_CACHE_SIZE):
+        self.collection = collection
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "db_hits": 0, "computed": 0}
+    
+    @staticmethod
+    def text_key(text):
+        payload = f"{SENTIMENT_LEXICON_VERSION}:{normalize_review_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _remember(self, key, score):
+        with self._lock:
+            self._memory[key] = score
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+    
+    def score_batch(self, texts, executor=None):
+        """
+        Note une liste d'avis.
+        
+        Args:
+            texts: Textes des avis
+            executor: ProcessPoolExecutor optionnel pour les lots d'au moins SENTIMENT_POOL_MIN_BATCH avis
             
-        except Exception as e:
-            logger.error(f"Erreur lors du parsing de la réponse: {e}")
-            return None
+        Returns:
+            list: Scores dans [-1, 1], dans l'ordre de texts
+        """
+        keys = [self.text_key(text or "") for text in texts]
+        scores = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    scores[key] = self._memory[key]
+                    self._memory.move_to_end(key)
+            self.stats["memory_hits"] += len(scores)
+        
+        missing = list(dict.fromkeys(key for key in keys if key not in scores))
+        if missing:
+            try:
+                for doc in self.collection.find({"_id": {"$in": missing}}, {"score": 1}):
+                    scores[doc["_id"]] = doc["score"]
+                    self._remember(doc["_id"], doc["score"])
+                    with self._lock:
+                        self.stats["db_hits"] += 1
+            except Exception as e:
+                logger.warning(f"Cache de sentiment indisponible: {e}")
+        
+        to_compute = OrderedDict()
+        for key, text in zip(keys, texts):
+            if key not in scores and key not in to_compute:
+                to_compute[key] = text or ""
+        if to_compute:
+            computed_texts = list(to_compute.values())
+            if executor is not None and len(computed_texts) >= SENTIMENT_POOL_MIN_BATCH:
+                size = max(1, len(computed_texts) // (SENTIMENT_WORKERS * 4))
+                chunks = [computed_texts[i:i + size] for i in range(0, len(computed_texts), size)]
+                computed = [score for chunk in executor.map(score_sentiment_chunk, chunks) for score in chunk]
+            else:
+                computed = run_cpu_stage("sentiment", score_sentiment_chunk, computed_texts)
             
-    except Exception as e:
-        logger.error(f"Erreur lors de l'analyse des reviews: {e}")
-        return None
+            buffer = get_write_buffer(self.collection.name)
+            for key, score in zip(to_compute, computed):
+                scores[key] = score
+                self._remember(key, score)
+                buffer.add(UpdateOne(
+                    {"_id": key},
+                    {"$set": {"score": score, "version": SENTIMENT_LEXICON_VERSION, "updated_at": datetime.now()}},
+                    upsert=True
+                ))
+            with self._lock:
+                self.stats["computed"] += len(to_compute)
+        
+        return [scores[key] for key in keys]
+
+sentiment_engine = SentimentEngine(db.SentimentCache)
+
+def rescore_sentiments(workers=None):
+    """
+    Recalcule le sentiment de tous les avis Google notés enregistrés dans BeautyPlaces.
+    
+    Les avis de google_reviews sont notés par lots sur un pool de processus;
+    leurs sentiment/sentiment_score sont mis à jour et tous les scores
+    alimentent SentimentCache pour les exécutions suivantes. Les comments
+    ne sont que du texte et n'ont pas de score à mettre à jour.
+    """
+    workers = workers or SENTIMENT_WORKERS
+    collection = db.BeautyPlaces
+    updated = 0
+    scored = 0
+    
+    def rescore_chunk(docs, executor):
+        nonlocal updated, scored
+        texts = [review.get("text", "") for doc in docs for review in doc["google_reviews"]]
+        scores = iter(sentiment_engine.score_batch(texts, executor))
+        scored += len(texts)
+        for doc in docs:
+            changed = False
+            reviews = []
+            for review in doc["google_reviews"]:
+                score = next(scores)
+                if review.get("sentiment_score") != score:
+                    review = dict(review, sentiment_score=score, sentiment=sentiment_label_for(score))
+                    changed = True
+                reviews.append(review)
+            if changed:
+                get_write_buffer("BeautyPlaces").add(
+                    UpdateOne({"_id": doc["_id"]}, {"$set": {"google_reviews": reviews}}),
+                    label=str(doc["_id"])
+                )
+                updated += 1
+    
+    logger.info(f"Rescoring du sentiment des avis ({workers} processus)")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        chunk = []
+        for doc in collection.find({"google_reviews.0": {"$exists": True}}, {"google_reviews": 1}):
+            chunk.append(doc)
+            if len(chunk) >= SENTIMENT_RESCORE_CHUNK:
+                rescore_chunk(chunk, executor)
+                chunk = []
+        if chunk:
+            rescore_chunk(chunk, executor)
+    
+    flush_write_buffers()
+    logger.info(f"Rescoring terminé: {scored} avis notés, {updated} lieux mis à jour ({sentiment_engine.stats})")
+    return updated
+
+# Nombre de lieux traités par chaque niveau de la cascade d'analyse
+CASCADE_STATS = {"keywords": 0, "llm": 0, "llm_failed": 0, "test": 0}
+CASCADE_STATS_LOCK = threading.Lock()
+
+def record_cascade_tier(tier):
+    with CASCADE_STATS_LOCK:
+        CASCADE_STATS[tier] += 1
+
+def log_cascade_stats():
+    with CASCADE_STATS_LOCK:
+        total = sum(CASCADE_STATS.values())
+        if total:
+            details = ", ".join(f"{tier}: {count}" for tier, count in CASCADE_STATS.items())
+            logger.info(f"Cascade d'analyse sur {total} lieux - {details}")
+
+def scoring_confidence(reviews, keyword_analysis, place_rating=None):
+    """
+    Confiance dans la notation par mots-clés, à partir des signaux rapides.
+    
+    Combine le volume d'avis, la dispersion des notes étoilées et l'accord entre
+    les étoiles (ou la note Google du lieu) et le sentiment lexical.
+    
+    Returns:
+        tuple: (confiance dans [0, 1], couverture des critères dans [0, 1])
+    """
+    analyse = keyword_analysis["analyse"]
+    coverage = sum(1 for data in analyse.values() if data.get("mentions")) / len(analyse) if analyse else 0.0
+    
+    texts = [review for review in reviews if (review.get("text") if isinstance(review, dict) else review)]
+    confidence = min(1.0, len(texts) / CASCADE_MIN_REVIEWS)
+    
+    ratings = [float(review["rating"]) for review in reviews if isinstance(review, dict) and review.get("rating")]
+    if len(ratings) >= 2:
+        mean = sum(ratings) / len(ratings)
+        spread = math.sqrt(sum((rating - mean) ** 2 for rating in ratings) / len(ratings))
+        confidence *= max(0.0, 1 - spread / 2)
+    
+    if ratings:
+        star_signal = (sum(ratings) / len(ratings) - 3) / 2
+    elif place_rating:
+        star_signal = (float(place_rating) - 3) / 2
+    else:
+        star_signal = None
+    if star_signal is not None:
+        # Le texte seul: sentiment_score reprend déjà les étoiles et serait toujours d'accord avec elles
+        text_signal = keyword_analysis.get("lexical_score", keyword_analysis.get("sentiment_score", 0))
+        confidence *= 1 - min(1.0, abs(star_signal - text_signal)) / 2
+    
+    return round(confidence, 3), round(coverage, 3)
+
+def route_analysis(reviews, category, place_rating=None, place_name=""):
+    """
+    Cascade d'analyse: les notes par mots-clés sont retenues si la confiance et la
+    couverture atteignent CASCADE_MIN_CONFIDENCE et CASCADE_MIN_COVERAGE, sinon
+    l'analyse passe au LLM (analyze_reviews_with_mistral). Si le LLM échoue, les
+    notes par mots-clés sont conservées.
+    """
+    keyword_analysis = run_cpu_stage("keywords", score_keywords, reviews, category)
+    confidence, coverage = scoring_confidence(reviews, keyword_analysis, place_rating)
+    keyword_analysis.update({"confidence": confidence, "coverage": coverage})
+    
+    if confidence >= CASCADE_MIN_CONFIDENCE and coverage >= CASCADE_MIN_COVERAGE:
+        logger.info(f"Notation par mots-clés pour {place_name} (confiance {confidence}, couverture {coverage})")
+        record_cascade_tier("keywords")
+        keyword_analysis["tier"] = "keywords"
+        return keyword_analysis
+    
+    logger.info(f"Analyse avec {ANALYSIS_MODEL_NAME} pour {place_name} (catégorie: {category}, confiance {confidence}, couverture {coverage})")
+    analysis = analyze_reviews_with_mistral(reviews, category)
+    if not analysis:
+        logger.warning(f"Échec de l'analyse LLM pour {place_name}, notes par mots-clés conservées")
+        record_cascade_tier("llm_failed")
+        keyword_analysis["tier"] = "llm_failed"
+        return keyword_analysis
+    
+    record_cascade_tier("llm")
+    return dict(analysis, tier="llm", confidence=confidence, coverage=coverage)
 
-def simple_analysis_fallback(reviews, criteria):
+def simple_analysis_fallback(reviews, criteria, category=None):
     """
-    Analyse de secours simplifiée qui retourne uniquement les notes
+    Analyse de secours sans modèle: notes par critère calculées par keyword_scorer
+    quand la catégorie est connue, sinon notes uniformes selon le sentiment général.
     """
+    if category is None:
+        category = next((name for name, data in CATEGORIES.items() if data["criteres_evaluation"] == list(criteria)), None)
+    if category in MOTS_CLES:
+        return run_cpu_stage("keywords", score_keywords, reviews, category, criteria)
+    
     results = {"analyse": {}}
     
     # Initialiser tous les critères avec une note de base
@@ -1042,16 +3475,212 @@ def simple_analysis_fallback(reviews, criteria):
     
     return results
 
+class BulkWriteBuffer:
+    """
+    Tampon d'écritures différées pour une collection MongoDB.
+    
+    Les opérations sont regroupées en bulk_write non ordonnés, envoyés dès que
+    WRITE_BUFFER_MAX_OPS opérations sont en attente, toutes les
+    WRITE_BUFFER_MAX_DELAY secondes, ou à l'arrêt du script. Le résultat des
+    opérations ajoutées avec track=True est conservé par libellé, quel que soit
+    l'envoi (thread de fond ou appelant) qui les a écrites, jusqu'à pop_outcomes.
+    Un lot perdu en entier (réseau, serveur) est remis en tête du tampon et
+    renvoyé avec un backoff exponentiel, au plus WRITE_BUFFER_MAX_RETRIES fois.
+    """
+    
+    def __init__(self, collection, max_ops=None, max_delay=None):
+        self.collection = collection
+        self.max_ops = max_ops or WRITE_BUFFER_MAX_OPS
+        self.max_delay = max_delay or WRITE_BUFFER_MAX_DELAY
+        self.stats = {"flushes": 0, "upserted": 0, "matched": 0, "modified": 0, "errors": 0}
+        self._ops = []
+        self._outcomes = {}  # libellé suivi -> True (écrit) / False (échec)
+        self._attempts = 0  # Envois perdus consécutifs du lot en tête du tampon
+        self._retry_at = None  # Instant (time.monotonic) de la prochaine tentative après un lot perdu
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=f"bulk_{collection.name}", daemon=True)
+        self._thread.start()
+    
+    def add(self, operation, label=None, track=False):
+        """
+        Ajoute une opération (UpdateOne, InsertOne...) au tampon.
+        
+        Args:
+            operation: Opération pymongo
+            label: Libellé de l'opération (journaux d'erreur, suivi)
+            track: Conserver le résultat de l'opération pour pop_outcomes(label)
+        """
+        with self._lock:
+            self._ops.append((operation, label, track))
+            full = len(self._ops) >= self.max_ops
+        if full:
+            # Envoi par le thread de fond: une erreur d'écriture ne remonte pas chez l'appelant
+            self._wake.set()
+    
+    def _run(self):
+        while not self._stopped:
+            with self._lock:
+                retry_at = self._retry_at
+            self._wake.wait(self.max_delay if retry_at is None else max(0, retry_at - time.monotonic()))
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Erreur lors de l'écriture groupée dans {self.collection.name}: {e}")
+    
+    def _record_outcomes(self, batch, failed_indexes):
+        """Mémorise le résultat des opérations suivies et retourne (libellés écrits, libellés en échec)."""
+        succeeded, failed = [], []
+        with self._lock:
+            for index, (_, label, track) in enumerate(batch):
+                ok = index not in failed_indexes
+                (succeeded if ok else failed).append(label)
+                if track:
+                    self._outcomes.pop(label, None)
+                    self._outcomes[label] = ok
+            # Résultats jamais réclamés: les plus anciens sont oubliés
+            while len(self._outcomes) > WRITE_BUFFER_MAX_TRACKED:
+                del self._outcomes[next(iter(self._outcomes))]
+        return succeeded, failed
+    
+    def flush(self):
+        """
+        Envoie les opérations en attente.
+        
+        Returns:
+            tuple: (libellés écrits, libellés en échec) des opérations de cet envoi
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._retry_at is not None and time.monotonic() < self._retry_at:
+                    return [], []
+                batch, self._ops = self._ops, []
+            if not batch:
+                return [], []
+            
+            try:
+                result = self.collection.bulk_write([operation for operation, _, _ in batch], ordered=False)
+            except BulkWriteError as e:
+                # Les opérations valides du lot sont appliquées; journaliser celles en échec
+                details = e.details
+                for error in details.get("writeErrors", []):
+                    label = batch[error["index"]][1] or f"opération {error['index']}"
+                    logger.error(f"Échec d'écriture dans {self.collection.name} pour {label}: {error.get('errmsg')}")
+                self.stats["errors"] += len(details.get("writeErrors", []))
+                self.stats["upserted"] += details.get("nUpserted", 0)
+                self.stats["matched"] += details.get("nMatched", 0)
+                self.stats["modified"] += details.get("nModified", 0)
+                return self._record_outcomes(batch, {error["index"] for error in details.get("writeErrors", [])})
+            except Exception as e:
+                # Lot perdu (réseau, serveur): le remettre en tête du tampon pour une nouvelle tentative
+                with self._lock:
+                    self._attempts += 1
+                    if self._attempts <= WRITE_BUFFER_MAX_RETRIES:
+                        delay = WRITE_BUFFER_RETRY_BASE * (2 ** (self._attempts - 1))
+                        self._retry_at = time.monotonic() + delay
+                        self._ops[:0] = batch
+                        logger.warning(f"Écriture groupée {self.collection.name} perdue ({e}), "
+                                       f"nouvelle tentative {self._attempts}/{WRITE_BUFFER_MAX_RETRIES} dans {delay}s")
+                        return [], []
+                    self._attempts, self._retry_at = 0, None
+                # Tentatives épuisées: toutes les opérations du lot sont en échec
+                logger.error(f"Écriture groupée {self.collection.name} abandonnée après "
+                             f"{WRITE_BUFFER_MAX_RETRIES} nouvelles tentatives: {len(batch)} opérations perdues ({e})")
+                self.stats["errors"] += len(batch)
+                return self._record_outcomes(batch, set(range(len(batch))))
+            
+            with self._lock:
+                self._attempts, self._retry_at = 0, None
+            self.stats["flushes"] += 1
+            self.stats["upserted"] += result.upserted_count
+            self.stats["matched"] += result.matched_count
+            self.stats["modified"] += result.modified_count
+            logger.info(f"Écriture groupée {self.collection.name}: {len(batch)} opérations "
+                        f"({result.upserted_count} insérées, {result.matched_count} mises à jour)")
+            return self._record_outcomes(batch, set())
+    
+    def pop_outcomes(self, labels):
+        """
+        Retire et retourne le résultat des opérations suivies (track=True) de ces libellés.
+        
+        Returns:
+            tuple: (libellés écrits, libellés en échec); un libellé pas encore envoyé n'apparaît dans aucun
+        """
+        succeeded, failed = [], []
+        with self._lock:
+            for label in labels:
+                if label in self._outcomes:
+                    (succeeded if self._outcomes.pop(label) else failed).append(label)
+        return succeeded, failed
+    
+    def drain(self):
+        """
+        Envoie les opérations en attente, en attendant au besoin la fin des nouvelles tentatives.
+        
+        Returns:
+            tuple: (libellés écrits, libellés en échec) des opérations envoyées par cet appel
+        """
+        succeeded, failed = [], []
+        while True:
+            written, lost = self.flush()
+            succeeded += written
+            failed += lost
+            with self._lock:
+                retry_at = self._retry_at
+            if retry_at is None:
+                return succeeded, failed
+            time.sleep(max(0, retry_at - time.monotonic()))
+    
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        self.drain()
+
+_write_buffers = {}
+_write_buffers_lock = threading.Lock()
+
+def get_write_buffer(collection_name):
+    """Retourne le tampon d'écritures partagé d'une collection (vidé automatiquement à l'arrêt)."""
+    with _write_buffers_lock:
+        if collection_name not in _write_buffers:
+            buffer = BulkWriteBuffer(db[collection_name])
+            _write_buffers[collection_name] = buffer
+            atexit.register(buffer.close)
+        return _write_buffers[collection_name]
+
+def flush_write_buffers():
+    """
+    Force l'envoi de toutes les écritures en attente (nouvelles tentatives des lots perdus comprises).
+    
+    Returns:
+        dict: Par collection, (libellés écrits, libellés en échec) des opérations envoyées par cet appel
+              (les opérations déjà envoyées par le thread de fond: voir BulkWriteBuffer.pop_outcomes)
+    """
+    outcomes = {}
+    for name, buffer in list(_write_buffers.items()):
+        try:
+            outcomes[name] = buffer.drain()
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture groupée dans {name}: {e}")
+            outcomes[name] = ([], [])
+    return outcomes
+
 def save_to_mongo(place):
     """
     Sauvegarde les lieux et leurs analyses dans MongoDB 
     avec une structure compatible avec billetreduc_shotgun_mistral.py
     
+    L'upsert est placé dans le tampon d'écritures de BeautyPlaces et envoyé
+    par lots (voir BulkWriteBuffer); creation_date n'est écrite qu'à l'insertion.
+    
     Args:
         place: Dictionnaire avec les données du lieu
         
     Returns:
-        bool: True si sauvegarde réussie, False sinon
+        bool: True si l'écriture a été mise en file, False sinon
     """
     # Vérifier si on est en mode test (pour log spécifique)
     is_test_mode = '--test' in sys.argv
@@ -1064,15 +3693,6 @@ def save_to_mongo(place):
     place_id = place.get("place_id")
     place_name = place.get("name", "Établissement inconnu")
     
-    # Vérifier la connexion à MongoDB
-    try:
-        # Ping pour vérifier la connexion
-        client.admin.command('ping')
-        logger.debug(f"Connexion MongoDB OK pour {place_name}")
-    except Exception as e:
-        logger.error(f"Erreur de connexion à MongoDB: {e}")
-        return False
-    
     try:
         # Structure de données compatible avec billetreduc_shotgun_mistral.py
         structured_data = {
@@ -1087,6 +3707,8 @@ def save_to_mongo(place):
             "rating": place.get("rating"),
             "user_ratings_total": place.get("user_ratings_total"),
             "google_type": place.get("google_type", ""),
+            "google_types": place.get("google_types", []),
+            "categories": place.get("categories", [place.get("category", "")]),
             
             # Sources des données
             "tripadvisor_url": place.get("tripadvisor_url", ""),
@@ -1105,8 +3727,9 @@ def save_to_mongo(place):
             "website": place.get("website", ""),
             "phone": place.get("phone", ""),
             
-            # Commentaires
+            # Commentaires (textes) et avis Google Maps notés
             "comments": place.get("comments", []),
+            "google_reviews": place.get("google_reviews", []),
             
             # Images
             "photos": [],  # Sera rempli ci-dessous
@@ -1163,120 +3786,616 @@ def save_to_mongo(place):
             logger.warning(f"Score moyen manquant pour {place_name}, ajout d'un score par défaut")
             structured_data["average_score"] = 2.5
         
-        # Mise à jour ou insertion dans la collection
-        # D'abord vérifier si le document existe déjà
-        existing = db.BeautyPlaces.find_one({"place_id": place_id})
+        # Upsert groupé: creation_date n'est posée qu'à l'insertion
+        set_on_insert = {"creation_date": structured_data.pop("creation_date")}
         
-        if existing:
-            # Si le document existe, préserver la date de création
-            structured_data["creation_date"] = existing.get("creation_date", datetime.now())
-            
-            # Préserver les notes existantes si aucune nouvelle note
-            if not structured_data["notes"] and "notes" in existing:
-                structured_data["notes"] = existing["notes"]
-                
-                # Recalculer le score moyen si nécessaire
-                notes = [note for note in structured_data["notes"].values() if note > 0]
-                if notes:
-                    structured_data["average_score"] = round(sum(notes) / len(notes), 1)
-            
-            # Mise à jour
-            result = db.BeautyPlaces.update_one(
-                {"place_id": place_id}, 
-                {"$set": structured_data}
-            )
-            
-            if is_test_mode:
-                logger.info(f"[TEST] Établissement mis à jour dans MongoDB: {place_name} (matched: {result.matched_count}, modified: {result.modified_count})")
-            else:
-                logger.info(f"Établissement mis à jour dans MongoDB: {place_name} (matched: {result.matched_count})")
-        else:
-            # Insertion nouvelle
-            result = db.BeautyPlaces.insert_one(structured_data)
-            if is_test_mode:
-                logger.info(f"[TEST] Nouvel établissement ajouté dans MongoDB: {place_name} (id: {result.inserted_id})")
-            else:
-                logger.info(f"Nouvel établissement ajouté dans MongoDB: {place_name} (id: {result.inserted_id})")
+        # Sans nouvelles notes, conserver celles déjà en base (et le score associé)
+        if not structured_data["notes"]:
+            set_on_insert["notes"] = structured_data.pop("notes")
+            set_on_insert["average_score"] = structured_data.pop("average_score")
         
-        # Vérification après sauvegarde
-        saved_document = db.BeautyPlaces.find_one({"place_id": place_id})
-        if saved_document:
-            if is_test_mode:
-                logger.info(f"[TEST] Vérification : établissement {place_name} correctement sauvegardé avec {len(saved_document.get('comments', []))} commentaires et {len(saved_document.get('photos', []))} photos, score moyen: {saved_document.get('average_score')}")
-            else:
-                logger.info(f"Vérification : établissement {place_name} correctement sauvegardé avec {len(saved_document.get('comments', []))} commentaires et {len(saved_document.get('photos', []))} photos")
-                
-            # En mode test, vérifier également que les notes sont bien là
-            if is_test_mode:
-                notes = saved_document.get("notes", {})
-                logger.info(f"[TEST] Vérification notes: {len(notes)} critères évalués pour {place_name}")
+        get_write_buffer("BeautyPlaces").add(
+            UpdateOne(
+                {"place_id": place_id},
+                {"$set": structured_data, "$setOnInsert": set_on_insert},
+                upsert=True
+            ),
+            label=place_id, track=True
+        )
+        
+        if is_test_mode:
+            logger.info(f"[TEST] Établissement {place_name} mis en file d'écriture: {len(structured_data.get('comments', []))} commentaires, {len(structured_data.get('photos', []))} photos")
         else:
-            logger.error(f"Échec de vérification après sauvegarde pour {place_name} - Document non trouvé!")
+            logger.info(f"Établissement {place_name} mis en file d'écriture MongoDB")
+        
+        return True
+    except Exception as e:
+        logger.error(f"Erreur lors de la sauvegarde dans MongoDB pour {place_name}: {str(e)}")
+        
+        # En mode test, afficher une trace plus détaillée
+        if is_test_mode:
+            import traceback
+            logger.error(f"[TEST] Trace d'erreur détaillée: {traceback.format_exc()}")
+        
+        return False
+
+class ScrapeJournal:
+    """
+    Journal d'avancement par lieu d'un passage de scrape_all_zones (collection ScrapeJournal).
+    
+    Chaque lieu franchit les étapes discovered, fetched, analysed puis saved.
+    Les écritures passent par le tampon d'écritures (BulkWriteBuffer) et sont
+    idempotentes: stage_rank ne fait que croître ($max), l'heure de chaque étape
+    est conservée dans stages. Après un arrêt, les lieux découverts mais non
+    enregistrés sont repris sans nouvelle découverte; les détails et analyses
+    déjà obtenus sont relus depuis leurs caches, sans nouvel appel payant.
+    """
+    
+    STAGES = ("discovered", "fetched", "analysed", "saved")
+    
+    def __init__(self, run):
+        self.run = run
+        self.collection = db.ScrapeJournal
+        self.buffer = get_write_buffer("ScrapeJournal")
+    
+    def record(self, place_id, stage, **fields):
+        """Enregistre qu'un lieu a atteint une étape (champs supplémentaires: place, zone_id, outcome...)."""
+        now = datetime.now()
+        self.buffer.add(UpdateOne(
+            {"run": self.run, "place_id": place_id},
+            {"$set": dict(fields, **{f"stages.{stage}": now, "updated_at": now}),
+             "$max": {"stage_rank": self.STAGES.index(stage)}},
+            upsert=True
+        ), label=f"journal {place_id}")
+    
+    def saved_ids(self, place_ids):
+        """Parmi place_ids, ceux déjà enregistrés pendant ce passage."""
+        return {doc["place_id"] for doc in self.collection.find(
+            {"run": self.run, "place_id": {"$in": list(place_ids)}, "stage_rank": self.STAGES.index("saved")},
+            {"place_id": 1, "_id": 0}
+        )}
+    
+    def pending_places(self):
+        """Lieux découverts mais pas encore enregistrés, avec leur étape atteinte."""
+        pending = []
+        for doc in self.collection.find({"run": self.run, "stage_rank": {"$lt": self.STAGES.index("saved")}, "place": {"$exists": True}}):
+            pending.append((doc["place"], self.STAGES[doc.get("stage_rank", 0)]))
+        return pending
+    
+    def flush(self):
+        self.buffer.flush()
+    
+    def reset(self):
+        """Efface le journal pour commencer un nouveau passage."""
+        self.flush()
+        return self.collection.delete_many({"run": self.run}).deleted_count
+
+# Journal du passage de scrape_all_zones en cours (None hors scrape_all_zones)
+_scrape_journal = None
+
+def journal_stage(place_id, stage, **fields):
+    """Enregistre une étape dans le journal du passage en cours, s'il y en a un."""
+    if _scrape_journal is not None:
+        _scrape_journal.record(place_id, stage, **fields)
+
+async def process_places_async(places, concurrency=None):
+    """
+    Traite plusieurs lieux en parallèle avec une limite de concurrence.
+    
+    Chaque lieu passe par process_place (et donc save_to_mongo) exactement comme
+    en mode séquentiel; seule l'orchestration change. Le temps total d'une zone
+    est ainsi borné par le lieu le plus lent plutôt que par la somme des lieux.
+    
+    Args:
+        places: Liste des lieux à traiter
+        concurrency: Nombre maximum de lieux traités simultanément (CONCURRENCY par défaut)
+        
+    Returns:
+        list: Lieux traités avec succès, dans l'ordre d'entrée
+    """
+    concurrency = max(1, concurrency or CONCURRENCY)
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="place_worker")
+    
+    async def worker(index, place):
+        async with semaphore:
+            logger.info(f"[{index+1}/{len(places)}] Traitement de: {place['name']} ({place.get('sous_categorie', '')})")
+            try:
+                return await loop.run_in_executor(executor, process_place, place)
+            except Exception as e:
+                logger.error(f"Erreur lors du traitement concurrent de {place.get('name')}: {e}")
+                return None
+    
+    try:
+        results = await asyncio.gather(*(worker(i, place) for i, place in enumerate(places)))
+    finally:
+        executor.shutdown(wait=True)
+    
+    return [result for result in results if result]
+
+def process_places(places, concurrency=None):
+    """
+    Point d'entrée synchrone pour traiter une liste de lieux.
+    
+    Args:
+        places: Liste des lieux à traiter
+        concurrency: Nombre de lieux traités simultanément (CONCURRENCY par défaut)
+        
+    Returns:
+        list: Lieux traités avec succès
+    """
+    concurrency = concurrency or CONCURRENCY
+    if not places:
+        return []
+    
+    if concurrency <= 1:
+        # Mode séquentiel historique
+        processed_places = []
+        for place in places:
+            logger.info(f"Traitement de: {place['name']} ({place.get('sous_categorie', '')})")
+            processed_place = process_place(place)
+            if processed_place:
+                processed_places.append(processed_place)
+    else:
+        logger.info(f"Traitement concurrent de {len(places)} lieux (concurrence: {concurrency})")
+        processed_places = asyncio.run(process_places_async(places, concurrency))
+    
+    # Envoyer les écritures du lot avant que l'appelant ne relise la base
+    flush_write_buffers()
+    
+    # Résultat des écritures du lot, quel que soit l'envoi (thread de fond ou ci-dessus) qui les a faites
+    saved_ids, failed_ids = get_write_buffer("BeautyPlaces").pop_outcomes(
+        [processed_place["place_id"] for processed_place in processed_places]
+    )
+    if len(saved_ids) < len(processed_places):
+        logger.warning(f"{len(processed_places) - len(saved_ids)} lieux traités mais non enregistrés "
+                       f"({len(failed_ids)} écritures en échec)")
+    
+    # Journal: seuls les lieux effectivement écrits sont marqués enregistrés, les autres seront repris
+    if _scrape_journal is not None:
+        for place_id in saved_ids:
+            journal_stage(place_id, "saved", outcome="saved")
+        _scrape_journal.flush()
+    
+    log_cascade_stats()
+    log_cpu_stage_stats()
+    return processed_places
+
+def merge_duplicate_places(places):
+    """
+    Regroupe les lieux trouvés plusieurs fois (plusieurs catégories ou types) en
+    un seul enregistrement par place_id, qui cumule les google_types et les
+    catégories de tous ses exemplaires. La première occurrence fixe l'ordre et
+    la catégorie principale.
+    """
+    merged = {}
+    for place in places:
+        kept = merged.get(place["place_id"])
+        if kept is None:
+            kept = dict(place)
+            kept["google_types"] = list(place.get("google_types") or ([place["google_type"]] if place.get("google_type") else []))
+            kept["categories"] = list(place.get("categories") or ([place["category"]] if place.get("category") else []))
+            merged[place["place_id"]] = kept
+            continue
+        for type_name in place.get("google_types") or [place.get("google_type")]:
+            if type_name and type_name not in kept["google_types"]:
+                kept["google_types"].append(type_name)
+        for category_name in place.get("categories") or [place.get("category")]:
+            if category_name and category_name not in kept["categories"]:
+                kept["categories"].append(category_name)
+    return list(merged.values())
+
+def claim_unseen_places(places):
+    """
+    Retourne les lieux pas encore pris en charge pendant cette exécution et les
+    marque comme vus, pour que les zones qui se recouvrent ne les retraitent pas.
+    Les doublons de la liste sont fusionnés (voir merge_duplicate_places).
+    """
+    unseen = []
+    with SEEN_PLACE_IDS_LOCK:
+        for place in merge_duplicate_places(places):
+            if place["place_id"] not in SEEN_PLACE_IDS:
+                SEEN_PLACE_IDS.add(place["place_id"])
+                unseen.append(place)
+    return unseen
+
+def filter_recently_processed(places, days=PLACE_REFRESH_DAYS):
+    """
+    Écarte les lieux mis à jour depuis moins de `days` jours, en une seule requête.
+    
+    Args:
+        places: Liste des lieux candidats
+        days: Durée de fraîcheur en jours
+        
+    Returns:
+        list: Lieux à (re)traiter
+    """
+    if not places:
+        return []
+    
+    recent_ids = {
+        doc["place_id"] for doc in db.BeautyPlaces.find(
+            {"place_id": {"$in": [place["place_id"] for place in places]},
+             "last_updated": {"$gte": cache_cutoff(days)}},
+            {"place_id": 1, "last_updated": 1, "_id": 0}
+        )
+    }
+    
+    for place in places:
+        if place["place_id"] in recent_ids:
+            logger.info(f"Établissement {place['name']} déjà traité récemment, ignoré")
+    return [place for place in places if place["place_id"] not in recent_ids]
+
+def discover_zone_places(lat, lng, radius=5000, google_types=None):
+    """
+    Recherche les lieux de toutes les catégories autour d'un point.
+    
+    Args:
+        lat, lng: Centre de la zone
+        radius: Rayon de recherche en mètres
+        google_types: Types Google à interroger (tous ceux de CATEGORIES par défaut)
+        
+    Returns:
+        list: Lieux trouvés (un même lieu peut apparaître dans plusieurs catégories)
+    """
+    zone_places = []
+    for category_name, category_data in CATEGORIES.items():
+        category_types = [t for t in category_data["google_types"] if google_types is None or t in google_types]
+        if not category_types:
+            continue
+        
+        logger.info(f"Recherche des établissements de catégorie '{category_name}' à {lat},{lng}")
+        zone_places.extend(get_places_by_category(category_name, category_types, lat, lng, radius))
+    record_nearby_observations(zone_places)
+    return zone_places
+
+def record_nearby_observations(places):
+    """
+    Conserve sur les lieux déjà enregistrés la note et le nombre d'avis vus par
+    Nearby Search, pour que le rafraîchissement priorise les lieux qui ont changé.
+    """
+    buffer = get_write_buffer("BeautyPlaces")
+    now = datetime.now()
+    for place in places:
+        if place.get("user_ratings_total") is None and place.get("rating") is None:
+            continue
+        buffer.add(UpdateOne(
+            {"place_id": place["place_id"]},
+            {"$set": {"nearby_rating": place.get("rating"),
+                      "nearby_user_ratings_total": place.get("user_ratings_total"),
+                      "nearby_seen_at": now}}
+        ), label=f"nearby {place['place_id']}")
+
+def process_zone(lat, lng, radius=5000, google_types=None, zone_id=None):
+    """
+    Scrape les lieux pour une zone donnée et stocke en base de données.
+    
+    Args:
+        lat, lng: Centre de la zone
+        radius: Rayon de recherche en mètres
+        google_types: Types Google à interroger (tous ceux de CATEGORIES par défaut)
+        zone_id: Identifiant de la zone dans le plan de couverture (journal)
+    """
+    zone_places = discover_zone_places(lat, lng, radius, google_types)
+    
+    # Ignorer les lieux déjà vus pendant cette exécution puis ceux traités récemment
+    places_to_process = filter_recently_processed(claim_unseen_places(zone_places))
+    
+    # Reprise: ignorer les lieux déjà enregistrés pendant ce passage, journaliser les autres
+    if _scrape_journal is not None and places_to_process:
+        saved_ids = _scrape_journal.saved_ids(place["place_id"] for place in places_to_process)
+        places_to_process = [place for place in places_to_process if place["place_id"] not in saved_ids]
+        for place in places_to_process:
+            journal_stage(place["place_id"], "discovered", place=place, zone_id=zone_id)
+        _scrape_journal.flush()
+    logger.info(f"{len(places_to_process)}/{len(zone_places)} établissements à traiter dans la zone")
+    
+    process_places(places_to_process)
+
+def _point_in_ring(lng, lat, ring):
+    """Test point-dans-polygone (lancer de rayon) sur un anneau GeoJSON [[lng, lat], ...]."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat) and lng < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+def _segments_intersect(p1, p2, q1, q2):
+    def orientation(a, b, c):
+        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    d1, d2 = orientation(q1, q2, p1), orientation(q1, q2, p2)
+    d3, d4 = orientation(p1, p2, q1), orientation(p1, p2, q2)
+    return (d1 > 0) != (d2 > 0) and (d3 > 0) != (d4 > 0)
+
+def bbox_intersects_polygons(bbox, polygons):
+    """
+    Indique si une cellule (lat_min, lng_min, lat_max, lng_max) recoupe au moins
+    un des polygones (liste d'anneaux extérieurs GeoJSON). Sans polygone, toujours vrai.
+    """
+    if not polygons:
+        return True
+    lat_min, lng_min, lat_max, lng_max = bbox
+    corners = [(lng_min, lat_min), (lng_max, lat_min), (lng_max, lat_max), (lng_min, lat_max)]
+    edges = list(zip(corners, corners[1:] + corners[:1]))
+    for ring in polygons:
+        if any(_point_in_ring(lng, lat, ring) for lng, lat in corners):
+            return True
+        if any(lng_min <= p[0] <= lng_max and lat_min <= p[1] <= lat_max for p in ring):
+            return True
+        ring_edges = list(zip(ring, ring[1:]))
+        if any(_segments_intersect(a, b, c, d) for a, b in edges for c, d in ring_edges):
+            return True
+    return False
+
+def load_geojson_polygons(path):
+    """
+    Charge les anneaux extérieurs des Polygon/MultiPolygon d'un fichier GeoJSON
+    (géométrie, Feature ou FeatureCollection).
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    
+    geometries = []
+    if data.get("type") == "FeatureCollection":
+        geometries = [feature["geometry"] for feature in data.get("features", [])]
+    elif data.get("type") == "Feature":
+        geometries = [data["geometry"]]
+    else:
+        geometries = [data]
+    
+    polygons = []
+    for geometry in geometries:
+        if geometry["type"] == "Polygon":
+            polygons.append(geometry["coordinates"][0])
+        elif geometry["type"] == "MultiPolygon":
+            polygons.extend(polygon[0] for polygon in geometry["coordinates"])
+    if not polygons:
+        raise ValueError(f"Aucun polygone trouvé dans {path}")
+    return polygons
+
+def polygons_bbox(polygons):
+    points = [point for ring in polygons for point in ring]
+    return (min(p[1] for p in points), min(p[0] for p in points),
+            max(p[1] for p in points), max(p[0] for p in points))
+
+class CoveragePlanner:
+    """
+    Planifie la couverture d'une région (bbox ou polygones GeoJSON) pour Nearby Search.
+    
+    La région est découpée en cellules racines de COVERAGE_ROOT_CELL_DEG degrés,
+    chacune interrogée avec un rayon couvrant exactement la cellule. Une cellule
+    n'est subdivisée en quatre (quadtree) que pour les types dont toutes les pages
+    étaient pleines; une cellule vide pour un type lors de sa dernière interrogation
+    (last_queried, par type) n'est pas réinterrogée pendant COVERAGE_EMPTY_SKIP_DAYS.
+    Le plan est persisté dans la collection CoveragePlans et réutilisé tant qu'il a
+    moins de COVERAGE_PLAN_TTL_DAYS pour la même région et les mêmes types.
+    """
+    
+    def __init__(self, name, bbox=None, polygons=None):
+        self.name = name
+        self.polygons = polygons
+        self.bbox = tuple(bbox) if bbox else (polygons_bbox(polygons) if polygons else PARIS_BBOX)
+        self.previous = db.CoveragePlans.find_one({"name": name}) or {}
+        self.previous_cells = {cell["id"]: cell for cell in self.previous.get("cells", [])}
+        self.cells = []
+        self.api_cells = 0
+    
+    @staticmethod
+    def cell_geometry(bbox):
+        """Centre et rayon (m) du cercle circonscrit à une cellule."""
+        lat_min, lng_min, lat_max, lng_max = bbox
+        lat, lng = (lat_min + lat_max) / 2, (lng_min + lng_max) / 2
+        height = (lat_max - lat_min) * 111320
+        width = (lng_max - lng_min) * 111320 * math.cos(math.radians(lat))
+        return round(lat, 6), round(lng, 6), int(math.ceil(math.hypot(height, width) / 2))
+    
+    @staticmethod
+    def subdivide(bbox):
+        lat_min, lng_min, lat_max, lng_max = bbox
+        lat_mid, lng_mid = (lat_min + lat_max) / 2, (lng_min + lng_max) / 2
+        return [
+            (lat_min, lng_min, lat_mid, lng_mid),
+            (lat_min, lng_mid, lat_mid, lng_max),
+            (lat_mid, lng_min, lat_max, lng_mid),
+            (lat_mid, lng_mid, lat_max, lng_max),
+        ]
+    
+    def root_cells(self):
+        lat_min, lng_min, lat_max, lng_max = self.bbox
+        rows = max(1, math.ceil((lat_max - lat_min) / COVERAGE_ROOT_CELL_DEG))
+        cols = max(1, math.ceil((lng_max - lng_min) / COVERAGE_ROOT_CELL_DEG))
+        for i in range(rows):
+            for j in range(cols):
+                yield f"r{i}_{j}", (
+                    lat_min + i * COVERAGE_ROOT_CELL_DEG,
+                    lng_min + j * COVERAGE_ROOT_CELL_DEG,
+                    min(lat_max, lat_min + (i + 1) * COVERAGE_ROOT_CELL_DEG),
+                    min(lng_max, lng_min + (j + 1) * COVERAGE_ROOT_CELL_DEG),
+                )
+    
+    def _last_queried(self, cell_id, type_name):
+        """Date de la dernière interrogation réelle d'un type pour une cellule (None si jamais)."""
+        previous = self.previous_cells.get(cell_id)
+        if not previous:
+            return None
+        # Anciens plans: une seule date pour tous les types
+        return previous.get("last_queried", {}).get(type_name, previous.get("last_run"))
+    
+    def _recently_empty(self, cell_id, type_name):
+        previous = self.previous_cells.get(cell_id)
+        if not previous or previous.get("counts", {}).get(type_name) != 0:
             return False
+        last_queried = self._last_queried(cell_id, type_name)
+        return last_queried is not None and last_queried >= cache_cutoff(COVERAGE_EMPTY_SKIP_DAYS)
+    
+    def _explore(self, cell_id, bbox, google_types, depth, zones):
+        lat, lng, radius = self.cell_geometry(bbox)
+        skipped = [t for t in google_types if self._recently_empty(cell_id, t)]
+        to_query = [t for t in google_types if t not in skipped]
         
-        return True
-    except Exception as e:
-        logger.error(f"Erreur lors de la sauvegarde dans MongoDB pour {place_name}: {str(e)}")
+        # Les types sautés gardent la date de leur dernière interrogation: la fenêtre finit par expirer
+        counts = {t: 0 for t in skipped}
+        last_queried = {t: self._last_queried(cell_id, t) for t in skipped}
+        saturated = []
+        if to_query:
+            self.api_cells += 1
+            now = datetime.now()
+            for type_name, data in nearby_search(lat, lng, radius, to_query).items():
+                counts[type_name] = len(data["results"])
+                last_queried[type_name] = now
+                if data["saturated"] and depth < COVERAGE_MAX_DEPTH:
+                    saturated.append(type_name)
         
-        # En mode test, afficher une trace plus détaillée
-        if is_test_mode:
-            import traceback
-            logger.error(f"[TEST] Trace d'erreur détaillée: {traceback.format_exc()}")
+        self.cells.append({
+            "id": cell_id, "bbox": list(bbox), "depth": depth,
+            "counts": counts, "saturated": saturated, "last_queried": last_queried, "last_run": datetime.now()
+        })
         
-        return False
-
-def process_zone(lat, lng):
-    """Scrape les lieux pour une zone donnée et stocke en base de données."""
-    for category_name, category_data in CATEGORIES.items():
-        google_types = category_data["google_types"]
+        # Les types non saturés sont couverts par cette cellule; les autres par ses enfants
+        leaf_types = [t for t in to_query if counts[t] > 0 and t not in saturated]
+        if leaf_types:
+            zones.append({"id": cell_id, "lat": lat, "lng": lng, "radius": radius, "google_types": leaf_types})
         
-        logger.info(f"Recherche des établissements de catégorie '{category_name}' à {lat},{lng}")
-        places = get_places_by_category(category_name, google_types, lat, lng)
+        if saturated:
+            for index, child in enumerate(self.subdivide(bbox)):
+                if bbox_intersects_polygons(child, self.polygons):
+                    self._explore(f"{cell_id}{index}", child, saturated, depth + 1, zones)
+    
+    def _fresh_plan_zones(self, google_types):
+        """Zones du plan persisté s'il est récent et couvre la même région et les mêmes types."""
+        previous = self.previous
+        if not previous.get("zones") or previous.get("updated_at", datetime(2000, 1, 1)) < cache_cutoff(COVERAGE_PLAN_TTL_DAYS):
+            return None
+        if (previous.get("bbox") != list(self.bbox) or previous.get("polygons") != self.polygons
+                or sorted(previous.get("google_types", [])) != sorted(google_types)):
+            return None
+        return previous["zones"]
+    
+    def build(self, google_types, refresh=False):
+        """
+        Retourne le plan persisté s'il est encore frais, sinon le construit et le persiste.
         
-        for place in places:
-            # Vérifier si déjà traité récemment
-            existing = db.BeautyPlaces.find_one({"place_id": place["place_id"]})
-            if existing and (datetime.now() - existing.get("last_updated", datetime(2000, 1, 1))).days < 30:
-                logger.info(f"Établissement {place['name']} déjà traité récemment, ignoré")
-                continue
-                
-            logger.info(f"Traitement de: {place['name']} ({place['sous_categorie']})")
-            process_place(place)
+        Args:
+            google_types: Types Google à couvrir
+            refresh: Reconstruire le plan même s'il est frais
             
-            # Pause pour éviter les limitations d'API
-            time.sleep(2)
+        Returns:
+            list: Zones à traiter {id, lat, lng, radius, google_types}
+        """
+        google_types = list(google_types)
+        if not refresh:
+            zones = self._fresh_plan_zones(google_types)
+            if zones is not None:
+                logger.info(f"Plan de couverture '{self.name}' réutilisé: {len(zones)} zones "
+                            f"(mis à jour le {self.previous['updated_at']:%Y-%m-%d %H:%M})")
+                return zones
+        
+        zones = []
+        for cell_id, bbox in self.root_cells():
+            if bbox_intersects_polygons(bbox, self.polygons):
+                self._explore(cell_id, bbox, list(google_types), 0, zones)
+        
+        db.CoveragePlans.update_one(
+            {"name": self.name},
+            {"$set": {
+                "name": self.name,
+                "bbox": list(self.bbox),
+                "polygons": self.polygons,
+                "google_types": google_types,
+                "cells": self.cells,
+                "zones": zones,
+                "updated_at": datetime.now()
+            }},
+            upsert=True
+        )
+        logger.info(f"Plan de couverture '{self.name}': {len(zones)} zones, {len(self.cells)} cellules "
+                    f"dont {self.api_cells} interrogées")
+        return zones
 
-def scrape_all_zones():
-    """Divise Paris en zones et lance le scraping."""
-    lat_min, lat_max = 48.8156, 48.9022
-    lng_min, lng_max = 2.2242, 2.4699
-    step = 0.01  # Espacement de la grille (env. 1 km)
+def resume_zone_index(checkpoint):
+    """
+    Index de la prochaine zone à traiter d'après le checkpoint d'un passage en cours.
+    
+    Retourne None pour un ancien checkpoint sans liste de zones: ses index
+    (grille fixe de 0.01°) ne désignent rien dans le plan du CoveragePlanner,
+    le passage doit alors repartir de la première zone.
+    """
+    if not checkpoint.get("zones"):
+        return None
+    return min(checkpoint.get("next_zone_index", 0), len(checkpoint["zones"]))
+
+def scrape_all_zones(plan_name="paris", bbox=None, polygons=None):
+    """
+    Couvre une région (Paris par défaut) zone par zone et lance le scraping.
     
-    lat_points = [lat_min + i * step for i in range(int((lat_max - lat_min) / step) + 1)]
-    lng_points = [lng_min + i * step for i in range(int((lng_max - lng_min) / step) + 1)]
+    Les zones viennent du CoveragePlanner: leur taille s'adapte à la densité de
+    lieux et la pagination Nearby Search est suivie.
     
-    total_zones = len(lat_points) * len(lng_points)
-    logger.info(f"Scraping complet planifié sur {total_zones} zones au total")
+    Args:
+        plan_name: Nom du plan de couverture persisté dans CoveragePlans
+        bbox: (lat_min, lng_min, lat_max, lng_max) de la région
+        polygons: Anneaux GeoJSON délimitant la région (prioritaires sur bbox)
     
+    Le checkpoint stocke la liste de zones du passage et l'index de la prochaine
+    zone à traiter; le journal ScrapeJournal suit chaque lieu pour reprendre un
+    passage interrompu au milieu d'une zone sans refaire les lieux déjà enregistrés.
+    """
+    global _scrape_journal
     # Vérifier le dernier point traité
     checkpoint = db.Checkpoints.find_one({"name": "wellness_scraping"})
     start_idx = 0
     total_places_processed = 0
+    resuming = bool(checkpoint) and checkpoint.get("plan_name", plan_name) == plan_name and checkpoint.get("status") != "completed"
+    
+    # Un passage en cours garde sa liste de zones: un plan reconstruit (cache Nearby
+    # expiré) peut être découpé ou ordonné autrement
+    if resuming and checkpoint.get("zones"):
+        zones = checkpoint["zones"]
+        logger.info("Reprise sur la liste de zones du passage en cours")
+    else:
+        all_google_types = [t for category in CATEGORIES.values() for t in category["google_types"]]
+        zones = CoveragePlanner(plan_name, bbox=bbox, polygons=polygons).build(all_google_types)
+    
+    total_zones = len(zones)
+    logger.info(f"Scraping complet planifié sur {total_zones} zones au total")
+    
+    _scrape_journal = ScrapeJournal(plan_name)
+    new_pass = {"status": "running", "plan_name": plan_name, "zones": zones, "next_zone_index": 0,
+                "total_places_processed": 0, "start_time": datetime.now(), "last_updated": datetime.now()}
     
-    if checkpoint:
-        start_idx = checkpoint.get("zone_index", 0)
+    if checkpoint and checkpoint.get("plan_name", plan_name) != plan_name:
+        logger.info(f"Checkpoint d'un autre plan ({checkpoint.get('plan_name')}), reprise depuis la première zone")
+        _scrape_journal.reset()
+        db.Checkpoints.update_one({"name": "wellness_scraping"}, {"$set": new_pass, "$unset": {"last_zone_id": ""}})
+    elif checkpoint and checkpoint.get("status") == "completed":
+        logger.info("Passage précédent terminé, nouveau passage depuis la première zone")
+        _scrape_journal.reset()
+        db.Checkpoints.update_one({"name": "wellness_scraping"}, {"$set": new_pass, "$unset": {"last_zone_id": ""}})
+    elif checkpoint and resume_zone_index(checkpoint) is None:
+        logger.info("Ancien checkpoint sans liste de zones, nouveau passage depuis la première zone")
+        _scrape_journal.reset()
+        db.Checkpoints.update_one({"name": "wellness_scraping"}, {"$set": new_pass, "$unset": {"last_zone_id": ""}})
+    elif checkpoint:
+        start_idx = resume_zone_index(checkpoint)
         total_places_processed = checkpoint.get("total_places_processed", 0)
         logger.info(f"Reprise du scraping à partir de la zone {start_idx+1}/{total_zones}")
         logger.info(f"Places déjà traitées: {total_places_processed}")
+        
+        # Terminer d'abord les lieux interrompus (sans nouvelle découverte)
+        pending = _scrape_journal.pending_places()
+        if pending:
+            logger.info(f"Reprise de {len(pending)} lieux interrompus ("
+                        + ", ".join(f"{stage}: {sum(1 for _, s in pending if s == stage)}" for stage in ScrapeJournal.STAGES[:-1])
+                        + ")")
+            process_places(claim_unseen_places([place for place, _ in pending]))
     else:
         # Initialiser le checkpoint au démarrage
-        db.Checkpoints.insert_one({
-            "name": "wellness_scraping",
-            "zone_index": 0,
-            "total_places_processed": 0,
-            "start_time": datetime.now(),
-            "last_updated": datetime.now()
-        })
+        db.Checkpoints.insert_one(dict(new_pass, name="wellness_scraping"))
         logger.info("Nouveau checkpoint initialisé pour le scraping")
     
     # Compteurs pour les statistiques
@@ -1284,66 +4403,67 @@ def scrape_all_zones():
     places_this_session = 0
     session_start_time = datetime.now()
     
-    zone_index = 0
-    for lat_idx, lat in enumerate(lat_points):
-        for lng_idx, lng in enumerate(lng_points):
-            # Calculer l'index actuel de la zone
-            current_idx = lat_idx * len(lng_points) + lng_idx
-            
-            if current_idx < start_idx:
-                continue
-            
-            zone_count += 1
-            start_zone_time = datetime.now()
-            logger.info(f"Traitement de la zone {current_idx+1}/{total_zones} à {lat},{lng}")
-            
-            # Nombre de lieux dans cette zone
-            places_count_before = db.BeautyPlaces.count_documents({})
-            
-            # Traiter la zone
-            process_zone(lat, lng)
-            
-            # Compter combien de nouveaux lieux ont été ajoutés
-            places_count_after = db.BeautyPlaces.count_documents({})
-            places_added = places_count_after - places_count_before
-            places_this_session += places_added
-            total_places_processed += places_added
-            
-            # Calculer le temps pour cette zone
-            zone_duration = (datetime.now() - start_zone_time).total_seconds()
-            
-            # Mettre à jour le checkpoint avec des statistiques détaillées
-            db.Checkpoints.update_one(
-                {"name": "wellness_scraping"},
-                {"$set": {
-                    "zone_index": current_idx,
-                    "last_lat": lat,
-                    "last_lng": lng,
-                    "last_updated": datetime.now(),
-                    "total_places_processed": total_places_processed,
-                    "places_this_session": places_this_session,
-                    "zones_processed_this_session": zone_count,
-                    "last_zone_duration_seconds": zone_duration,
-                    "session_start_time": session_start_time
-                }},
-                upsert=True
-            )
-            
-            # Log détaillé après chaque zone
-            logger.info(f"Zone {current_idx+1}/{total_zones} terminée en {zone_duration:.1f} secondes")
-            logger.info(f"Lieux trouvés dans cette zone: {places_added}")
-            logger.info(f"Total des lieux traités: {total_places_processed}")
+    for current_idx, zone in enumerate(zones):
+        lat, lng = zone["lat"], zone["lng"]
+        
+        if current_idx < start_idx:
+            continue
+        
+        zone_count += 1
+        start_zone_time = datetime.now()
+        logger.info(f"Traitement de la zone {current_idx+1}/{total_zones} à {lat},{lng}")
+        
+        # Nombre de lieux dans cette zone
+        places_count_before = db.BeautyPlaces.count_documents({})
+        
+        # Traiter la zone
+        process_zone(lat, lng, zone["radius"], zone["google_types"], zone_id=zone["id"])
+        
+        # Compter combien de nouveaux lieux ont été ajoutés
+        places_count_after = db.BeautyPlaces.count_documents({})
+        places_added = places_count_after - places_count_before
+        places_this_session += places_added
+        total_places_processed += places_added
+        
+        # Calculer le temps pour cette zone
+        zone_duration = (datetime.now() - start_zone_time).total_seconds()
+        
+        # Mettre à jour le checkpoint avec des statistiques détaillées
+        db.Checkpoints.update_one(
+            {"name": "wellness_scraping"},
+            {"$set": {
+                "next_zone_index": current_idx + 1,
+                "plan_name": plan_name,
+                "last_zone_id": zone["id"],
+                "last_lat": lat,
+                "last_lng": lng,
+                "last_updated": datetime.now(),
+                "total_places_processed": total_places_processed,
+                "places_this_session": places_this_session,
+                "zones_processed_this_session": zone_count,
+                "last_zone_duration_seconds": zone_duration,
+                "session_start_time": session_start_time
+            }},
+            upsert=True
+        )
+        
+        # Log détaillé après chaque zone
+        logger.info(f"Zone {current_idx+1}/{total_zones} terminée en {zone_duration:.1f} secondes")
+        logger.info(f"Lieux trouvés dans cette zone: {places_added}")
+        logger.info(f"Total des lieux traités: {total_places_processed}")
+        
+        # Estimer le temps restant
+        if zone_count > 0:
+            avg_time_per_zone = (datetime.now() - session_start_time).total_seconds() / zone_count
+            zones_remaining = total_zones - current_idx - 1
+            est_time_remaining = zones_remaining * avg_time_per_zone
+            est_completion_time = datetime.now() + timedelta(seconds=est_time_remaining)
             
-            # Estimer le temps restant
-            if zone_count > 0:
-                avg_time_per_zone = (datetime.now() - session_start_time).total_seconds() / zone_count
-                zones_remaining = total_zones - current_idx - 1
-                est_time_remaining = zones_remaining * avg_time_per_zone
-                est_completion_time = datetime.now() + timedelta(seconds=est_time_remaining)
-                
-                logger.info(f"Temps moyen par zone: {avg_time_per_zone:.1f} secondes")
-                logger.info(f"Temps restant estimé: {est_time_remaining/3600:.1f} heures")
-                logger.info(f"Date de fin estimée: {est_completion_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info(f"Temps moyen par zone: {avg_time_per_zone:.1f} secondes")
+            logger.info(f"Temps restant estimé: {est_time_remaining/3600:.1f} heures")
+            logger.info(f"Date de fin estimée: {est_completion_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    _scrape_journal = None
     
     # Marquer comme terminé
     db.Checkpoints.update_one(
@@ -1359,6 +4479,504 @@ def scrape_all_zones():
     logger.info(f"Scraping terminé! {total_places_processed} lieux au total ont été traités.")
     return total_places_processed
 
+class WorkQueue:
+    """
+    File de jobs partagée par plusieurs workers (collection ScrapeJobs).
+    
+    Un job est une zone du plan de couverture ou un lieu découvert dans une
+    zone. Les workers prennent un job de façon atomique (find_one_and_update)
+    avec un bail renouvelé tant qu'ils y travaillent: si un worker meurt, son
+    bail expire et le job est repris ailleurs, au plus QUEUE_MAX_ATTEMPTS fois.
+    Les lieux passent avant les zones pour finir ce qui est déjà découvert.
+    """
+    
+    PRIORITIES = {"place": 0, "zone": 1}
+    
+    def __init__(self, name):
+        self.name = name
+        self.collection = db.ScrapeJobs
+    
+    def _job_id(self, kind, key):
+        return f"{self.name}:{kind}:{key}"
+    
+    def _upsert_jobs(self, kind, payloads, key_field, reset=False):
+        """Crée les jobs absents; avec reset, remet aussi les jobs existants en attente."""
+        now = datetime.now()
+        operations = []
+        for payload in payloads:
+            fresh = {"status": "pending", "attempts": 0, "lease_owner": None,
+                     "lease_expires_at": None, "last_error": None, "created_at": now}
+            if reset:
+                update = {"$set": dict(fresh, payload=payload, updated_at=now),
+                          "$setOnInsert": {"queue": self.name, "kind": kind, "priority": self.PRIORITIES[kind]}}
+            else:
+                update = {"$setOnInsert": dict(fresh, queue=self.name, kind=kind, priority=self.PRIORITIES[kind],
+                                               payload=payload, updated_at=now)}
+            operations.append(UpdateOne({"_id": self._job_id(kind, payload[key_field])}, update, upsert=True))
+        if not operations:
+            return 0
+        return self.collection.bulk_write(operations, ordered=False).upserted_count
+    
+    def seed_zones(self, zones, reset=False):
+        """Ajoute les zones du plan; reset relance aussi les zones et supprime les lieux du passage précédent."""
+        if reset:
+            self.collection.delete_many({"queue": self.name, "kind": "place"})
+        return self._upsert_jobs("zone", zones, "id", reset=reset)
+    
+    def enqueue_places(self, places):
+        """Ajoute des jobs de lieu; un lieu déjà présent dans la file (zones voisines) n'est pas dupliqué."""
+        return self._upsert_jobs("place", places, "place_id")
+    
+    def claim(self, worker_id):
+        """Prend le job le plus prioritaire en attente ou dont le bail a expiré."""
+        now = datetime.now()
+        return self.collection.find_one_and_update(
+            {"queue": self.name, "attempts": {"$lt": QUEUE_MAX_ATTEMPTS},
+             "$or": [{"status": "pending"}, {"status": "leased", "lease_expires_at": {"$lt": now}}]},
+            {"$set": {"status": "leased", "lease_owner": worker_id, "updated_at": now,
+                      "lease_expires_at": now + timedelta(seconds=QUEUE_LEASE_SECONDS)},
+             "$inc": {"attempts": 1}},
+            sort=[("priority", ASCENDING), ("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    def renew(self, job_ids, worker_id):
+        """Prolonge les baux encore détenus par ce worker."""
+        if not job_ids:
+            return 0
+        return self.collection.update_many(
+            {"_id": {"$in": list(job_ids)}, "status": "leased", "lease_owner": worker_id},
+            {"$set": {"lease_expires_at": datetime.now() + timedelta(seconds=QUEUE_LEASE_SECONDS)}}
+        ).modified_count
+    
+    def complete(self, job, worker_id, outcome="done"):
+        """Marque le job terminé; False si le bail a été perdu entre-temps."""
+        result = self.collection.update_one(
+            {"_id": job["_id"], "status": "leased", "lease_owner": worker_id},
+            {"$set": {"status": "done", "outcome": outcome, "lease_expires_at": None, "updated_at": datetime.now()}}
+        )
+        return result.modified_count == 1
+    
+    def fail(self, job, worker_id, error):
+        """Rend le job aux autres workers, ou le marque en échec après QUEUE_MAX_ATTEMPTS tentatives."""
+        status = "failed" if job.get("attempts", 0) >= QUEUE_MAX_ATTEMPTS else "pending"
+        self.collection.update_one(
+            {"_id": job["_id"], "status": "leased", "lease_owner": worker_id},
+            {"$set": {"status": status, "last_error": str(error)[:500], "lease_owner": None,
+                      "lease_expires_at": None, "updated_at": datetime.now()}}
+        )
+        return status
+    
+    def sweep_expired(self):
+        """Marque en échec les jobs abandonnés (bail expiré) qui ont épuisé leurs tentatives."""
+        return self.collection.update_many(
+            {"queue": self.name, "status": "leased", "lease_expires_at": {"$lt": datetime.now()},
+             "attempts": {"$gte": QUEUE_MAX_ATTEMPTS}},
+            {"$set": {"status": "failed", "last_error": "bail expiré", "lease_owner": None, "updated_at": datetime.now()}}
+        ).modified_count
+    
+    def has_open_jobs(self):
+        """True tant qu'il reste des jobs en attente ou en cours."""
+        return self.collection.count_documents({"queue": self.name, "status": {"$in": ["pending", "leased"]}}, limit=1) > 0
+    
+    def counts(self):
+        """Nombre de jobs par (type, statut)."""
+        return {
+            (row["_id"]["kind"], row["_id"]["status"]): row["count"]
+            for row in self.collection.aggregate([
+                {"$match": {"queue": self.name}},
+                {"$group": {"_id": {"kind": "$kind", "status": "$status"}, "count": {"$sum": 1}}}
+            ])
+        }
+
+def seed_work_queue(plan_name="paris", bbox=None, polygons=None, reset=False):
+    """
+    Coordinateur: remplit la file avec les zones du plan de couverture.
+    
+    Args:
+        plan_name: Nom du plan de couverture (et de la file)
+        bbox, polygons: Région à couvrir (voir scrape_all_zones)
+        reset: Relancer un nouveau passage complet
+        
+    Returns:
+        int: Nombre de zones ajoutées
+    """
+    all_google_types = [t for category in CATEGORIES.values() for t in category["google_types"]]
+    zones = CoveragePlanner(plan_name, bbox=bbox, polygons=polygons).build(all_google_types)
+    work_queue = WorkQueue(plan_name)
+    added = work_queue.seed_zones(zones, reset=reset)
+    logger.info(f"File {plan_name}: {len(zones)} zones dans le plan, {added} ajoutées"
+                + (" (nouveau passage)" if reset else ""))
+    return added
+
+def work_queue_status(plan_name="paris"):
+    """
+    Coordinateur: affiche l'avancement de la file et des workers.
+    
+    Returns:
+        dict: Nombre de jobs par (type, statut)
+    """
+    work_queue = WorkQueue(plan_name)
+    work_queue.sweep_expired()
+    counts = work_queue.counts()
+    now = datetime.now()
+    
+    for kind in ("zone", "place"):
+        total = sum(count for (job_kind, _), count in counts.items() if job_kind == kind)
+        details = ", ".join(f"{status}: {counts.get((kind, status), 0)}" for status in ("pending", "leased", "done", "failed"))
+        logger.info(f"[{plan_name}] {kind}s: {total} ({details})")
+    
+    workers = work_queue.collection.distinct("lease_owner", {"queue": plan_name, "status": "leased", "lease_expires_at": {"$gte": now}})
+    done_last_hour = work_queue.collection.count_documents({"queue": plan_name, "status": "done", "updated_at": {"$gte": now - timedelta(hours=1)}})
+    remaining = sum(count for (_, status), count in counts.items() if status in ("pending", "leased"))
+    logger.info(f"[{plan_name}] {len(workers)} workers actifs, {done_last_hour} jobs terminés dans la dernière heure")
+    if done_last_hour and remaining:
+        logger.info(f"[{plan_name}] Fin estimée: {(now + timedelta(hours=remaining / done_last_hour)).strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    for job in work_queue.collection.find({"queue": plan_name, "status": "failed"}).limit(10):
+        logger.warning(f"[{plan_name}] Échec {job['_id']} après {job.get('attempts', 0)} tentatives: {job.get('last_error')}")
+    return counts
+
+def run_worker(plan_name="paris", worker_id=None, concurrency=None):
+    """
+    Worker: traite les jobs de la file jusqu'à ce qu'elle soit vide.
+    
+    Un job de zone découvre ses lieux et les ajoute à la file; un job de lieu
+    passe par process_place. Plusieurs workers (sur plusieurs machines) peuvent
+    vider la même file; chacun traite `concurrency` jobs à la fois.
+    
+    Un job de lieu n'est terminé qu'une fois son écriture confirmée par le tampon
+    BeautyPlaces: son bail est gardé (et renouvelé) en attendant, et les résultats
+    sont relevés au renouvellement des baux, tous les WRITE_BUFFER_MAX_OPS lieux,
+    quand la file est vide et à l'arrêt. Une écriture en échec rend le job à la file.
+    
+    Args:
+        plan_name: Nom de la file (celui du plan de couverture)
+        worker_id: Identifiant du worker (hôte:pid par défaut)
+        concurrency: Jobs traités simultanément (CONCURRENCY par défaut)
+        
+    Returns:
+        int: Nombre de jobs terminés par ce worker
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    concurrency = max(1, concurrency or CONCURRENCY)
+    work_queue = WorkQueue(plan_name)
+    held_jobs = set()
+    held_lock = threading.Lock()
+    awaiting_write = {}  # place_id -> (job, résultat) des lieux traités dont l'écriture n'est pas confirmée
+    settle_lock = threading.Lock()
+    stop = threading.Event()
+    completed = [0]
+    
+    def finish_job(job, outcome):
+        if work_queue.complete(job, worker_id, outcome):
+            with held_lock:
+                completed[0] += 1
+        else:
+            logger.warning(f"Bail perdu pour {job['_id']}, résultat conservé mais job repris ailleurs")
+    
+    def settle_writes(force=False):
+        """Termine les jobs de lieu dont l'écriture est confirmée, rend ceux en échec à la file.
+        
+        Avec force, les écritures en attente sont d'abord envoyées: un lieu sans résultat
+        ensuite n'a jamais été mis dans le tampon et son job est considéré en échec.
+        """
+        with settle_lock:
+            if force:
+                flush_write_buffers()
+            with held_lock:
+                place_ids = list(awaiting_write)
+            if not place_ids:
+                return
+            saved_ids, failed_ids = get_write_buffer("BeautyPlaces").pop_outcomes(place_ids)
+            if force:
+                failed_ids += [place_id for place_id in place_ids if place_id not in saved_ids and place_id not in failed_ids]
+            with held_lock:
+                settled = [(awaiting_write.pop(place_id), True) for place_id in saved_ids]
+                settled += [(awaiting_write.pop(place_id), False) for place_id in failed_ids]
+            for (job, outcome), ok in settled:
+                try:
+                    if ok:
+                        finish_job(job, outcome)
+                    else:
+                        status = work_queue.fail(job, worker_id, "écriture BeautyPlaces en échec")
+                        logger.error(f"Job {job['_id']}: écriture en échec (tentative {job.get('attempts')}/{QUEUE_MAX_ATTEMPTS}, {status})")
+                except Exception as e:
+                    logger.error(f"Mise à jour du job {job['_id']} impossible: {e}")
+                finally:
+                    with held_lock:
+                        held_jobs.discard(job["_id"])
+    
+    def heartbeat():
+        while not stop.wait(QUEUE_HEARTBEAT_SECONDS):
+            try:
+                settle_writes()
+            except Exception as e:
+                logger.warning(f"Relevé des écritures impossible: {e}")
+            with held_lock:
+                job_ids = set(held_jobs)
+            try:
+                work_queue.renew(job_ids, worker_id)
+            except Exception as e:
+                logger.warning(f"Renouvellement des baux impossible: {e}")
+    
+    def run_job(job):
+        payload = job["payload"]
+        if job["kind"] == "zone":
+            zone_places = discover_zone_places(payload["lat"], payload["lng"], payload["radius"], payload["google_types"])
+            places = filter_recently_processed(merge_duplicate_places(zone_places))
+            added = work_queue.enqueue_places(places)
+            logger.info(f"Zone {payload['id']}: {len(zone_places)} lieux trouvés, {added} ajoutés à la file")
+            return "done"
+        
+        processed_place = process_place(payload)
+        return "saved" if processed_place else "skipped"
+    
+    def worker_loop():
+        while not stop.is_set():
+            job = work_queue.claim(worker_id)
+            if job is None:
+                # Les jobs de ce worker en attente d'écriture comptent parmi les jobs ouverts
+                settle_writes(force=True)
+                work_queue.sweep_expired()
+                if not work_queue.has_open_jobs():
+                    return
+                # D'autres workers détiennent encore des jobs: attendre leur fin ou l'expiration de leur bail
+                stop.wait(QUEUE_POLL_SECONDS)
+                continue
+            
+            with held_lock:
+                held_jobs.add(job["_id"])
+            awaiting = False
+            try:
+                outcome = run_job(job)
+                if outcome == "saved":
+                    # Bail gardé jusqu'à la confirmation de l'écriture (settle_writes)
+                    with held_lock:
+                        awaiting_write[job["payload"]["place_id"]] = (job, outcome)
+                    awaiting = True
+                else:
+                    finish_job(job, outcome)
+            except Exception as e:
+                status = work_queue.fail(job, worker_id, e)
+                logger.error(f"Job {job['_id']} en erreur (tentative {job.get('attempts')}/{QUEUE_MAX_ATTEMPTS}, {status}): {e}")
+            finally:
+                if not awaiting:
+                    with held_lock:
+                        held_jobs.discard(job["_id"])
+            with held_lock:
+                pending = len(awaiting_write)
+            if pending >= WRITE_BUFFER_MAX_OPS:
+                settle_writes(force=True)
+    
+    logger.info(f"Worker {worker_id} démarré sur la file {plan_name} (concurrence: {concurrency})")
+    threading.Thread(target=heartbeat, name="queue_heartbeat", daemon=True).start()
+    threads = [threading.Thread(target=worker_loop, name=f"queue_worker_{i}") for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    finally:
+        stop.set()
+        settle_writes(force=True)
+        log_cascade_stats()
+        log_cpu_stage_stats()
+    
+    logger.info(f"Worker {worker_id} terminé: {completed[0]} jobs traités, file {plan_name} vide")
+    return completed[0]
+
+def refresh_priority(place, now=None):
+    """
+    Priorité de rafraîchissement d'un lieu enregistré (plus haut = plus urgent).
+    
+    L'âge (en périodes PLACE_REFRESH_DAYS) est majoré pour les lieux populaires;
+    s'ajoutent les changements vus par Nearby Search depuis la dernière mise à
+    jour: nouveaux avis (relativement au nombre connu) et écart de note.
+    
+    Args:
+        place: Document BeautyPlaces (last_updated, rating, user_ratings_total, nearby_*)
+        now: Date de référence
+        
+    Returns:
+        float: Score de priorité
+    """
+    now = now or datetime.now()
+    last_updated = place.get("last_updated")
+    if last_updated:
+        age = (now - last_updated).total_seconds() / 86400 / PLACE_REFRESH_DAYS
+    else:
+        age = 10.0
+    
+    ratings_total = place.get("user_ratings_total") or 0
+    popularity = math.log10(1 + ratings_total) / 4  # ~1 pour 10 000 avis
+    
+    change = 0.0
+    seen_at = place.get("nearby_seen_at")
+    if seen_at and (not last_updated or seen_at > last_updated):
+        nearby_total = place.get("nearby_user_ratings_total")
+        if nearby_total is not None:
+            change += max(0, nearby_total - ratings_total) / (ratings_total + 10)
+        if place.get("nearby_rating") is not None and place.get("rating") is not None:
+            change += abs(place["nearby_rating"] - place["rating"]) * 2
+    
+    return age * (1 + REFRESH_POPULARITY_WEIGHT * popularity) + REFRESH_CHANGE_WEIGHT * change
+
+class RefreshScheduler:
+    """
+    File de priorité (tas) des lieux de BeautyPlaces à rafraîchir.
+    
+    Le tas est reconstruit depuis la base toutes les REFRESH_REBUILD_SECONDS pour
+    tenir compte du vieillissement et des nouvelles observations Nearby Search.
+    Les lieux déjà confiés à un worker ne sont pas reproposés avant
+    REFRESH_MIN_AGE_HOURS, même si leur écriture n'est pas encore visible.
+    """
+    
+    FIELDS = ("place_id", "name", "category", "sous_categorie", "google_type", "google_types", "rating",
+              "user_ratings_total", "last_updated", "nearby_rating", "nearby_user_ratings_total", "nearby_seen_at")
+    
+    def __init__(self):
+        self._heap = []
+        self._built_at = None
+        self._dispatched = {}
+    
+    def rebuild(self):
+        now = datetime.now()
+        cutoff = now - timedelta(hours=REFRESH_MIN_AGE_HOURS)
+        self._dispatched = {place_id: at for place_id, at in self._dispatched.items() if at >= cutoff}
+        
+        heap = []
+        projection = {field: 1 for field in self.FIELDS}
+        projection["_id"] = 0
+        for place in db.BeautyPlaces.find({"last_updated": {"$lt": cutoff}}, projection):
+            if place["place_id"] in self._dispatched or place.get("category") not in CATEGORIES:
+                continue
+            heap.append((-refresh_priority(place, now), place["place_id"], place))
+        heapq.heapify(heap)
+        self._heap = heap
+        self._built_at = now
+        
+        if heap:
+            logger.info(f"File de rafraîchissement: {len(heap)} lieux, priorité max {-heap[0][0]:.2f} ({heap[0][2].get('name')})")
+        else:
+            logger.info("File de rafraîchissement vide")
+    
+    def next_place(self):
+        """Lieu le plus prioritaire, ou None si aucun n'est à rafraîchir."""
+        if self._built_at is None or not self._heap or (datetime.now() - self._built_at).total_seconds() > REFRESH_REBUILD_SECONDS:
+            self.rebuild()
+        if not self._heap:
+            return None
+        _, place_id, place = heapq.heappop(self._heap)
+        self._dispatched[place_id] = datetime.now()
+        return place
+    
+    def release(self, place_id):
+        """Rend un lieu éligible à la prochaine reconstruction (rafraîchissement non enregistré)."""
+        self._dispatched.pop(place_id, None)
+
+def refresh_place(place):
+    """
+    Re-scrape un lieu en contournant les caches de détails (qui ont pu garder l'ancienne fiche).
+    
+    L'écriture reste dans le tampon BeautyPlaces; son résultat est relevé par
+    run_refresh_daemon.
+    """
+    try:
+        google_details_cache.invalidate(place["place_id"])
+        place_record_cache.invalidate(place["place_id"])
+        return process_place(place)
+    except Exception as e:
+        logger.error(f"Erreur lors du rafraîchissement de {place.get('name')}: {e}")
+        return None
+
+def run_refresh_daemon(rate_per_hour=None, max_places=None, concurrency=None):
+    """
+    Rafraîchit en continu les lieux enregistrés, les plus prioritaires d'abord.
+    
+    Un seau à jetons fixe le débit (rate_per_hour lieux par heure, sans rafale),
+    ce qui étale la consommation d'API au lieu de tout re-scraper par zone.
+    
+    Les écritures des lieux rafraîchis restent groupées par le tampon BeautyPlaces:
+    leurs résultats sont relevés entre deux lieux, après les envois du tampon, et
+    un lieu dont l'écriture a échoué redevient éligible au rafraîchissement.
+    
+    Args:
+        rate_per_hour: Lieux re-scrapés par heure (REFRESH_RATE_PER_HOUR par défaut)
+        max_places: Arrêt après ce nombre de lieux (None: sans fin)
+        concurrency: Lieux traités simultanément (CONCURRENCY par défaut)
+        
+    Returns:
+        int: Nombre de lieux lancés
+    """
+    rate_per_hour = rate_per_hour or REFRESH_RATE_PER_HOUR
+    concurrency = max(1, concurrency or CONCURRENCY)
+    bucket = TokenBucket("refresh", rate_per_hour / 3600.0, 1)
+    scheduler = RefreshScheduler()
+    slots = threading.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="refresh_worker")
+    awaiting_write = {}  # place_id -> nom des lieux rafraîchis dont l'écriture n'est pas confirmée
+    awaiting_lock = threading.Lock()
+    started = 0
+    
+    def place_done(place, future):
+        try:
+            if future.result():
+                with awaiting_lock:
+                    awaiting_write[place["place_id"]] = place.get("name")
+        finally:
+            slots.release()
+    
+    def settle_writes(force=False):
+        """Relève le résultat des écritures envoyées; avec force, envoie d'abord celles en attente."""
+        if force:
+            flush_write_buffers()
+        with awaiting_lock:
+            place_ids = list(awaiting_write)
+        if not place_ids:
+            return
+        saved_ids, failed_ids = get_write_buffer("BeautyPlaces").pop_outcomes(place_ids)
+        if force:
+            failed_ids += [place_id for place_id in place_ids if place_id not in saved_ids and place_id not in failed_ids]
+        with awaiting_lock:
+            for place_id in saved_ids:
+                awaiting_write.pop(place_id, None)
+            failed = [(place_id, awaiting_write.pop(place_id, None)) for place_id in failed_ids]
+        for place_id, name in failed:
+            logger.warning(f"Rafraîchissement de {name} non enregistré (écriture en échec)")
+            scheduler.release(place_id)
+    
+    logger.info(f"Rafraîchissement continu: {rate_per_hour} lieux/heure (concurrence: {concurrency})")
+    try:
+        while max_places is None or started < max_places:
+            settle_writes()
+            place = scheduler.next_place()
+            if place is None:
+                time.sleep(REFRESH_IDLE_SECONDS)
+                continue
+            
+            bucket.acquire()
+            slots.acquire()
+            logger.info(f"Rafraîchissement de {place.get('name')} (mis à jour le {place.get('last_updated')})")
+            executor.submit(refresh_place, place).add_done_callback(lambda future, place=place: place_done(place, future))
+            started += 1
+    except KeyboardInterrupt:
+        logger.info("Arrêt du rafraîchissement demandé")
+    finally:
+        executor.shutdown(wait=True)
+        settle_writes(force=True)
+        log_cascade_stats()
+        log_cpu_stage_stats()
+    
+    logger.info(f"Rafraîchissement terminé: {started} lieux traités")
+    return started
+
+def region_from_args(args):
+    """Région à couvrir (bbox, polygons) d'après --bbox et --geojson."""
+    bbox = tuple(float(value) for value in args.bbox.split(",")) if args.bbox else None
+    polygons = load_geojson_polygons(args.geojson) if args.geojson else None
+    return bbox, polygons
+
 def test_small_zone():
     """Fonction de test qui scrape une petite zone pour obtenir environ 30 lieux."""
     # Zone de test: petit secteur autour de Paris (quartier touristique)
@@ -1390,9 +5008,9 @@ def test_small_zone():
         processed_place = process_place(place)
         if processed_place:
             processed_places.append(processed_place)
-        time.sleep(2)  # Pause pour éviter les limitations d'API
     
     logger.info(f"Test terminé! {len(processed_places)}/{len(places_to_process)} lieux traités avec succès.")
+    flush_write_buffers()
     
     # Générer des insights sur les données collectées
     insights = generate_insights()
@@ -1443,8 +5061,150 @@ def generate_insights():
     logger.info("Insights générés et sauvegardés")
     return insights
 
+def parse_tripadvisor_page(html, url, backend=None):
+    """
+    Extrait les commentaires d'une page d'avis Tripadvisor et le lien de la page suivante.
+    
+    Args:
+        html: Page d'avis (octets ou texte)
+        url: URL de la fiche (pour compléter les liens relatifs)
+        backend: Backend de parsing (HTML_PARSER_BACKEND par défaut)
+        
+    Returns:
+        tuple: (commentaires, URL suivante; "" si le lien n'a pas d'URL, False s'il n'y a pas de page suivante)
+    """
+    html = html.decode("utf-8", "replace") if isinstance(html, bytes) else html
+    texts, next_url = extract_tripadvisor_nodes(html, resolve_html_parser(backend))
+    comments = [text.strip() for text in texts if text.strip()]
+    
+    if next_url is None:
+        return comments, False
+    if next_url and not next_url.startswith("http"):
+        next_url = "/".join(url.split("/")[:3]) + next_url
+    return comments, next_url
+
+def benchmark_parsers(fixtures_dir, repeat=20):
+    """
+    Compare les backends de parsing sur des pages enregistrées (--save-html-fixtures).
+    
+    Les fichiers bing_*.html et tripadvisor_*.html du dossier sont parsés repeat
+    fois par chaque backend disponible; le résultat de chaque backend est comparé
+    à celui de bs4 (référence historique).
+    
+    Returns:
+        dict: {backend: {"bing_ms", "tripadvisor_ms", "mismatches"}}
+    """
+    fixtures = {"bing": [], "tripadvisor": []}
+    for name in sorted(os.listdir(fixtures_dir)):
+        kind = name.split("_", 1)[0]
+        if kind in fixtures and name.endswith(".html"):
+            with open(os.path.join(fixtures_dir, name), "rb") as f:
+                fixtures[kind].append((name, f.read()))
+    if not any(fixtures.values()):
+        logger.error(f"Aucune page bing_*.html ou tripadvisor_*.html dans {fixtures_dir}")
+        return {}
+    
+    parsers = {
+        "bing": lambda content, backend: parse_bing_tripadvisor_urls(content, backend),
+        "tripadvisor": lambda content, backend: parse_tripadvisor_page(content, "https://www.tripadvisor.fr", backend)
+    }
+    reference = {(kind, name): parsers[kind](content, "bs4") for kind, pages in fixtures.items() for name, content in pages}
+    
+    results = {}
+    for backend in available_html_parsers():
+        result = {"mismatches": []}
+        for kind, pages in fixtures.items():
+            if not pages:
+                continue
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for name, content in pages:
+                    parsers[kind](content, backend)
+            result[f"{kind}_ms"] = round(1000 * (time.perf_counter() - start) / (repeat * len(pages)), 3)
+            result["mismatches"] += [name for name, content in pages if parsers[kind](content, backend) != reference[(kind, name)]]
+        results[backend] = result
+        timings = ", ".join(f"{kind}: {result[f'{kind}_ms']} ms/page" for kind in fixtures if f"{kind}_ms" in result)
+        logger.info(f"Parser {backend}: {timings}; {len(result['mismatches'])} écarts avec bs4 {result['mismatches'] or ''}")
+    return results
+
+def tripadvisor_page_urls(url, max_pages=3):
+    """
+    Calcule d'avance les URLs des pages d'avis Tripadvisor (motif -orNN- après -Reviews-).
+    
+    Returns:
+        list: URLs des pages 1 à max_pages, ou [url] si l'URL ne suit pas le motif
+    """
+    match = re.search(r"-Reviews-(?:or\d+-)?", url)
+    if not match:
+        return [url]
+    prefix, suffix = url[:match.start()], url[match.end():]
+    urls = [f"{prefix}-Reviews-{suffix}"]
+    for page in range(1, max_pages):
+        urls.append(f"{prefix}-Reviews-or{page * TRIPADVISOR_REVIEWS_PER_PAGE}-{suffix}")
+    return urls
+
+async def fetch_tripadvisor_pages_async(page_urls):
+    """
+    Télécharge les pages d'avis en parallèle (rate limit et connexions par hôte du client partagé).
+    
+    Returns:
+        list: Contenu de chaque page, ou l'exception rencontrée pour cette page
+    """
+    async def fetch_page(page_url):
+        response = await http_client.get_async("tripadvisor", page_url, headers=TRIPADVISOR_HEADERS, timeout=10)
+        response.raise_for_status()
+        return response.content
+    
+    return await asyncio.gather(*(fetch_page(page_url) for page_url in page_urls), return_exceptions=True)
+
 def get_full_tripadvisor_comments(url, max_pages=3):
-    """Récupère les commentaires de Tripadvisor sur plusieurs pages."""
+    """
+    Récupère les commentaires de Tripadvisor sur plusieurs pages.
+    
+    Les URLs des pages sont calculées d'avance (tripadvisor_page_urls) et
+    téléchargées en un seul aller-retour; les commentaires sont fusionnés dans
+    l'ordre des pages, sans doublon (Tripadvisor renvoie une page existante pour
+    un décalage hors limites). Une page en échec n'invalide pas les autres.
+    """
+    page_urls = tripadvisor_page_urls(url, max_pages)
+    if len(page_urls) < 2:
+        return get_tripadvisor_comments_sequential(url, max_pages)
+    
+    logger.info(f"Récupération de {len(page_urls)} pages de commentaires Tripadvisor en parallèle pour {url}")
+    try:
+        pages = http_client.run(fetch_tripadvisor_pages_async(page_urls))
+    except Exception as e:
+        logger.error(f"Erreur générale lors de la récupération des commentaires Tripadvisor: {e}")
+        return []
+    
+    comments = []
+    seen = set()
+    failed_pages = 0
+    for page_number, (page_url, content) in enumerate(zip(page_urls, pages), start=1):
+        if isinstance(content, Exception):
+            failed_pages += 1
+            logger.error(f"Erreur de requête lors de la récupération de la page {page_number}: {content}")
+            continue
+        save_html_fixture("tripadvisor", page_url, content)
+        try:
+            page_comments, _ = run_cpu_stage("tripadvisor_parse", parse_tripadvisor_page, content, url, resolve_html_parser())
+        except Exception as e:
+            failed_pages += 1
+            logger.error(f"Erreur lors du traitement de la page {page_number}: {e}")
+            continue
+        if not page_comments:
+            logger.debug(f"Aucun commentaire trouvé sur la page {page_number} avec le sélecteur principal.")
+        for comment in page_comments:
+            if comment not in seen:
+                seen.add(comment)
+                comments.append(comment)
+    
+    logger.info(f"Total de {len(comments)} commentaires récupérés pour {url}"
+                + (f" ({failed_pages} pages en échec)" if failed_pages else ""))
+    return comments
+
+def get_tripadvisor_comments_sequential(url, max_pages=3):
+    """Récupère les commentaires page par page en suivant le lien "page suivante" (URLs hors motif -Reviews-)."""
     try:
         comments = []
         current_page = 1
@@ -1455,37 +5215,21 @@ def get_full_tripadvisor_comments(url, max_pages=3):
             
             try:
                 # Bloc try pour la requête de la page
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
-                
-                response = requests.get(current_url, headers=headers, timeout=10)
+                response = http_client.get("tripadvisor", current_url, headers=TRIPADVISOR_HEADERS, timeout=10)
                 response.raise_for_status() # Lève une exception si code d'erreur HTTP
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
-                review_elements = soup.find_all("div", class_="review-container")
-                
-                page_comments_found = False
-                for review in review_elements:
-                    text_elem = review.find("p", class_="partial_entry")
-                    if text_elem and text_elem.text.strip():
-                        comments.append(text_elem.text.strip())
-                        page_comments_found = True
+                save_html_fixture("tripadvisor", current_url, response.content)
+                page_comments, next_url = run_cpu_stage("tripadvisor_parse", parse_tripadvisor_page, response.content, url, resolve_html_parser())
+                comments.extend(page_comments)
                 
-                if not page_comments_found:
+                if not page_comments:
                      logger.debug(f"Aucun commentaire trouvé sur la page {current_page} avec le sélecteur principal.")
 
                 # Chercher la page suivante
-                next_page = soup.find("a", class_="nav next")
-                if next_page and current_page < max_pages:
-                    next_url = next_page.get("href")
+                if next_url is not False and current_page < max_pages:
                     if next_url:
-                        if not next_url.startswith("http"):
-                            base_url = "/".join(url.split("/")[:3])
-                            next_url = base_url + next_url
                         current_url = next_url
                         current_page += 1
-                        time.sleep(1) # Petite pause
                     else:
                         logger.info("Plus d'URL suivante trouvée.")
                         break
@@ -1493,7 +5237,7 @@ def get_full_tripadvisor_comments(url, max_pages=3):
                     logger.info("Plus de page suivante ou limite atteinte.")
                     break
                     
-            except requests.exceptions.RequestException as req_err:
+            except httpx.HTTPError as req_err:
                 logger.error(f"Erreur de requête lors de la récupération de la page {current_page}: {req_err}")
                 break # Sortir de la boucle while si une page échoue
             except Exception as page_err:
@@ -1803,10 +5547,14 @@ def main():
         else:
             logger.error(f"Échec du traitement pour {args.place_name}")
             return []
+    elif args.all_zones:
+        # Couverture complète d'une région (Paris par défaut)
+        bbox, polygons = region_from_args(args)
+        return scrape_all_zones(args.plan_name, bbox=bbox, polygons=polygons)
     elif args.area:
         # Obtenir les coordonnées GPS de la zone
         from geopy.geocoders import Nominatim
-        from geopy.exc import GeocoderTimedOut
+        from geopy.exc import GeocoderTimedOut, GeocoderRateLimited
         
         # Configurer geocoder avec un timeout plus long et activer le cache
         geolocator = Nominatim(user_agent="wellness_script", timeout=10)
@@ -1816,12 +5564,16 @@ def main():
             for attempt in range(max_retries):
                 try:
                     logger.info(f"Tentative de géolocalisation ({attempt+1}/{max_retries}) : {query}")
+                    rate_limiter.acquire("nominatim")
                     return geolocator.geocode(query)
+                except GeocoderRateLimited:
+                    logger.warning(f"Nominatim limite le débit (tentative {attempt+1}/{max_retries})")
+                    rate_limiter.report("nominatim", 429)
+                    if attempt == max_retries - 1:
+                        return None
                 except GeocoderTimedOut:
                     logger.warning(f"Timeout lors de la géolocalisation (tentative {attempt+1}/{max_retries})")
-                    if attempt < max_retries - 1:
-                        time.sleep(2)  # Pause avant nouvelle tentative
-                    else:
+                    if attempt == max_retries - 1:
                         logger.error(f"Toutes les tentatives de géolocalisation ont échoué pour {query}")
                         return None
         
@@ -1868,17 +5620,15 @@ def main():
             places = get_places_by_category(category_name, google_types, location.latitude, location.longitude, args.radius)
             all_places.extend(places)
         
+        # Un lieu trouvé dans plusieurs catégories n'est traité qu'une fois
+        all_places = claim_unseen_places(all_places)
+        
         # Limiter le nombre de lieux si nécessaire
         places_to_process = all_places[:min(args.limit, len(all_places))]
         logger.info(f"Traitement de {len(places_to_process)} établissements")
         
-        # Traiter chaque lieu
-        processed_places = []
-        for place in places_to_process:
-            logger.info(f"Traitement de: {place['name']}")
-            processed_place = process_place(place)
-            if processed_place:
-                processed_places.append(processed_place)
+        # Traiter les lieux (en parallèle si --concurrency > 1)
+        processed_places = process_places(places_to_process)
         
         logger.info(f"Terminé! {len(processed_places)}/{len(places_to_process)} lieux traités.")
         return processed_places
@@ -1949,6 +5699,38 @@ if __name__ == "__main__":
         parser.add_argument("--radius", type=int, default=1000, help="Rayon de recherche en mètres")
         parser.add_argument("--categories", type=str, help="Catégories à analyser, séparées par des virgules")
         parser.add_argument("--limit", type=int, default=5, help="Nombre maximum de lieux à traiter")
+        parser.add_argument("--all-zones", action="store_true", help="Couvrir toute une région (plan de couverture adaptatif)")
+        parser.add_argument("--plan-name", type=str, default="paris", help="Nom du plan de couverture persisté")
+        parser.add_argument("--bbox", type=str, help="Région à couvrir: lat_min,lng_min,lat_max,lng_max (Paris par défaut)")
+        parser.add_argument("--geojson", type=str, help="Fichier GeoJSON (Polygon/MultiPolygon) délimitant la région à couvrir")
+        parser.add_argument("--concurrency", type=int, default=1, help="Nombre de lieux traités en parallèle")
+        parser.add_argument("--browser-pool-size", type=int, help="Nombre de navigateurs préchauffés (défaut: --concurrency)")
+        parser.add_argument("--image-store", choices=["gridfs", "local"], default=IMAGE_STORE_BACKEND, help="Stockage des images")
+        parser.add_argument("--migrate-inline-images", action="store_true", help="Déplacer les images base64 existantes vers le stockage d'images")
+        parser.add_argument("--prompt-token-budget", type=int, default=PROMPT_TOKEN_BUDGET, help="Tokens maximum consacrés aux avis dans le prompt d'analyse")
+        parser.add_argument("--analysis-batch-size", type=int, default=ANALYSIS_BATCH_SIZE, help="Lieux regroupés par appel au modèle d'analyse")
+        parser.add_argument("--cascade-min-confidence", type=float, default=CASCADE_MIN_CONFIDENCE, help="Confiance minimale pour se passer du LLM (> 1: toujours le LLM)")
+        parser.add_argument("--cascade-min-coverage", type=float, default=CASCADE_MIN_COVERAGE, help="Part minimale des critères mentionnés pour se passer du LLM")
+        parser.add_argument("--serve-inference", action="store_true", help="Lancer le daemon d'inférence local partagé par les workers")
+        parser.add_argument("--inference-port", type=int, default=INFERENCE_PORT, help="Port du daemon d'inférence (--serve-inference)")
+        parser.add_argument("--inference-url", type=str, help="URL du daemon d'inférence à utiliser (ex: http://127.0.0.1:8765)")
+        parser.add_argument("--cpu-workers", type=int, default=CPU_WORKERS, help="Processus pour les étapes CPU (parsing, sentiment, mots-clés, images); 0: dans le thread courant")
+        parser.add_argument("--html-parser", choices=["auto", "bs4", "bs4-strainer", "lxml", "selectolax"], default=HTML_PARSER_BACKEND, help="Backend de parsing des pages Bing/Tripadvisor")
+        parser.add_argument("--save-html-fixtures", type=str, help="Dossier où enregistrer les pages Bing/Tripadvisor téléchargées")
+        parser.add_argument("--benchmark-parsers", type=str, metavar="DIR", help="Comparer les backends de parsing sur les pages enregistrées dans DIR puis quitter")
+        parser.add_argument("--rescore-sentiment", action="store_true", help="Recalculer le sentiment des avis Google notés (google_reviews) enregistrés puis quitter")
+        parser.add_argument("--sentiment-workers", type=int, default=SENTIMENT_WORKERS, help="Processus utilisés par --rescore-sentiment")
+        parser.add_argument("--clear-analysis-cache", action="store_true", help="Vider le cache des analyses de commentaires")
+        parser.add_argument("--index-report", action="store_true", help="Afficher l'état des index MongoDB et quitter")
+        parser.add_argument("--seed-queue", action="store_true", help="Coordinateur: remplir la file de travail avec les zones du plan (--plan-name, --bbox, --geojson)")
+        parser.add_argument("--reset-queue", action="store_true", help="Avec --seed-queue: relancer un passage complet")
+        parser.add_argument("--queue-status", action="store_true", help="Coordinateur: afficher l'avancement de la file de travail et quitter")
+        parser.add_argument("--worker", action="store_true", help="Traiter les jobs de la file de travail jusqu'à ce qu'elle soit vide")
+        parser.add_argument("--worker-id", type=str, help="Identifiant du worker (hôte:pid par défaut)")
+        parser.add_argument("--refresh-daemon", action="store_true", help="Rafraîchir en continu les lieux enregistrés par ordre de priorité")
+        parser.add_argument("--refresh-rate", type=float, default=REFRESH_RATE_PER_HOUR, help="Lieux re-scrapés par heure (--refresh-daemon)")
+        parser.add_argument("--refresh-max-places", type=int, help="Arrêter --refresh-daemon après ce nombre de lieux")
+        parser.add_argument("--browser-max-uses", type=int, default=BROWSER_MAX_USES, help="Captures avant recyclage d'un navigateur")
         args = parser.parse_args()
 
         # Configuration des paramètres de scraping
@@ -1956,6 +5738,31 @@ if __name__ == "__main__":
         REAL_SCREENSHOTS = args.real_screenshots
         BILLETREDUC_SCREENSHOTS = args.billetreduc_screenshots
         FORCE_ANALYSIS = args.force_analysis
+        CONCURRENCY = max(1, args.concurrency)
+        BROWSER_POOL_SIZE = args.browser_pool_size
+        BROWSER_MAX_USES = args.browser_max_uses
+        IMAGE_STORE_BACKEND = args.image_store
+        PROMPT_TOKEN_BUDGET = max(50, args.prompt_token_budget)
+        ANALYSIS_BATCH_SIZE = max(1, args.analysis_batch_size)
+        INFERENCE_URL = args.inference_url
+        CASCADE_MIN_CONFIDENCE = args.cascade_min_confidence
+        CASCADE_MIN_COVERAGE = args.cascade_min_coverage
+        SENTIMENT_WORKERS = max(1, args.sentiment_workers)
+        CPU_WORKERS = max(0, args.cpu_workers)
+        HTML_PARSER_BACKEND = args.html_parser
+        HTML_FIXTURES_DIR = args.save_html_fixtures
+        
+        # Les commandes de maintenance ne traitent aucun lieu: ni pool CPU ni navigateurs à préchauffer
+        processes_places = not (args.migrate_inline_images or args.index_report or args.serve_inference or args.rescore_sentiment
+                                or args.benchmark_parsers or args.seed_queue or args.queue_status)
+        
+        # Préchauffer les processus CPU (démarrage "spawn" de plusieurs secondes)
+        if processes_places:
+            get_cpu_pool()
+        
+        # Préchauffer les navigateurs en arrière-plan pendant la recherche des lieux
+        if (not TEST_MODE or REAL_SCREENSHOTS) and processes_places:
+            threading.Thread(target=get_browser_pool().warm_up, name="browser_warm_up", daemon=True).start()
         
         # Activer le mode test pour Mistral si --test est présent
         if TEST_MODE:
@@ -1967,7 +5774,33 @@ if __name__ == "__main__":
             clear_mistral_cache()
         
         # Exécuter la fonction principale
-        main()
+        if args.index_report:
+            index_report()
+        elif args.benchmark_parsers:
+            benchmark_parsers(args.benchmark_parsers)
+        elif args.serve_inference:
+            serve_inference(port=args.inference_port)
+        elif args.queue_status:
+            work_queue_status(args.plan_name)
+        else:
+            ensure_indexes()
+            if args.clear_analysis_cache:
+                logger.info(f"Cache d'analyse vidé: {analysis_cache.clear()} entrées supprimées")
+            else:
+                analysis_cache.invalidate_stale_versions()
+            if args.migrate_inline_images:
+                migrate_inline_images()
+            elif args.rescore_sentiment:
+                rescore_sentiments()
+            elif args.seed_queue:
+                bbox, polygons = region_from_args(args)
+                seed_work_queue(args.plan_name, bbox=bbox, polygons=polygons, reset=args.reset_queue)
+            elif args.worker:
+                run_worker(args.plan_name, worker_id=args.worker_id)
+            elif args.refresh_daemon:
+                run_refresh_daemon(args.refresh_rate, max_places=args.refresh_max_places)
+            else:
+                main()
         
     except Exception as error:
         logger.error(f"ERREUR CRITIQUE pendant l'exécution: {error}")